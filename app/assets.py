@@ -0,0 +1,304 @@
+"""Static asset build step and serving.
+
+``python -m app.assets`` writes ``.br`` and ``.gz`` siblings next to every
+compressible file in ``app/static``. :class:`PrecompressedStaticFiles` then
+serves the best sibling the client accepts, so neither the app nor nginx
+compresses static files per request.
+
+Templates link to assets through ``static_url()``, which returns a URL with
+the file's content hash (``/static/css/style.<hash>.css``). Those URLs are
+served with an immutable Cache-Control header; a hash that no longer matches,
+for example from a page rendered by an older release during a rolling
+deploy, still resolves to the current file but without it.
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import re
+import sys
+import time
+from collections.abc import Callable
+from mimetypes import guess_type
+from pathlib import Path
+from typing import Any
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import Scope
+
+logger = logging.getLogger(__name__)
+
+static_dir = Path(__file__).parent / "static"
+
+# File types worth compressing; images and fonts are already compressed
+COMPRESSIBLE_SUFFIXES = frozenset(
+    {".css", ".js", ".json", ".svg", ".xml", ".txt", ".html", ".sh"}
+)
+
+# Files smaller than this fit in a packet either way
+MIN_COMPRESS_SIZE = 256
+
+
+# Content-Encoding tokens in order of preference, with their file suffixes
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# Hex digits of the content hash embedded in asset URLs
+HASH_LENGTH = 12
+
+# A file name with an embedded content hash, e.g. style.0123456789ab.css
+HASHED_NAME = re.compile(
+    rf"^(?P<stem>.+)\.(?P<digest>[0-9a-f]{{{HASH_LENGTH}}})(?P<suffix>\.[^./]+)$"
+)
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Seconds between checks of the static directory for changes, in debug mode
+ASSET_CHECK_INTERVAL = 2.0
+
+
+def _compressors() -> dict[str, Callable[[bytes], bytes]]:
+    """Compressor per sibling suffix; brotli only if it is installed."""
+    compressors = {
+        # mtime=0 keeps the output identical across builds
+        ".gz": lambda data: gzip.compress(data, compresslevel=9, mtime=0),
+    }
+    # Deferred: compression only runs at build time, never in a worker
+    try:
+        import brotli
+    except ImportError:
+        return compressors
+    compressors[".br"] = lambda data: brotli.compress(data, quality=11)
+    return compressors
+
+
+def compress_static(directory: Path = static_dir) -> int:
+    """Write compressed siblings for compressible files under ``directory``.
+
+    Siblings that are up to date are left alone, and a sibling is only kept
+    if it is smaller than the original. Returns the number of files written.
+    """
+    written = 0
+    for path in sorted(directory.rglob("*")):
+        if not path.is_file() or path.suffix not in COMPRESSIBLE_SUFFIXES:
+            continue
+        data = path.read_bytes()
+        source_mtime = path.stat().st_mtime_ns
+        for suffix, compress in _compressors().items():
+            target = path.with_name(path.name + suffix)
+            if target.exists() and target.stat().st_mtime_ns >= source_mtime:
+                continue
+            compressed = compress(data) if len(data) >= MIN_COMPRESS_SIZE else data
+            if len(compressed) >= len(data):
+                target.unlink(missing_ok=True)
+                continue
+            target.write_bytes(compressed)
+            written += 1
+    return written
+
+
+def accepted_encodings(header: str) -> set[str]:
+    """Return the content codings an ``Accept-Encoding`` header allows."""
+    accepted = set()
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                continue
+        if coding and quality > 0:
+            accepted.add(coding.strip().lower())
+    if "*" in accepted:
+        accepted.update(coding for coding, _ in ENCODINGS)
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """Static files that prefer a precompressed ``.br`` or ``.gz`` sibling.
+
+    The sibling is served with the original file's media type and a
+    ``Content-Encoding`` header. Siblings older than the original are
+    ignored, and the original is served when the client accepts neither.
+    Responses for compressible files always carry ``Vary: Accept-Encoding``.
+    """
+
+    def file_response(
+        self,
+        full_path: os.PathLike | str,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        full_path = os.fspath(full_path)
+        if os.path.splitext(full_path)[1] not in COMPRESSIBLE_SUFFIXES:
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        request_headers = Headers(scope=scope)
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        headers = {"Vary": "Accept-Encoding"}
+        path, path_stat = full_path, stat_result
+        for coding, suffix in ENCODINGS:
+            if coding not in accepted:
+                continue
+            try:
+                sibling_stat = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            if sibling_stat.st_mtime >= stat_result.st_mtime:
+                path, path_stat = full_path + suffix, sibling_stat
+                headers["Content-Encoding"] = coding
+                break
+
+        response = FileResponse(
+            path,
+            status_code=status_code,
+            stat_result=path_stat,
+            media_type=guess_type(full_path)[0],
+            headers=headers,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+class AssetManifest:
+    """Content-hashed URLs for the files in a static directory.
+
+    The directory is scanned once, at startup or on first use, and not again
+    unless ``check_interval`` is set (as in debug mode): then it is rescanned
+    at most once per interval, and only files whose size or mtime changed
+    are hashed again. Precompressed siblings are not listed.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        prefix: str = "/static",
+        check_interval: float | None = None,
+    ) -> None:
+        self.directory = directory
+        self.prefix = prefix
+        self.check_interval = check_interval
+        self._entries: dict[str, tuple[int, int, str]] = {}
+        self._urls: dict[str, str] = {}
+        self._version = ""
+        self._modified = 0.0
+        self._checked_at = float("-inf")
+
+    def build(self) -> int:
+        """Scan the directory and hash new or changed files."""
+        self._checked_at = time.monotonic()
+        entries = {}
+        for path in self.directory.rglob("*"):
+            if not path.is_file() or path.suffix in (".br", ".gz"):
+                continue
+            name = path.relative_to(self.directory).as_posix()
+            stat = path.stat()
+            entry = self._entries.get(name)
+            if entry is None or entry[:2] != (stat.st_mtime_ns, stat.st_size):
+                digest = hashlib.sha256(path.read_bytes()).hexdigest()[:HASH_LENGTH]
+                entry = (stat.st_mtime_ns, stat.st_size, digest)
+            entries[name] = entry
+
+        self._entries = entries
+        self._urls = {
+            name: f"{self.prefix}/{hashed_name(name, digest)}"
+            for name, (_, _, digest) in entries.items()
+        }
+        digests = sorted((name, digest) for name, (_, _, digest) in entries.items())
+        self._version = hashlib.sha256(repr(digests).encode()).hexdigest()[:16]
+        mtimes = (mtime for mtime, _, _ in entries.values())
+        self._modified = max(mtimes, default=0) / 1e9
+        return len(entries)
+
+    def _check(self) -> None:
+        if self._checked_at == float("-inf") or (
+            self.check_interval is not None
+            and time.monotonic() - self._checked_at >= self.check_interval
+        ):
+            self.build()
+
+    @property
+    def version(self) -> str:
+        """Short hash that changes whenever any file's content changes."""
+        self._check()
+        return self._version
+
+    @property
+    def last_modified(self) -> float:
+        """Modification time of the most recently changed file."""
+        self._check()
+        return self._modified
+
+    def url(self, name: str) -> str:
+        """Return the hashed URL of a file relative to the static directory.
+
+        Unknown files get their plain URL.
+        """
+        self._check()
+        name = name.lstrip("/")
+        return self._urls.get(name) or f"{self.prefix}/{name}"
+
+    def resolve(self, path: str) -> tuple[str, bool] | None:
+        """Map a hashed path to its file and whether the hash is current.
+
+        Returns None for paths without a hash or for unknown files.
+        """
+        match = HASHED_NAME.match(path)
+        if match is None:
+            return None
+        self._check()
+        name = match["stem"] + match["suffix"]
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        return name, entry[2] == match["digest"]
+
+
+def hashed_name(name: str, digest: str) -> str:
+    """Insert a content hash before a file name's extension."""
+    stem, dot, suffix = name.rpartition(".")
+    if not dot or "/" in suffix:
+        return f"{name}.{digest}"
+    return f"{stem}.{digest}.{suffix}"
+
+
+class HashedStaticFiles(PrecompressedStaticFiles):
+    """Static files that also serve the content-hashed URLs of a manifest."""
+
+    def __init__(self, *, manifest: AssetManifest, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.manifest = manifest
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        resolved = self.manifest.resolve(path)
+        if resolved is None:
+            return await super().get_response(path, scope)
+
+        name, current = resolved
+        response = await super().get_response(name, scope)
+        if current:
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+
+asset_manifest = AssetManifest(static_dir)
+
+
+def main() -> None:
+    """Compress the static directory, for use in image builds."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    directory = Path(sys.argv[1]) if len(sys.argv) > 1 else static_dir
+    written = compress_static(directory)
+    codings = "brotli and gzip" if ".br" in _compressors() else "gzip"
+    logger.info(f"Wrote {written} precompressed files ({codings}) in {directory}")
+
+
+if __name__ == "__main__":
+    main()
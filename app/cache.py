@@ -0,0 +1,233 @@
+"""Caching primitives shared by the route modules."""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any, TypeVar
+
+from jinja2 import Environment
+from jinja2.bccache import Bucket, FileSystemBytecodeCache
+
+from app.config import Settings, get_settings
+from app.metrics import CACHE_EVENTS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+S = TypeVar("S")
+
+
+def memoize_latest(func: Callable[[S], T]) -> Callable[[S], T]:  # noqa: UP047
+    """Cache a function's result for the latest argument, compared by identity.
+
+    Meant for values derived from long-lived objects such as loaded content or
+    a cached snapshot: the result is reused until a different object is
+    passed, without hashing or comparing the argument's contents.
+    """
+    latest: tuple[S, T] | None = None
+
+    @functools.wraps(func)
+    def wrapper(source: S) -> T:
+        nonlocal latest
+        if latest is None or latest[0] is not source:
+            latest = (source, func(source))
+        return latest[1]
+
+    return wrapper
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one in-flight call.
+
+    The first caller for a key starts the work in its own task; callers that
+    arrive while it is running await the same task instead of starting a new
+    one. Each waiter is shielded, so cancelling one request never cancels the
+    shared work for the others, and an exception is raised to every waiter.
+    """
+
+    def __init__(self, on_coalesce: Callable[[str], None] | None = None) -> None:
+        self._in_flight: dict[str, asyncio.Task] = {}
+        self._on_coalesce = on_coalesce
+        self.calls = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Run ``func`` for ``key``, or join the call already in flight."""
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            self.calls += 1
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.coalesced += 1
+            logger.debug(f"Coalesced request for {key}")
+            if self._on_coalesce is not None:
+                self._on_coalesce(key)
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        """Forget a finished call and record its outcome."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Retrieve the exception so it is not reported as unhandled when
+        # every waiter has been cancelled.
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return the call counters."""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "in_flight": len(self._in_flight),
+        }
+
+
+class SharedCache:
+    """SQLite snapshot cache shared by every worker process on a node.
+
+    Each value is stored as one JSON snapshot and replaced in a single
+    statement, so readers in other processes always see a whole snapshot.
+    The database runs in WAL mode, so reads never wait for a writer. Lease
+    rows act as a cross-process lock: only the worker holding the lease for
+    a key refreshes it. A lease expires on its own if its holder dies.
+
+    Methods block on SQLite and are meant to be run with ``asyncio.to_thread``.
+    """
+
+    def __init__(self, path: Path, owner: str | None = None) -> None:
+        self.path = path
+        self._owner = owner
+        self._local = threading.local()
+
+    @property
+    def owner(self) -> str:
+        """Lease owner name, the worker's PID unless given explicitly."""
+        return self._owner or str(os.getpid())
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, creating the schema on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots "
+                "(key TEXT PRIMARY KEY, data TEXT NOT NULL, timestamp REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS leases "
+                "(key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> tuple[Any, float] | None:
+        """Return the stored snapshot and its timestamp, if any."""
+        row = (
+            self._connect()
+            .execute("SELECT data, timestamp FROM snapshots WHERE key = ?", (key,))
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, data: Any, timestamp: float | None = None) -> None:
+        """Replace the snapshot for a key."""
+        self._connect().execute(
+            "INSERT OR REPLACE INTO snapshots (key, data, timestamp) VALUES (?, ?, ?)",
+            (key, json.dumps(data), time.time() if timestamp is None else timestamp),
+        )
+
+    def acquire(self, key: str, ttl: float) -> bool:
+        """Try to take the refresh lease for a key for ``ttl`` seconds."""
+        now = time.time()
+        cursor = self._connect().execute(
+            "INSERT INTO leases (key, owner, expires) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, "
+            "expires = excluded.expires "
+            "WHERE leases.expires < ? OR leases.owner = excluded.owner",
+            (key, self.owner, now + ttl, now),
+        )
+        return cursor.rowcount == 1
+
+    def release(self, key: str) -> None:
+        """Give up the refresh lease for a key if this owner holds it."""
+        self._connect().execute(
+            "DELETE FROM leases WHERE key = ? AND owner = ?", (key, self.owner)
+        )
+
+
+# Shared single-flight group for outbound GitHub repository fetches
+repo_fetches = SingleFlight(
+    on_coalesce=lambda key: CACHE_EVENTS.labels("coalesced").inc()
+)
+
+_shared_cache: SharedCache | None = None
+
+
+def get_shared_cache(settings: Settings) -> SharedCache | None:
+    """Return the node-wide shared cache, or None if it is disabled."""
+    global _shared_cache
+    if not settings.shared_cache:
+        return None
+    if _shared_cache is None:
+        _shared_cache = SharedCache(settings.cache_dir / "cache.sqlite3")
+    return _shared_cache
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """Compiled templates on disk, shared by all workers and kept across restarts.
+
+    Entries are keyed by template name and a hash of the template source, so
+    an edited template is compiled afresh and workers running different
+    versions of it, as during a rolling deploy, do not overwrite each other's
+    entries. The directory is ``template_cache_dir`` (by default
+    ``cache_dir/templates``), resolved on first use unless given. A cache
+    that cannot be written only costs a compile per worker.
+    """
+
+    def __init__(self, directory: Path | None = None) -> None:
+        self._directory = directory
+        self.pattern = "%s.cache"
+
+    @property
+    def directory(self) -> str:  # type: ignore[override]
+        path = self._directory
+        if path is None:
+            settings = get_settings()
+            path = settings.template_cache_dir or settings.cache_dir / "templates"
+        path.mkdir(parents=True, exist_ok=True)
+        return str(path)
+
+    def get_bucket(
+        self, environment: Environment, name: str, filename: str | None, source: str
+    ) -> Bucket:
+        checksum = self.get_source_checksum(source)
+        return super().get_bucket(environment, f"{name}:{checksum}", filename, source)
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        try:
+            super().load_bytecode(bucket)
+        except OSError as e:
+            logger.warning(f"Template cache unavailable: {e}")
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        try:
+            super().dump_bytecode(bucket)
+        except OSError as e:
+            logger.warning(f"Could not store compiled template: {e}")
@@ -0,0 +1,80 @@
+"""Conditional GET support: response validators and ``304 Not Modified``.
+
+Routes compute a strong ETag from the rendered body or a content version and
+a Last-Modified time from their data sources, then call
+:func:`is_not_modified` before rendering, so a revalidating client gets an
+empty 304 instead of a new copy of the page.
+"""
+
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+
+def make_etag(data: bytes | str) -> str:
+    """Return a strong ETag for a body or a content version string."""
+    if isinstance(data, str):
+        data = data.encode()
+    return f'"{hashlib.sha256(data).hexdigest()[:32]}"'
+
+
+def http_date(timestamp: float) -> str:
+    """Format a Unix timestamp as an HTTP date."""
+    return formatdate(timestamp, usegmt=True)
+
+
+def validator_headers(etag: str | None, last_modified: float | None) -> dict[str, str]:
+    """Return the ETag and Last-Modified headers for a response."""
+    headers = {}
+    if etag is not None:
+        headers["ETag"] = etag
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` list against an ETag."""
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def is_not_modified(
+    request: Request, etag: str | None, last_modified: float | None = None
+) -> bool:
+    """Return whether the client's cached copy is still current.
+
+    ``If-None-Match`` takes precedence; ``If-Modified-Since`` is only
+    consulted when it is absent, as RFC 9110 requires.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return False
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have one-second resolution
+    return int(last_modified) <= since
+
+
+def not_modified_response(
+    etag: str | None,
+    last_modified: float | None = None,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """Build an empty 304 answer carrying the current validators."""
+    return Response(
+        status_code=304,
+        headers={**validator_headers(etag, last_modified), **(headers or {})},
+    )
@@ -1,7 +1,9 @@
 """Configuration management for the application."""
 
 import json
+import tempfile
 from functools import lru_cache
+from pathlib import Path
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -22,25 +24,79 @@ class Settings(BaseSettings):
     github_username: str = "tonybenoy"
     github_token: str | None = None
     github_api_timeout: float = 30.0
+    github_http2: bool = True
+    github_max_connections: int = 10
+    github_max_keepalive_connections: int = 5
+    github_keepalive_expiry: float = 60.0
+    github_fetch_concurrency: int = 4  # pages fetched in parallel
+    github_conditional_requests: bool = True  # send stored ETags
+    github_repo_count: int = 6  # repositories shown on /app
 
     # Cache settings
-    cache_ttl: int = 3600  # 1 hour
+    cache_ttl: int = 3600  # 1 hour, served fresh until then
+    cache_hard_ttl: int = 86400  # 1 day, served stale until then
+    cache_refresh_timeout: float = 60.0
+    cache_refresh_retry: int = 60  # seconds between failed refreshes
+    cache_dir: Path = Path(tempfile.gettempdir()) / "tonybenoy-com"
+    shared_cache: bool = True  # share snapshots between workers via cache_dir
+    template_cache_dir: Path | None = None  # defaults to cache_dir/templates
+
+    # Startup warm-up, reported by /readyz once finished
+    warmup_github: bool = True  # prefetch the repository cache at startup
+    warmup_timeout: float = 30.0  # seconds before a worker is ready regardless
+
+    # Strip comments and indentation from rendered HTML (always off with debug)
+    minify_html: bool = True
+
+    # Preload hints for the stylesheets in base.html, as a Link header on HTML
+    # responses and, if the server supports it, as 103 Early Hints
+    preload_headers: bool = True
+    early_hints: bool = False
 
     # Security settings
     allowed_hosts: list[str] = ["*"]
     cors_origins: list[str] = ["*"]
+    # Peers whose X-Forwarded-For/X-Real-IP headers are believed
+    trusted_proxies: list[str] = [
+        "127.0.0.1",
+        "::1",
+        "10.0.0.0/8",
+        "172.16.0.0/12",
+        "192.168.0.0/16",
+    ]
+
+    # Rate limit counters: "sqlite://" for cache_dir/ratelimit.sqlite3 shared by
+    # all workers, "sqlite:///path" for another file, or "memory://" per process
+    rate_limit_storage: str = "sqlite://"
 
     # Logging settings
     log_level: str = "INFO"
+    log_format: str = "json"  # "json" or "text"
+    log_sample_rate: float = 1.0  # share of successful requests logged
+    log_include_paths: list[str] = []  # path prefixes to log, empty for all
+    log_exclude_paths: list[str] = ["/health", "/livez", "/readyz", "/test"]
 
     # Email/SMTP settings (optional)
     smtp_server: str | None = None
     smtp_port: int = 587
     smtp_username: str | None = None
     smtp_password: str | None = None
+    smtp_starttls: bool = True
+    smtp_timeout: float = 30.0
     contact_email: str = "me@tonybenoy.com"
+    contact_outbox: Path | None = None  # defaults to cache_dir/outbox.sqlite3
+    contact_retry_base: float = 30.0  # first retry delay, doubled per attempt
+    contact_retry_max: float = 3600.0
+    contact_max_attempts: int = 8
 
-    @field_validator("allowed_hosts", "cors_origins", mode="before")
+    @field_validator(
+        "allowed_hosts",
+        "cors_origins",
+        "trusted_proxies",
+        "log_include_paths",
+        "log_exclude_paths",
+        mode="before",
+    )
     @classmethod
     def parse_json_list(cls, v):
         """Parse JSON string list from environment variables."""
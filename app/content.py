@@ -0,0 +1,143 @@
+"""Site content loaded from versioned data files in ``app/data``.
+
+Each file is parsed and validated once into frozen models and reloaded only
+when its modification time changes, so every request between edits shares
+the same objects.
+"""
+
+import logging
+import time
+from functools import cached_property
+from pathlib import Path
+from typing import Generic, Literal, TypeVar
+
+from pydantic import BaseModel, ConfigDict, ValidationError
+
+from app.conditional import make_etag
+
+logger = logging.getLogger(__name__)
+
+data_dir = Path(__file__).parent / "data"
+
+# Seconds between checks of a data file for changes
+DATA_CHECK_INTERVAL = 2.0
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class Content(BaseModel):
+    """Base for immutable content records."""
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+
+class Job(Content):
+    """A position in the work history."""
+
+    title: str
+    company: str
+    period: str
+    location: str
+    company_url: str | None = None
+    logo: str | None = None
+    description: str
+    technologies: tuple[str, ...] = ()
+    type: str
+    icon: str
+
+
+class Education(Content):
+    """A degree or exchange programme."""
+
+    degree: str
+    institution: str
+    period: str
+    location: str
+    gpa: str | None = None
+    institution_url: str | None = None
+    logo: str | None = None
+    description: str
+    focus: tuple[str, ...] = ()
+    type: str
+    icon: str
+
+
+class Volunteer(Content):
+    """A community or volunteer role."""
+
+    role: str
+    org: str
+    period: str
+    icon: str
+    color: str
+
+
+class Timeline(Content):
+    """Contents of ``timeline.json``."""
+
+    version: Literal[1]
+    work_experience: tuple[Job, ...]
+    education: tuple[Education, ...]
+    volunteer: tuple[Volunteer, ...] = ()
+
+    @cached_property
+    def json_body(self) -> bytes:
+        """The timeline serialized once as a JSON response body."""
+        return self.model_dump_json().encode()
+
+    @cached_property
+    def json_etag(self) -> str:
+        """Strong ETag of :attr:`json_body`."""
+        return make_etag(self.json_body)
+
+
+class DataFile(Generic[M]):  # noqa: UP046
+    """A JSON data file validated into a model and reloaded when it changes.
+
+    The file is checked at most once per ``check_interval``. If an edited file
+    fails to load, the previous version keeps being served and the error is
+    logged; only a failure on the first load is raised.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        model: type[M],
+        check_interval: float = DATA_CHECK_INTERVAL,
+    ) -> None:
+        self.path = path
+        self.model = model
+        self.check_interval = check_interval
+        self._data: M | None = None
+        self._mtime: int | None = None
+        self._checked_at = float("-inf")
+        self.loads = 0
+
+    def get(self) -> M:
+        """Return the loaded data, reloading it if the file changed."""
+        now = time.monotonic()
+        if self._data is not None and now - self._checked_at < self.check_interval:
+            return self._data
+        self._checked_at = now
+
+        try:
+            mtime = self.path.stat().st_mtime_ns
+            if self._data is None or mtime != self._mtime:
+                self._data = self.model.model_validate_json(self.path.read_bytes())
+                self._mtime = mtime
+                self.loads += 1
+                logger.info(f"Loaded {self.path.name}")
+        except (OSError, ValidationError) as e:
+            if self._data is None:
+                raise
+            logger.error(f"Keeping previous {self.path.name}, reload failed: {e}")
+        return self._data
+
+    @property
+    def mtime(self) -> float:
+        """Modification time, in seconds, of the loaded version of the file."""
+        self.get()
+        return (self._mtime or 0) / 1e9
+
+
+timeline_data = DataFile(data_dir / "timeline.json", Timeline)
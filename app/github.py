@@ -0,0 +1,164 @@
+"""Application-scoped HTTP client for the GitHub API.
+
+A single ``httpx.AsyncClient`` is created in the application lifespan and
+shared by every GitHub call, so pages and refreshes reuse pooled keep-alive
+(and, when ``h2`` is installed, HTTP/2) connections instead of paying a new
+TCP and TLS handshake per request.
+
+Responses are also remembered per URL together with their ``ETag`` and
+``Last-Modified`` validators, so refreshes can send conditional requests and
+reuse the stored page on ``304 Not Modified``, which GitHub does not count
+against the rate limit.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+_client: httpx.AsyncClient | None = None
+_validators: "ValidatorStore | None" = None
+
+
+def _http2_available() -> bool:
+    """Return True if the optional ``h2`` package is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_github_client(settings: Settings) -> httpx.AsyncClient:
+    """Create a pooled GitHub API client from application settings."""
+    headers = {"Accept": "application/vnd.github+json"}
+    if settings.github_token:
+        headers["Authorization"] = f"token {settings.github_token}"
+
+    http2 = settings.github_http2 and _http2_available()
+    if settings.github_http2 and not http2:
+        logger.warning("h2 is not installed, using HTTP/1.1 for GitHub API")
+
+    return httpx.AsyncClient(
+        headers=headers,
+        timeout=httpx.Timeout(settings.github_api_timeout),
+        limits=httpx.Limits(
+            max_connections=settings.github_max_connections,
+            max_keepalive_connections=settings.github_max_keepalive_connections,
+            keepalive_expiry=settings.github_keepalive_expiry,
+        ),
+        http2=http2,
+    )
+
+
+def start_github_client(settings: Settings) -> httpx.AsyncClient:
+    """Create the shared GitHub client if it does not exist yet."""
+    global _client
+    if _client is None:
+        _client = create_github_client(settings)
+        logger.info("GitHub API client started")
+    return _client
+
+
+async def close_github_client() -> None:
+    """Close the shared GitHub client and release its connections."""
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
+        logger.info("GitHub API client closed")
+
+
+def get_github_client() -> httpx.AsyncClient | None:
+    """Return the shared GitHub client, or None outside the app lifespan."""
+    return _client
+
+
+class ValidatorStore:
+    """Per-URL response validators and parsed bodies, persisted as JSON."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+        self.not_modified = 0
+        if path is not None:
+            self._load(path)
+
+    def _load(self, path: Path) -> None:
+        """Read stored entries, ignoring a missing or corrupt file."""
+        try:
+            self._entries = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable validator store {path}: {e}")
+
+    def request_headers(self, url: str) -> dict[str, str]:
+        """Return the conditional request headers for a stored URL."""
+        entry = self._entries.get(url)
+        if entry is None:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def get(self, url: str) -> dict[str, Any] | None:
+        """Return the stored entry for a URL."""
+        return self._entries.get(url)
+
+    def put(self, url: str, response: httpx.Response, data: Any) -> None:
+        """Remember a response's validators and its parsed body."""
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+        self._entries[url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "link": response.headers.get("link", ""),
+            "data": data,
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        """Atomically write the store to disk if it changed.
+
+        A failed write (read-only or full disk) is logged and retried on the
+        next save; it must not fail the fetch that produced the entries.
+        """
+        if self.path is None or not self._dirty:
+            return
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(self._entries), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save GitHub validators to {self.path}: {e}")
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return
+        self._dirty = False
+
+
+def get_validator_store(settings: Settings) -> ValidatorStore | None:
+    """Return the shared validator store, or None if conditional requests are off."""
+    global _validators
+    if not settings.github_conditional_requests:
+        return None
+    if _validators is None:
+        _validators = ValidatorStore(settings.cache_dir / "github_validators.json")
+    return _validators
@@ -0,0 +1,29 @@
+"""Gunicorn settings for the production image.
+
+Loaded with ``gunicorn -c python:app.gunicorn_conf`` before the app is
+imported. It points prometheus_client at a fresh directory for its
+multiprocess metric files, so ``/metrics`` aggregates all workers, and
+cleans up after workers that exit.
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+metrics_dir = Path(
+    os.environ.setdefault(
+        "PROMETHEUS_MULTIPROC_DIR",
+        str(Path(tempfile.gettempdir()) / "tonybenoy-com-metrics"),
+    )
+)
+# Files left by a previous run would be added to the new totals
+shutil.rmtree(metrics_dir, ignore_errors=True)
+metrics_dir.mkdir(parents=True)
+
+
+def child_exit(server, worker):
+    """Drop the live gauges of a worker that exited."""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
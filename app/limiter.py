@@ -0,0 +1,215 @@
+"""Rate limiter shared by every route and every worker on a node.
+
+Limits are counted with the sliding window counter strategy in a SQLite
+database under ``cache_dir``, so all gunicorn workers enforce one budget
+per client instead of one each. Clients are identified by their address as
+seen by the first untrusted hop: behind nginx the peer is the proxy, so the
+forwarding headers it sets are honoured, but only when the request really
+came from a trusted proxy.
+"""
+
+import ipaddress
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from math import floor
+from pathlib import Path
+
+from limits.storage import Storage
+from limits.storage.base import SlidingWindowCounterSupport, TimestampedSlidingWindow
+from slowapi import Limiter
+from starlette.requests import Request
+
+from app.config import get_settings
+
+# Expired counters are purged after this many writes
+PURGE_EVERY = 1000
+
+# Seconds to wait for another worker's write lock. Checks run on the event
+# loop, so a busy database fails fast and the limiter falls back to memory.
+BUSY_TIMEOUT = 0.05
+
+Network = ipaddress.IPv4Network | ipaddress.IPv6Network
+
+
+@lru_cache
+def _trusted_networks(proxies: tuple[str, ...]) -> tuple[Network, ...]:
+    return tuple(ipaddress.ip_network(proxy, strict=False) for proxy in proxies)
+
+
+@lru_cache(maxsize=4096)
+def _is_trusted(address: str, networks: tuple[Network, ...]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def client_ip(request: Request) -> str:
+    """Address of the client, looking through trusted reverse proxies.
+
+    ``X-Forwarded-For`` is read from the right, skipping trusted proxies,
+    so a client cannot pick its own key by sending the header itself.
+    ``X-Real-IP`` is used when there is no ``X-Forwarded-For``.
+    """
+    peer = request.client.host if request.client else "127.0.0.1"
+    networks = _trusted_networks(tuple(get_settings().trusted_proxies))
+    if not _is_trusted(peer, networks):
+        return peer
+
+    forwarded = request.headers.get("X-Forwarded-For")
+    if forwarded:
+        hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+        for hop in reversed(hops):
+            if not _is_trusted(hop, networks):
+                return hop
+        return hops[0] if hops else peer
+    return request.headers.get("X-Real-IP", "").strip() or peer
+
+
+class SQLiteStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """``limits`` storage keeping counters in a SQLite database.
+
+    Registered for ``sqlite:///path/to/db`` URIs; a bare ``sqlite://`` uses
+    ``ratelimit.sqlite3`` in the configured ``cache_dir``. Each sliding
+    window check reads and increments its counters in one write
+    transaction, so concurrent workers cannot both take the last slot.
+    A lock held longer than ``BUSY_TIMEOUT`` raises instead of blocking.
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri: str = "sqlite://", **options) -> None:
+        super().__init__(uri, **options)
+        path = uri.removeprefix("sqlite://")
+        self._path = Path(path) if path else None
+        self._local = threading.local()
+        self._writes = 0
+
+    @property
+    def base_exceptions(self) -> type[Exception]:
+        return sqlite3.Error
+
+    @property
+    def path(self) -> Path:
+        """Database file, resolved on first use so tests can move cache_dir."""
+        return self._path or get_settings().cache_dir / "ratelimit.sqlite3"
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, creating the schema on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, timeout=BUSY_TIMEOUT, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS counters "
+                "(key TEXT PRIMARY KEY, value INTEGER NOT NULL, expires REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def _incr(
+        self, conn: sqlite3.Connection, key: str, expiry: float, amount: int, now: float
+    ) -> int:
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            conn.execute("DELETE FROM counters WHERE expires <= ?", (now,))
+        return conn.execute(
+            "INSERT INTO counters (key, value, expires) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET "
+            "value = CASE WHEN expires <= ? THEN excluded.value "
+            "ELSE value + excluded.value END, "
+            "expires = CASE WHEN expires <= ? THEN excluded.expires ELSE expires END "
+            "RETURNING value",
+            (key, amount, now + expiry, now, now),
+        ).fetchone()[0]
+
+    def _get(self, conn: sqlite3.Connection, key: str, now: float) -> int:
+        row = conn.execute(
+            "SELECT value FROM counters WHERE key = ? AND expires > ?", (key, now)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def incr(self, key: str, expiry: float, amount: int = 1) -> int:
+        return self._incr(self._connect(), key, expiry, amount, time.time())
+
+    def get(self, key: str) -> int:
+        return self._get(self._connect(), key, time.time())
+
+    def get_expiry(self, key: str) -> float:
+        row = (
+            self._connect()
+            .execute("SELECT expires FROM counters WHERE key = ?", (key,))
+            .fetchone()
+        )
+        return row[0] if row and row[0] > time.time() else time.time()
+
+    def check(self) -> bool:
+        try:
+            self._connect().execute("SELECT 1")
+        except sqlite3.Error:
+            return False
+        return True
+
+    def reset(self) -> int | None:
+        return self._connect().execute("DELETE FROM counters").rowcount
+
+    def clear(self, key: str) -> None:
+        self._connect().execute("DELETE FROM counters WHERE key = ?", (key,))
+
+    def _window(
+        self, conn: sqlite3.Connection, key: str, expiry: int, now: float
+    ) -> tuple[str, tuple[int, float, int, float]]:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        previous_count = self._get(conn, previous_key, now)
+        current_count = self._get(conn, current_key, now)
+        previous_ttl = (
+            (1 - (((now - expiry) / expiry) % 1)) * expiry if previous_count else 0.0
+        )
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return current_key, (previous_count, previous_ttl, current_count, current_ttl)
+
+    def acquire_sliding_window_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        if amount > limit:
+            return False
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            current_key, (previous_count, previous_ttl, current_count, _) = (
+                self._window(conn, key, expiry, now)
+            )
+            weighted = previous_count * previous_ttl / expiry + current_count
+            allowed = floor(weighted) + amount <= limit
+            if allowed:
+                self._incr(conn, current_key, 2 * expiry, amount, now)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed
+
+    def get_sliding_window(
+        self, key: str, expiry: int
+    ) -> tuple[int, float, int, float]:
+        return self._window(self._connect(), key, expiry, time.time())[1]
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        for window_key in self.sliding_window_keys(key, expiry, time.time()):
+            self.clear(window_key)
+
+
+limiter = Limiter(
+    key_func=client_ip,
+    storage_uri=get_settings().rate_limit_storage,
+    strategy="sliding-window-counter",
+    in_memory_fallback_enabled=True,
+)
@@ -0,0 +1,183 @@
+"""Logging pipeline and request logging middleware.
+
+Log records are put on a queue by the calling code and written by a
+:class:`~logging.handlers.QueueListener` thread, so formatting to JSON and
+writing to stderr never happen on the event loop. Requests are logged by a
+pure ASGI middleware, without the task and body-streaming overhead of
+``BaseHTTPMiddleware``.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import time
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import Settings
+
+logger = logging.getLogger("app.requests")
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Attributes every LogRecord has; anything else was passed in ``extra``
+_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", None, None)).keys()
+    | {"message", "asctime", "taskName"}
+)
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class StderrHandler(logging.StreamHandler):
+    """Write to whatever ``sys.stderr`` is when each record is emitted.
+
+    ``StreamHandler`` binds the stream at creation, so the writer thread
+    would keep writing to a stream that was since replaced and closed, as
+    test runners and embedding servers do.
+    """
+
+    @property
+    def stream(self):  # type: ignore[override]
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value) -> None:
+        pass
+
+
+# Writer thread and the queue and handler it serves
+_listener: QueueListener | None = None
+_listener_args: tuple[queue.SimpleQueue, logging.Handler]
+
+
+def _start_listener() -> None:
+    """Start a writer thread for the queue the root logger feeds."""
+    global _listener
+    _listener = QueueListener(*_listener_args, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _restart_in_child() -> None:
+    """Give a forked worker its own writer thread; threads do not survive fork."""
+    if _listener is not None:
+        _start_listener()
+
+
+def setup_logging(settings: Settings) -> None:
+    """Route all logging through a queue to a background writer thread."""
+    global _listener_args
+    _stop_listener()
+    handler = StderrHandler()
+    if settings.log_format == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers = [QueueHandler(log_queue)]
+    root.setLevel(getattr(logging, settings.log_level.upper()))
+
+    _listener_args = (log_queue, handler)
+    _start_listener()
+
+
+# gunicorn forks workers from a preloaded app after logging is set up
+os.register_at_fork(after_in_child=_restart_in_child)
+atexit.register(_stop_listener)
+
+
+class RequestLogMiddleware:
+    """Log one line per HTTP request with its status and duration.
+
+    Only paths starting with an ``include_paths`` prefix are logged (all
+    paths if it is empty), minus those starting with an ``exclude_paths``
+    prefix, such as health probes. Successful requests are sampled at
+    ``sample_rate``; server errors are always logged.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float = 1.0,
+        include_paths: Iterable[str] = (),
+        exclude_paths: Iterable[str] = (),
+    ) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+        self.include_paths = tuple(include_paths)
+        self.exclude_paths = tuple(exclude_paths)
+
+    def _wanted(self, path: str) -> bool:
+        if self.include_paths and not path.startswith(self.include_paths):
+            return False
+        return not (self.exclude_paths and path.startswith(self.exclude_paths))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._wanted(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter_ns()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if status >= 500 or random.random() < self.sample_rate:  # nosec B311
+                duration_ms = (time.perf_counter_ns() - start) / 1_000_000
+                logger.log(
+                    logging.ERROR if status >= 500 else logging.INFO,
+                    "%s %s %d %.1fms",
+                    scope["method"],
+                    scope["path"],
+                    status,
+                    duration_ms,
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status,
+                        "duration_ms": round(duration_ms, 3),
+                    },
+                )
@@ -1,43 +1,68 @@
 import logging
-import pathlib
-import time
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse, Response
-from fastapi.staticfiles import StaticFiles
-from slowapi import Limiter, _rate_limit_exceeded_handler
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
-from slowapi.util import get_remote_address
 
+from app.assets import (
+    ASSET_CHECK_INTERVAL,
+    HashedStaticFiles,
+    asset_manifest,
+    static_dir,
+)
 from app.config import get_settings
+from app.github import close_github_client, start_github_client
+from app.limiter import limiter
+from app.log import RequestLogMiddleware, setup_logging
+from app.metrics import MetricsMiddleware
+from app.outbox import start_mail_sender, stop_mail_sender
+from app.preload import PreloadMiddleware
+from app.rendering import TEMPLATE_CHECK_INTERVAL, page_cache
 from app.routes.apps import apps
 from app.routes.home import home
 from app.routes.photography import photography
+from app.routes.well_known import well_known
+from app.utils import templates
+from app.warmup import compile_templates, readiness, start_warmup, stop_warmup
 
 # Load settings for logging configuration
 settings = get_settings()
 
 # Configure logging
-logging.basicConfig(
-    level=getattr(logging, settings.log_level.upper()),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+setup_logging(settings)
 logger = logging.getLogger(__name__)
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+# Static files and templates are scanned once at startup; debug mode picks
+# up edits
+if settings.debug:
+    asset_manifest.check_interval = ASSET_CHECK_INTERVAL
+    page_cache.check_interval = TEMPLATE_CHECK_INTERVAL
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
     logger.info("Starting up TonyBenoy.com application")
+    readiness.start()
+    app.state.github_client = start_github_client(settings)
+    assets = asset_manifest.build()
+    logger.info(f"Hashed {assets} static assets")
+    compiled = compile_templates(templates.env)
+    logger.info(f"Compiled {compiled} templates")
+    rendered = await page_cache.prerender(app.routes)
+    logger.info(f"Pre-rendered {rendered} pages")
+    start_mail_sender(settings)
+    start_warmup(settings)
     yield
     logger.info("Shutting down TonyBenoy.com application")
+    await stop_warmup()
+    await stop_mail_sender()
+    await close_github_client()
 
 
 # Initialize FastAPI app
@@ -75,6 +100,21 @@ async def custom_rate_limit_handler(request: Request, exc: Exception) -> Respons
 
 app.add_exception_handler(RateLimitExceeded, custom_rate_limit_handler)
 
+# Link preload headers (and 103 Early Hints) for the critical stylesheets
+if settings.preload_headers:
+    app.add_middleware(PreloadMiddleware, early_hints=settings.early_hints)
+
+# Per-route request metrics
+app.add_middleware(MetricsMiddleware)
+
+# Request logging, outermost so that it times the whole stack
+app.add_middleware(
+    RequestLogMiddleware,
+    sample_rate=settings.log_sample_rate,
+    include_paths=settings.log_include_paths,
+    exclude_paths=settings.log_exclude_paths,
+)
+
 
 @app.exception_handler(500)
 async def internal_server_error_handler(request: Request, exc: Exception):
@@ -86,41 +126,15 @@ async def internal_server_error_handler(request: Request, exc: Exception):
     )
 
 
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all incoming requests."""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-
-    logger.info(
-        f"{request.method} {request.url.path} - "
-        f"Status: {response.status_code} - "
-        f"Time: {process_time:.3f}s"
-    )
-    return response
-
-
 # Mount static files using consistent path
-static_dir = pathlib.Path(__file__).parent / "static"
-app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+app.mount(
+    "/static",
+    HashedStaticFiles(directory=str(static_dir), manifest=asset_manifest),
+    name="static",
+)
 
 # Include routers
 app.include_router(home, tags=["home"])
 app.include_router(apps, tags=["applications"])
 app.include_router(photography, tags=["photography"])
-
-
-@app.get("/llms.txt", response_class=Response)
-async def get_llms_txt():
-    """Serve llms.txt file for LLM context."""
-    try:
-        llms_file = pathlib.Path(__file__).parent.parent / "llms.txt"
-        with open(llms_file, encoding="utf-8") as f:
-            content = f.read()
-        return Response(content=content, media_type="text/plain")
-    except FileNotFoundError:
-        return Response(
-            content="# Tony Benoy\n\nPersonal website of Tony Benoy, Software Engineer",
-            media_type="text/plain",
-        )
+app.include_router(well_known, include_in_schema=False)
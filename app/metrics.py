@@ -0,0 +1,110 @@
+"""Prometheus metrics for requests, caches, rendering and GitHub calls.
+
+Under gunicorn each worker is a separate process, so metrics are kept in
+prometheus_client's file-backed multiprocess store when
+``PROMETHEUS_MULTIPROC_DIR`` is set (see ``app/gunicorn_conf.py``), and
+``/metrics`` aggregates the files of every worker. Without it, for example
+under ``uvicorn --reload`` or in tests, the default in-process registry is
+used.
+"""
+
+import os
+import time
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route and status.",
+    ["method", "route", "status"],
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to serve an HTTP request.",
+    ["method", "route"],
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests being served.",
+    multiprocess_mode="livesum",
+)
+CACHE_EVENTS = Counter(
+    "github_cache_events_total",
+    "GitHub repository cache lookups by outcome (hit, stale, miss, shared, coalesced).",
+    ["event"],
+)
+TEMPLATE_RENDER = Histogram(
+    "template_render_seconds",
+    "Time to render a template.",
+    ["template"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+GITHUB_REQUEST_DURATION = Histogram(
+    "github_request_duration_seconds",
+    "Latency of outbound GitHub API requests.",
+    ["status"],
+)
+
+
+def render_metrics() -> bytes:
+    """Return all metrics in the Prometheus text format.
+
+    In multiprocess mode this reads every worker's files, so call it in a
+    thread.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry)
+
+
+def _route_label(scope: Scope) -> str:
+    """Route template of a handled request, to keep label cardinality low."""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    # Mounted apps such as /static leave their mount path in root_path
+    return scope.get("root_path") or "unmatched"
+
+
+class MetricsMiddleware:
+    """Count and time HTTP requests per route."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec()
+            route = _route_label(scope)
+            REQUESTS.labels(scope["method"], route, str(status)).inc()
+            REQUEST_DURATION.labels(scope["method"], route).observe(
+                time.perf_counter() - start
+            )
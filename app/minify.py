@@ -0,0 +1,89 @@
+"""Whitespace and comment removal for rendered HTML.
+
+Deliberately conservative, so that a minified page renders exactly like the
+original:
+
+- runs of whitespace in text collapse to one space, or to one newline if
+  they contain a line break, but never disappear;
+- whitespace between attributes in tags collapses; attribute values are
+  left untouched;
+- comments are dropped, except conditional comments;
+- ``<pre>`` and ``<textarea>`` are copied verbatim;
+- ``<script>`` and ``<style>`` lose indentation and blank lines only, and
+  are copied verbatim if they contain a backtick, as a multi-line template
+  literal's whitespace is part of its value.
+
+Cached pages are minified once, when rendered. Pages rendered on every
+request go through :func:`minify_cached`, which remembers recent results,
+so unchanged output is never minified twice.
+"""
+
+import functools
+import re
+
+TOKEN = re.compile(
+    r"""
+    (?P<comment><!--(?!\[if).*?-->)
+    | (?P<raw>
+        <(?P<name>pre|textarea|script|style)\b(?P<attrs>(?:[^>"']|"[^"]*"|'[^']*')*)>
+        (?P<content>.*?)
+        </(?P=name)\s*>
+    )
+    | (?P<tag><[a-zA-Z/!](?:[^>"']|"[^"]*"|'[^']*')*>)
+    """,
+    re.DOTALL | re.IGNORECASE | re.VERBOSE,
+)
+WHITESPACE = re.compile(r"\s+")
+TAG_PART = re.compile(r"""("[^"]*"|'[^']*')|\s+""")
+INDENTED_LINES = re.compile(r"\n\s+")
+
+
+def _collapse(match: re.Match[str]) -> str:
+    return "\n" if "\n" in match.group() else " "
+
+
+def _collapse_text(text: str) -> str:
+    return WHITESPACE.sub(_collapse, text)
+
+
+def _collapse_tag(tag: str) -> str:
+    tag = TAG_PART.sub(lambda m: m.group(1) or " ", tag)
+    # A space before the closing bracket is outside any quoted value
+    return tag[:-2] + ">" if tag.endswith(" >") else tag
+
+
+def _minify_raw(match: re.Match[str]) -> str:
+    name = match["name"].lower()
+    if name in ("pre", "textarea"):
+        return match.group()
+    content = match["content"]
+    if "`" not in content:
+        content = INDENTED_LINES.sub("\n", content.strip())
+        if content:
+            content = "\n" + content + "\n"
+    opening = _collapse_tag("<" + match["name"] + match["attrs"] + ">")
+    return opening + content + "</" + match["name"] + ">"
+
+
+def minify_html(html: str) -> str:
+    """Return ``html`` without comments and redundant whitespace."""
+    parts = []
+    text = []  # text since the last tag, with comments dropped
+    position = 0
+    for match in TOKEN.finditer(html):
+        text.append(html[position : match.start()])
+        position = match.end()
+        if match["comment"]:
+            continue
+        parts.append(_collapse_text("".join(text)))
+        text.clear()
+        parts.append(
+            _minify_raw(match) if match["raw"] else _collapse_tag(match.group())
+        )
+    text.append(html[position:])
+    parts.append(_collapse_text("".join(text)))
+    return "".join(parts)
+
+
+# Minified output of recent documents, for pages rendered per request
+minify_cached = functools.lru_cache(maxsize=64)(minify_html)
@@ -0,0 +1,372 @@
+"""Durable outbox and background SMTP delivery for contact-form messages.
+
+The contact route only writes the message to a SQLite outbox and returns.
+A background :class:`MailSender` task in each worker claims due messages,
+sends them over one reused SMTP connection and retries failures with
+exponential backoff. Messages the relay rejects outright, or that cannot be
+made into a valid email, are kept but not retried. On shutdown it lets a
+send in progress finish and be recorded, makes a final delivery pass and
+only then closes the connection; anything still undelivered stays in the
+outbox for the next start.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from app.config import Settings
+
+if TYPE_CHECKING:
+    import smtplib
+
+logger = logging.getLogger(__name__)
+
+# SMTP commands one delivery may wait on for up to ``smtp_timeout`` each:
+# NOOP on the kept connection, connect, STARTTLS, login, the message itself
+# and QUIT after a failure. A claim lasts that long, so that it cannot
+# expire while its message is still being sent.
+SMTP_STEPS = 6
+
+
+class PermanentFailure(Exception):
+    """A message that retrying would not deliver."""
+
+
+@dataclass(frozen=True, slots=True)
+class OutboxMessage:
+    """A queued contact-form email."""
+
+    id: int
+    sender: str
+    recipient: str
+    subject: str
+    body: str
+    reply_to: str
+    attempts: int
+
+
+class Outbox:
+    """SQLite queue of messages waiting for delivery.
+
+    Messages are claimed by pushing their next attempt time forward in the
+    same transaction that selects them, so several worker processes can
+    deliver from one outbox without sending a message twice.
+
+    Methods block on SQLite and are meant to be run with ``asyncio.to_thread``.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, creating the schema on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS messages ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "created REAL NOT NULL, "
+                "sender TEXT NOT NULL, "
+                "recipient TEXT NOT NULL, "
+                "subject TEXT NOT NULL, "
+                "body TEXT NOT NULL, "
+                "reply_to TEXT NOT NULL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, "
+                "next_attempt REAL NOT NULL, "
+                "last_error TEXT)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def add(
+        self, sender: str, recipient: str, subject: str, body: str, reply_to: str
+    ) -> int:
+        """Queue a message for immediate delivery and return its id."""
+        now = time.time()
+        return (
+            self._connect()
+            .execute(
+                "INSERT INTO messages "
+                "(created, sender, recipient, subject, body, reply_to, next_attempt) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) RETURNING id",
+                (now, sender, recipient, subject, body, reply_to, now),
+            )
+            .fetchone()[0]
+        )
+
+    def claim(
+        self, max_attempts: int, timeout: float, limit: int = 1
+    ) -> list[OutboxMessage]:
+        """Take up to ``limit`` due messages, hiding them for ``timeout`` seconds."""
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT id, sender, recipient, subject, body, reply_to, attempts "
+                "FROM messages WHERE next_attempt <= ? AND attempts < ? "
+                "ORDER BY id LIMIT ?",
+                (now, max_attempts, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE messages SET next_attempt = ? WHERE id = ?",
+                [(now + timeout, row[0]) for row in rows],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return [OutboxMessage(*row) for row in rows]
+
+    def delivered(self, message_id: int) -> None:
+        """Remove a delivered message."""
+        self._connect().execute("DELETE FROM messages WHERE id = ?", (message_id,))
+
+    def failed(self, message_id: int, error: str, retry_at: float) -> None:
+        """Record a failed attempt and when to try again."""
+        self._connect().execute(
+            "UPDATE messages SET attempts = attempts + 1, next_attempt = ?, "
+            "last_error = ? WHERE id = ?",
+            (retry_at, error, message_id),
+        )
+
+    def rejected(self, message_id: int, error: str, max_attempts: int) -> None:
+        """Record a permanent failure, so the message is kept but not retried."""
+        self._connect().execute(
+            "UPDATE messages SET attempts = ?, last_error = ? WHERE id = ?",
+            (max_attempts, error, message_id),
+        )
+
+    def pending(self) -> int:
+        """Number of messages still waiting, including ones that gave up."""
+        return self._connect().execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+
+
+class MailSender:
+    """Background task delivering outbox messages over a reused connection."""
+
+    def __init__(
+        self, outbox: Outbox, settings: Settings, poll_interval: float = 30.0
+    ) -> None:
+        self.outbox = outbox
+        self.settings = settings
+        self.poll_interval = poll_interval
+        self._smtp: smtplib.SMTP | None = None
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        self.sent = 0
+        self.failures = 0
+
+    def start(self) -> None:
+        """Start delivering in the background."""
+        self._task = asyncio.create_task(self._run())
+
+    def wake(self) -> None:
+        """Deliver newly queued messages now instead of at the next poll."""
+        self._wake.set()
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Finish the current send, deliver what is due, then close.
+
+        The task is asked to stop instead of being cancelled: a message being
+        sent in a worker thread is recorded as delivered, and the connection
+        is never used by two threads at once. If the final pass overruns
+        ``timeout`` the connection is left to its thread, and messages still
+        claimed are retried once their claim expires.
+        """
+        self._stopping = True
+        self._wake.set()
+        task = self._task or asyncio.create_task(self._drain())
+        self._task = None
+        done, _ = await asyncio.wait({task}, timeout=timeout)
+        if not done:
+            logger.warning("Outbox not fully drained before shutdown")
+            task.cancel()
+            return
+        await asyncio.to_thread(self._close)
+
+    async def _run(self) -> None:
+        while True:
+            await self._drain()
+            if self._stopping:
+                return
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def _drain(self) -> None:
+        """Deliver until no message is due."""
+        try:
+            while await self.deliver_due():
+                pass
+        except Exception as e:
+            logger.error(f"Outbox delivery pass failed: {e}")
+
+    @property
+    def claim_timeout(self) -> float:
+        """Seconds a claimed message is hidden from other workers."""
+        return SMTP_STEPS * self.settings.smtp_timeout
+
+    async def deliver_due(self) -> int:
+        """Deliver the messages that are due; return how many were claimed.
+
+        Messages are claimed one at a time, so that a claim only has to
+        outlast a single send.
+        """
+        claimed = 0
+        while messages := await asyncio.to_thread(
+            self.outbox.claim, self.settings.contact_max_attempts, self.claim_timeout
+        ):
+            claimed += len(messages)
+            for message in messages:
+                await self._deliver(message)
+        return claimed
+
+    async def _deliver(self, message: OutboxMessage) -> None:
+        """Send one claimed message and record the outcome."""
+        max_attempts = self.settings.contact_max_attempts
+        try:
+            await asyncio.to_thread(self._send, message)
+        except PermanentFailure as e:
+            # The connection is still good; only this message is refused
+            self.failures += 1
+            await asyncio.to_thread(
+                self.outbox.rejected, message.id, str(e), max_attempts
+            )
+            logger.error(f"Contact message {message.id} rejected: {e}")
+        except Exception as e:
+            self.failures += 1
+            await asyncio.to_thread(self._close)
+            delay = min(
+                self.settings.contact_retry_base * 2**message.attempts,
+                self.settings.contact_retry_max,
+            )
+            await asyncio.to_thread(
+                self.outbox.failed, message.id, str(e), time.time() + delay
+            )
+            if message.attempts + 1 >= max_attempts:
+                logger.error(f"Giving up on contact message {message.id}: {e}")
+            else:
+                logger.warning(
+                    f"Contact message {message.id} failed, "
+                    f"retrying in {delay:.0f}s: {e}"
+                )
+        else:
+            self.sent += 1
+            await asyncio.to_thread(self.outbox.delivered, message.id)
+            logger.info(f"Contact message {message.id} delivered")
+
+    def _connection(self) -> "smtplib.SMTP":
+        """Return the open SMTP connection, reconnecting if it was dropped."""
+        # Deferred: only workers that actually send mail need smtplib
+        import smtplib
+
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except OSError:  # includes SMTPException
+                pass
+            self._close()
+
+        settings = self.settings
+        if not settings.smtp_server:
+            raise RuntimeError("No SMTP server configured")
+        smtp = smtplib.SMTP(
+            settings.smtp_server, settings.smtp_port, timeout=settings.smtp_timeout
+        )
+        try:
+            if settings.smtp_starttls:
+                smtp.starttls()
+            if settings.smtp_username and settings.smtp_password:
+                smtp.login(settings.smtp_username, settings.smtp_password)
+        except BaseException:
+            smtp.close()
+            raise
+        self._smtp = smtp
+        return smtp
+
+    def _send(self, message: OutboxMessage) -> None:
+        """Send a message, raising :class:`PermanentFailure` if it cannot go."""
+        import smtplib
+        from email.message import EmailMessage
+
+        email = EmailMessage()
+        try:
+            email["From"] = message.sender
+            email["To"] = message.recipient
+            email["Reply-To"] = message.reply_to
+            email["Subject"] = message.subject
+            email.set_content(message.body)
+        except ValueError as e:  # such as CR or LF in a header
+            raise PermanentFailure(e) from e
+
+        smtp = self._connection()
+        try:
+            smtp.send_message(email)
+        except smtplib.SMTPRecipientsRefused as e:
+            if all(code >= 500 for code, _ in e.recipients.values()):
+                raise PermanentFailure(e) from e
+            raise
+        except smtplib.SMTPResponseException as e:
+            if e.smtp_code >= 500:
+                raise PermanentFailure(e) from e
+            raise
+
+    def _close(self) -> None:
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except OSError:
+            self._smtp.close()
+        self._smtp = None
+
+
+_outbox: Outbox | None = None
+_sender: MailSender | None = None
+
+
+def get_outbox(settings: Settings) -> Outbox:
+    """Return the contact-form outbox."""
+    global _outbox
+    path = settings.contact_outbox or settings.cache_dir / "outbox.sqlite3"
+    if _outbox is None or _outbox.path != path:
+        _outbox = Outbox(path)
+    return _outbox
+
+
+def start_mail_sender(settings: Settings) -> MailSender | None:
+    """Start background delivery if SMTP is configured."""
+    global _sender
+    if not settings.smtp_server:
+        return None
+    _sender = MailSender(get_outbox(settings), settings)
+    _sender.start()
+    _sender.wake()
+    return _sender
+
+
+def get_mail_sender() -> MailSender | None:
+    """Return the running sender, if any."""
+    return _sender
+
+
+async def stop_mail_sender() -> None:
+    """Drain and stop background delivery."""
+    global _sender
+    if _sender is not None:
+        await _sender.stop()
+        _sender = None
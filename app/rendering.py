@@ -0,0 +1,353 @@
+"""Cache of fully rendered pages for routes whose output only depends on the path.
+
+Routes decorated with :func:`cached_page` return their template context; the
+page is rendered once per (template, context, path), stored as encoded bytes
+with a strong ETag, and served from memory afterwards. Only the latest
+context's page is kept for each template and path. Templates are
+scanned once; in debug mode they are rescanned and entries are dropped when
+a template file changes. A new context object (for example reloaded data)
+renders a new entry. A request whose validators match the cached page
+is answered with a 304.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import time
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+)
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute
+from fastapi.templating import Jinja2Templates
+
+from app.conditional import (
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    validator_headers,
+)
+from app.config import get_settings
+from app.metrics import TEMPLATE_RENDER
+from app.minify import minify_cached, minify_html
+from app.utils import templates, templates_dir
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the template files for changes, in debug mode
+TEMPLATE_CHECK_INTERVAL = 2.0
+
+# Upper bound on remembered context hashes before the memo is reset
+MAX_CONTEXT_HASHES = 256
+
+# End of the document head, sent before the rest of a streamed page
+HEAD_END = "</head>"
+
+
+@dataclass(frozen=True, slots=True)
+class RenderedPage:
+    """A rendered page body and its validators."""
+
+    body: bytes
+    etag: str
+    last_modified: float
+
+
+def api_routes(routes: Iterable[Any]) -> Iterator[APIRoute]:
+    """Every API route in a route table, including those of included routers.
+
+    Newer FastAPI versions keep each included router as one entry in
+    ``app.routes``; its routes are listed from the original router, which
+    is enough for routers included without a prefix, as they all are here.
+    """
+    for route in routes:
+        if isinstance(route, APIRoute):
+            yield route
+        elif (router := getattr(route, "original_router", None)) is not None:
+            yield from api_routes(router.routes)
+
+
+def minify_enabled() -> bool:
+    """Whether rendered HTML is minified; debug mode keeps it readable."""
+    settings = get_settings()
+    return settings.minify_html and not settings.debug
+
+
+def request_for_path(path: str) -> Request:
+    """Build a minimal GET request for rendering a page outside a request."""
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "scheme": "https",
+            "server": ("tonybenoy.com", 443),
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [],
+        }
+    )
+
+
+class PageCache:
+    """Rendered pages keyed by template name and request path.
+
+    Each entry remembers the hash of the context it was rendered from; a
+    page rendered from a new context replaces it, so reloaded data does not
+    leave old versions behind.
+    """
+
+    def __init__(
+        self,
+        templates: Jinja2Templates,
+        directory: Path,
+        check_interval: float | None = None,
+    ) -> None:
+        self.templates = templates
+        self.directory = directory
+        self.check_interval = check_interval
+        self._pages: dict[tuple[str, str], tuple[str, RenderedPage]] = {}
+        self._context_hashes: dict[int, tuple[Mapping[str, Any], str]] = {}
+        self._signature: tuple[tuple[str, int], ...] | None = None
+        self._version = ""
+        self._modified = 0.0
+        self._checked_at = float("-inf")
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self) -> None:
+        """Drop every rendered page."""
+        self._pages.clear()
+        self._context_hashes.clear()
+
+    def _check_templates(self) -> None:
+        """Clear the cache if any template file changed since the last check.
+
+        Templates are scanned on first use, then only every
+        ``check_interval`` seconds if it is set.
+        """
+        now = time.monotonic()
+        if self._checked_at != float("-inf") and (
+            self.check_interval is None or now - self._checked_at < self.check_interval
+        ):
+            return
+        self._checked_at = now
+
+        signature = tuple(
+            sorted(
+                (str(path.relative_to(self.directory)), path.stat().st_mtime_ns)
+                for path in self.directory.rglob("*.html")
+            )
+        )
+        if signature != self._signature:
+            if self._signature is not None:
+                logger.info("Templates changed, clearing page cache")
+            self.clear()
+            self._signature = signature
+            self._version = hashlib.sha256(repr(signature).encode()).hexdigest()[:16]
+            self._modified = max((mtime for _, mtime in signature), default=0) / 1e9
+
+    @property
+    def version(self) -> str:
+        """Short hash that changes whenever any template file changes."""
+        self._check_templates()
+        return self._version
+
+    @property
+    def last_modified(self) -> float:
+        """Modification time of the most recently changed template."""
+        self._check_templates()
+        return self._modified
+
+    def context_hash(self, context: Mapping[str, Any]) -> str:
+        """Hash a template context, memoized by the identity of the mapping.
+
+        Route contexts are long-lived objects, so each one is serialized once;
+        the memo holds a reference so an id is never reused while cached.
+        """
+        memo = self._context_hashes.get(id(context))
+        if memo is not None and memo[0] is context:
+            return memo[1]
+
+        encoded = json.dumps(context, sort_keys=True, default=repr).encode()
+        digest = hashlib.sha256(encoded).hexdigest()[:16]
+        if len(self._context_hashes) >= MAX_CONTEXT_HASHES:
+            self._context_hashes.clear()
+        self._context_hashes[id(context)] = (context, digest)
+        return digest
+
+    def get(
+        self,
+        template_name: str,
+        context: Mapping[str, Any],
+        request: Request,
+        last_modified: float | None = None,
+    ) -> RenderedPage:
+        """Return the rendered page, rendering it on a miss.
+
+        ``last_modified`` is the modification time of the page's data
+        sources; the page reports the later of it and the templates' time.
+        """
+        self._check_templates()
+        key = (template_name, request.url.path)
+        digest = self.context_hash(context)
+        entry = self._pages.get(key)
+        if entry is not None and entry[0] == digest:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        template = self.templates.get_template(template_name)
+        start = time.perf_counter()
+        html = template.render({**context, "request": request})
+        if minify_enabled():
+            html = minify_html(html)
+        body = html.encode()
+        TEMPLATE_RENDER.labels(template_name).observe(time.perf_counter() - start)
+        page = RenderedPage(
+            body=body,
+            etag=make_etag(body),
+            last_modified=max(self._modified, last_modified or 0.0),
+        )
+        self._pages[key] = (digest, page)
+        return page
+
+    def response(
+        self,
+        request: Request,
+        template_name: str,
+        context: Mapping[str, Any],
+        last_modified: float | None = None,
+    ) -> Response:
+        """Serve a cached page as an HTML response, or a 304 if unchanged."""
+        page = self.get(template_name, context, request, last_modified)
+        if is_not_modified(request, page.etag, page.last_modified):
+            return not_modified_response(page.etag, page.last_modified)
+        return Response(
+            content=page.body,
+            media_type="text/html",
+            headers=validator_headers(page.etag, page.last_modified),
+        )
+
+    async def prerender(self, routes: Iterable[Any]) -> int:
+        """Render every cached-page GET route ahead of the first request."""
+        count = 0
+        for route in api_routes(routes):
+            if not route.methods or "GET" not in route.methods:
+                continue
+            template_name = getattr(route.endpoint, "cached_template", None)
+            page_context = getattr(route.endpoint, "page_context", None)
+            if template_name is None or page_context is None:
+                continue
+            request = request_for_path(route.path)
+            context = await page_context(request)
+            sources = getattr(route.endpoint, "page_sources", ())
+            self.get(template_name, context, request, sources_modified(sources))
+            count += 1
+        return count
+
+
+page_cache = PageCache(templates, templates_dir)
+
+
+class StreamingTemplateResponse(StreamingResponse):
+    """A template rendered while it is sent, with the document head first.
+
+    For pages that are rendered per request rather than served from the
+    page cache. The head, with its stylesheet links, is flushed as soon as
+    it is rendered so the browser can fetch them while the body renders.
+    ``X-Accel-Buffering`` stops nginx from holding the head back. Head and
+    body are minified separately, each memoized by its content.
+    """
+
+    def __init__(
+        self,
+        request: Request,
+        template_name: str,
+        context: Mapping[str, Any],
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        self.template_name = template_name
+        self.context = {**context, "request": request}
+        super().__init__(
+            self._render(),
+            status_code=status_code,
+            headers={**(headers or {}), "X-Accel-Buffering": "no"},
+            media_type="text/html",
+        )
+
+    async def _render(self) -> AsyncIterator[bytes]:
+        template = templates.get_template(self.template_name)
+        minify = minify_cached if minify_enabled() else str
+        start = time.perf_counter()
+        chunks = template.generate(self.context)
+        head = []
+        rest = ""
+        for chunk in chunks:
+            end = chunk.find(HEAD_END)
+            if end != -1:
+                end += len(HEAD_END)
+                head.append(chunk[:end])
+                rest = chunk[end:]
+                break
+            head.append(chunk)
+        html = minify("".join(head))
+        elapsed = time.perf_counter() - start
+        yield html.encode()
+
+        start = time.perf_counter()
+        html = minify(rest + "".join(chunks))
+        elapsed += time.perf_counter() - start
+        TEMPLATE_RENDER.labels(self.template_name).observe(elapsed)
+        if html:
+            yield html.encode()
+
+
+def sources_modified(sources: Iterable[Any]) -> float | None:
+    """Latest modification time of a page's data sources."""
+    return max((source.mtime for source in sources), default=None)
+
+
+def cached_page(
+    template_name: str, sources: Iterable[Any] = ()
+) -> Callable[
+    [Callable[..., Awaitable[Mapping[str, Any]]]], Callable[..., Awaitable[Response]]
+]:
+    """Serve a route from the page cache.
+
+    The decorated route returns its template context, which should be a
+    long-lived mapping (a module constant or loaded data) so that its hash is
+    computed once. ``sources`` are the data files the context is built from;
+    their ``mtime`` feeds the page's Last-Modified header.
+    """
+    sources = tuple(sources)
+
+    def decorator(
+        func: Callable[..., Awaitable[Mapping[str, Any]]],
+    ) -> Callable[..., Awaitable[Response]]:
+        @functools.wraps(func)
+        async def wrapper(request: Request, *args: Any, **kwargs: Any) -> Response:
+            context = await func(request, *args, **kwargs)
+            return page_cache.response(
+                request, template_name, context, sources_modified(sources)
+            )
+
+        wrapper.cached_template = template_name  # type: ignore[attr-defined]
+        wrapper.page_context = func  # type: ignore[attr-defined]
+        wrapper.page_sources = sources  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
@@ -1,21 +1,45 @@
+import asyncio
 import logging
 import time
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, Request
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 
-from app.config import get_settings
-from app.utils import get_repo_data_for_user, sort_repos, templates
+from app.assets import asset_manifest
+from app.cache import get_shared_cache, repo_fetches
+from app.conditional import (
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    validator_headers,
+)
+from app.config import Settings, get_settings
+from app.limiter import limiter
+from app.metrics import CACHE_EVENTS
+from app.rendering import StreamingTemplateResponse, minify_enabled, page_cache
+from app.sitemap import TemplateFile, sitemap_entry
+from app.structured_data import json_ld
+from app.utils import Repo, get_repo_data_for_user, sort_repos
 
 logger = logging.getLogger(__name__)
-limiter = Limiter(key_func=get_remote_address)
 apps = APIRouter()
 
-# Simple in-memory cache
+# In-process cache, in front of the node-wide shared cache
 _cache: dict[str, dict[str, Any]] = {}
 
+# Seconds between shared cache checks while another worker refreshes
+SHARED_POLL_INTERVAL = 0.25
+
+# Background refresh tasks, at most one per cache key
+_refresh_tasks: dict[str, asyncio.Task] = {}
+
+# Earliest time a failed background refresh may be retried, per cache key
+_refresh_retry_at: dict[str, float] = {}
+
+
+class RefreshElsewhere(Exception):
+    """Another worker holds the refresh lease while a stale copy is served."""
+
 
 def _get_cached_data(cache_key: str, ttl: int) -> Any | None:
     """Get data from cache if it exists and is not expired."""
@@ -30,36 +54,192 @@ def _get_cached_data(cache_key: str, ttl: int) -> Any | None:
     return cache_entry["data"]
 
 
-def _set_cache_data(cache_key: str, data: Any) -> None:
+def _set_cache_data(cache_key: str, data: Any, timestamp: float | None = None) -> None:
     """Store data in cache with timestamp."""
-    _cache[cache_key] = {"data": data, "timestamp": time.time()}
+    if timestamp is None:
+        timestamp = time.time()
+    _cache[cache_key] = {"data": data, "timestamp": timestamp}
+
+
+def _get_cache_age(cache_key: str) -> float | None:
+    """Return the age of a cache entry in seconds, or None if it is missing."""
+    if cache_key not in _cache:
+        return None
+    return time.time() - _cache[cache_key]["timestamp"]
+
+
+class RepoSnapshot:
+    """Time the cached repository list was fetched, as a sitemap source."""
+
+    @property
+    def mtime(self) -> float | None:
+        entry = _cache.get(f"github_repos_{get_settings().github_username}")
+        return entry["timestamp"] if entry else None
+
+
+async def _fetch_repos(settings: Settings) -> list[Repo]:
+    """Fetch and rank repositories for the configured GitHub user."""
+    url = (
+        f"https://api.github.com/users/{settings.github_username}/repos"
+        "?sort=pushed&per_page=100"
+    )
+    repo_data = await get_repo_data_for_user(
+        url=url, github_token=settings.github_token
+    )
+    return sort_repos(repo_data, count=settings.github_repo_count)
+
+
+async def _adopt_shared(cache_key: str, settings: Settings) -> bool:
+    """Copy a newer snapshot from the shared cache into the in-process cache."""
+    shared = get_shared_cache(settings)
+    if shared is None:
+        return False
+
+    snapshot = await asyncio.to_thread(shared.get, cache_key)
+    if snapshot is None:
+        return False
+
+    data, timestamp = snapshot
+    current = _cache.get(cache_key)
+    if current is not None and current["timestamp"] >= timestamp:
+        return False
+
+    _set_cache_data(cache_key, [Repo.from_dict(repo) for repo in data], timestamp)
+    CACHE_EVENTS.labels("shared").inc()
+    return True
+
+
+async def _wait_for_shared(cache_key: str, settings: Settings) -> Any | None:
+    """Wait for the worker holding the refresh lease to publish a snapshot."""
+    deadline = time.monotonic() + settings.cache_refresh_timeout
+    while time.monotonic() < deadline:
+        await asyncio.sleep(SHARED_POLL_INTERVAL)
+        if await _adopt_shared(cache_key, settings):
+            return _cache[cache_key]["data"]
+    return None
+
+
+async def _load_repos(cache_key: str, settings: Settings) -> list[Repo]:
+    """Fetch and cache repositories, sharing one fetch between concurrent misses.
+
+    Within a worker, concurrent misses share one fetch. Across workers, the
+    shared cache lease lets a single worker fetch while the others wait for
+    its snapshot. A worker that still has a servable stale copy does not
+    wait: it raises :class:`RefreshElsewhere` and adopts the snapshot on a
+    later request.
+    """
+
+    async def load() -> list[Repo]:
+        shared = get_shared_cache(settings)
+        if shared is not None:
+            acquired = await asyncio.to_thread(
+                shared.acquire, cache_key, settings.cache_refresh_timeout
+            )
+            if not acquired:
+                age = _get_cache_age(cache_key)
+                if age is not None and age <= settings.cache_hard_ttl:
+                    raise RefreshElsewhere(cache_key)
+                repos = await _wait_for_shared(cache_key, settings)
+                if repos is not None:
+                    return repos
+                logger.warning("Timed out waiting for shared cache, fetching")
+
+        try:
+            repos = await _fetch_repos(settings)
+            timestamp = time.time()
+            _set_cache_data(cache_key, repos, timestamp)
+            if shared is not None:
+                snapshot = [repo.to_dict() for repo in repos]
+                await asyncio.to_thread(shared.set, cache_key, snapshot, timestamp)
+        finally:
+            if shared is not None:
+                await asyncio.to_thread(shared.release, cache_key)
+        logger.info(f"Cached {len(repos)} repositories")
+        return repos
+
+    return await repo_fetches.do(cache_key, load)
+
+
+async def _refresh_cache(cache_key: str, settings: Settings) -> None:
+    """Refresh a cache entry in the background, keeping the stale copy on error."""
+    try:
+        repos = await asyncio.wait_for(
+            _load_repos(cache_key, settings), timeout=settings.cache_refresh_timeout
+        )
+        _refresh_retry_at.pop(cache_key, None)
+        logger.info(f"Refreshed {len(repos)} repositories in background")
+    except RefreshElsewhere:
+        # Back off as after a failure; the snapshot is adopted once published
+        _refresh_retry_at[cache_key] = time.time() + settings.cache_refresh_retry
+        logger.info(f"{cache_key} is being refreshed by another worker")
+    except Exception as e:
+        _refresh_retry_at[cache_key] = time.time() + settings.cache_refresh_retry
+        logger.warning(f"Background refresh of {cache_key} failed: {e}")
+    finally:
+        _refresh_tasks.pop(cache_key, None)
+
+
+def _schedule_refresh(cache_key: str, settings: Settings) -> asyncio.Task | None:
+    """Start a background refresh unless one is running or backing off."""
+    task = _refresh_tasks.get(cache_key)
+    if task is not None and not task.done():
+        return task
+    if time.time() < _refresh_retry_at.get(cache_key, 0.0):
+        return None
+
+    task = asyncio.create_task(_refresh_cache(cache_key, settings))
+    _refresh_tasks[cache_key] = task
+    return task
+
+
+async def warm_repo_cache(settings: Settings) -> list[Repo]:
+    """Fill the repository cache ahead of the first /app request.
+
+    A snapshot from another worker is adopted instead of fetching, as long
+    as it could be served.
+    """
+    cache_key = f"github_repos_{settings.github_username}"
+    await _adopt_shared(cache_key, settings)
+    age = _get_cache_age(cache_key)
+    if age is None or age > settings.cache_hard_ttl:
+        repos = await _load_repos(cache_key, settings)
+    else:
+        # A stale snapshot is served as is while it refreshes in the background
+        repos = _cache[cache_key]["data"]
+        if age > settings.cache_ttl:
+            _schedule_refresh(cache_key, settings)
+    json_ld.render("repos", repos)  # memoized for the page's structured data
+    return repos
 
 
 @apps.get("/app")
+@sitemap_entry(0.8, "weekly", sources=[RepoSnapshot(), TemplateFile("apps.html")])
 @limiter.limit("10/minute")
 async def apps_view(request: Request):
-    """Display GitHub repositories with in-memory caching."""
+    """Display GitHub repositories, serving stale data while refreshing."""
     settings = get_settings()
 
     cache_key = f"github_repos_{settings.github_username}"
-    cached_repos = _get_cached_data(cache_key, settings.cache_ttl)
+    age = _get_cache_age(cache_key)
+    if age is None or age > settings.cache_ttl:
+        # Another worker may already have refreshed the shared cache
+        await _adopt_shared(cache_key, settings)
+    cached_repos = _get_cached_data(cache_key, settings.cache_hard_ttl)
 
     if cached_repos is not None:
-        logger.info("Serving repositories from cache")
         repos = cached_repos
+        if (_get_cache_age(cache_key) or 0.0) > settings.cache_ttl:
+            logger.info("Serving stale repositories while refreshing")
+            CACHE_EVENTS.labels("stale").inc()
+            _schedule_refresh(cache_key, settings)
+        else:
+            logger.info("Serving repositories from cache")
+            CACHE_EVENTS.labels("hit").inc()
     else:
         logger.info("Fetching fresh repository data from GitHub")
+        CACHE_EVENTS.labels("miss").inc()
         try:
-            url = f"https://api.github.com/users/{settings.github_username}/repos?sort=pushed"
-            repo_data = await get_repo_data_for_user(
-                url=url, github_token=settings.github_token
-            )
-            repos = sort_repos(repo_data)
-
-            # Cache the data
-            _set_cache_data(cache_key, repos)
-            logger.info(f"Cached {len(repos)} repositories")
-
+            repos = await _load_repos(cache_key, settings)
         except Exception as e:
             logger.error(f"Failed to fetch GitHub data: {e}")
             raise HTTPException(
@@ -67,7 +247,25 @@ async def apps_view(request: Request):
                 detail="Unable to fetch repository data at this time",
             ) from e
 
-    return templates.TemplateResponse(
+    # The page only changes with the repository snapshot, the templates, the
+    # hashed asset URLs it links to and whether it is minified
+    timestamp = _cache[cache_key]["timestamp"]
+    etag = make_etag(
+        f"{cache_key}:{timestamp}:{page_cache.version}:"
+        f"{asset_manifest.version}:{minify_enabled()}"
+    )
+    last_modified = max(
+        timestamp, page_cache.last_modified, asset_manifest.last_modified
+    )
+    # Not "Age": that is for caches, which would subtract it from max-age
+    headers = {
+        **validator_headers(etag, last_modified),
+        "X-Cache-Age": str(int(time.time() - timestamp)),
+    }
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified, headers)
+
+    return StreamingTemplateResponse(
         request,
         "apps.html",
         {
@@ -80,5 +278,7 @@ async def apps_view(request: Request):
             "repos": repos,
             "active_page": "apps",
             "repo_count": len(repos),
+            "structured_data": json_ld.render("repos", repos),
         },
+        headers=headers,
     )
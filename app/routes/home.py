@@ -1,42 +1,57 @@
+import asyncio
 import logging
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-
-from fastapi import APIRouter, Form, Request
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from starlette.responses import RedirectResponse
-
+from datetime import UTC, datetime
+from typing import Any
+
+from fastapi import APIRouter, Form, Request, Response
+from fastapi.responses import JSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from app.cache import memoize_latest
+from app.conditional import (
+    is_not_modified,
+    not_modified_response,
+    validator_headers,
+)
 from app.config import get_settings
-from app.utils import get_structured_data, templates
-
-# Use the same limiter instance as main app
-limiter = Limiter(key_func=get_remote_address)
+from app.content import Timeline, timeline_data
+from app.limiter import limiter
+from app.metrics import render_metrics
+from app.outbox import get_mail_sender, get_outbox
+from app.rendering import StreamingTemplateResponse, cached_page
+from app.sitemap import sitemap_entry
+from app.structured_data import json_ld
+from app.warmup import readiness
 
 logger = logging.getLogger(__name__)
 home = APIRouter()
 
 
+INDEX_PAGE = {
+    "title": "Tony Benoy - Chief Technology Officer & Full-Stack Engineer",
+    "description": (
+        "Tony Benoy - CTO at Proffyhub, Full-Stack Engineer, and "
+        "Entrepreneur. Expert in Python, JavaScript, cloud architecture, "
+        "and team leadership. Based in Tallinn, Estonia."
+    ),
+    "active_page": "home",
+}
+
+
+@memoize_latest
+def index_context(timeline: Timeline) -> dict[str, Any]:
+    """Home page context, rebuilt only when the timeline is reloaded."""
+    return {**INDEX_PAGE, "structured_data": json_ld.render("person", timeline)}
+
+
 @home.get("/")
 @home.get("/index")
+@sitemap_entry(1.0, "monthly", path="/")
 @limiter.limit("30/minute")
+@cached_page("index.html", sources=[timeline_data])
 async def index(request: Request):
     """Home page with rate limiting and SEO optimization."""
-    return templates.TemplateResponse(
-        request,
-        "index.html",
-        {
-            "title": "Tony Benoy - Chief Technology Officer & Full-Stack Engineer",
-            "description": (
-                "Tony Benoy - CTO at Proffyhub, Full-Stack Engineer, and "
-                "Entrepreneur. Expert in Python, JavaScript, cloud architecture, "
-                "and team leadership. Based in Tallinn, Estonia."
-            ),
-            "active_page": "home",
-            "structured_data": get_structured_data(),
-        },
-    )
+    return index_context(timeline_data.get())
 
 
 @home.get("/test")
@@ -44,28 +59,6 @@ async def test():
     return {"result": "It works!"}
 
 
-@home.get("/favicon.ico")
-async def favicon():
-    return RedirectResponse(url="/static/img/favicon.ico")
-
-
-@home.get("/robots.txt")
-async def robots():
-    """Serve robots.txt for SEO."""
-    return RedirectResponse(url="/static/robots.txt")
-
-
-@home.get("/sitemap.xml")
-async def sitemap():
-    """Serve sitemap.xml for SEO."""
-    return RedirectResponse(url="/static/sitemap.xml")
-
-
-@home.get("/myssh")
-async def myssh():
-    return RedirectResponse(url="/static/files/tony.sh")
-
-
 @home.get("/client_ip")
 @limiter.limit("10/minute")
 async def get_my_ip(request: Request):
@@ -84,310 +77,130 @@ async def get_my_ip(request: Request):
 
 
 @home.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint for monitoring."""
     return {
         "status": "healthy",
-        "timestamp": "2025-01-01T00:00:00Z",  # Dynamic in real implementation
-        "version": "2.0.0",
+        "ready": readiness.ready,
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "version": request.app.version,
     }
 
 
+PROBE_HEADERS = {"Cache-Control": "no-store"}
+
+
+@home.get("/livez")
+async def livez():
+    """Liveness probe: the worker is running its event loop."""
+    return JSONResponse({"status": "alive"}, headers=PROBE_HEADERS)
+
+
+@home.get("/readyz")
+async def readyz():
+    """Readiness probe: 503 until startup warm-up has finished."""
+    if not readiness.ready:
+        return JSONResponse(
+            {"status": "starting"}, status_code=503, headers=PROBE_HEADERS
+        )
+    return JSONResponse(
+        {"status": "ready", "warmup_seconds": readiness.warmup_seconds},
+        headers=PROBE_HEADERS,
+    )
+
+
 @home.get("/metrics")
 @limiter.limit("5/minute")
 async def metrics(request: Request):
-    """Basic metrics endpoint."""
-    import time
+    """Prometheus metrics, aggregated across all workers."""
+    body = await asyncio.to_thread(render_metrics)
+    return Response(content=body, media_type=CONTENT_TYPE_LATEST)
 
-    try:
-        import psutil
-    except ImportError:
-        return {"status": "ok", "message": "Detailed metrics not available"}
 
-    return {
-        "uptime": time.time(),  # Would track actual uptime
-        "memory_usage": psutil.virtual_memory().percent,
-        "cpu_usage": psutil.cpu_percent(),
-        "disk_usage": psutil.disk_usage("/").percent,
-        "requests_total": "N/A",  # Would implement proper metrics
-        "status": "ok",
-    }
+CONTACT_CONTEXT = {
+    "title": "Contact Tony Benoy - Chief Technology Officer",
+    "description": (
+        "Get in touch with Tony Benoy, CTO and Full-Stack Engineer. "
+        "Available for consulting, speaking engagements, and technology "
+        "leadership opportunities."
+    ),
+    "active_page": "contact",
+}
 
 
 @home.get("/contact")
+@sitemap_entry(0.6, "yearly")
 @limiter.limit("30/minute")
+@cached_page("contact.html")
 async def contact_page(request: Request):
     """Contact page with form."""
-    return templates.TemplateResponse(
-        request,
-        "contact.html",
-        {
-            "title": "Contact Tony Benoy - Chief Technology Officer",
-            "description": (
-                "Get in touch with Tony Benoy, CTO and Full-Stack Engineer. "
-                "Available for consulting, speaking engagements, and technology "
-                "leadership opportunities."
-            ),
-            "active_page": "contact",
-        },
-    )
+    return CONTACT_CONTEXT
+
+
+TIMELINE_PAGE = {
+    "title": "Tony Benoy Timeline - CTO Career & Education Journey",
+    "description": (
+        "Explore Tony Benoy's professional timeline: from Computer "
+        "Science graduate to CTO at Proffyhub. Experience at Merkle "
+        "Science, Redcarpetup, and MBA from Estonian Business School."
+    ),
+    "active_page": "timeline",
+}
+
+
+@memoize_latest
+def timeline_context(timeline: Timeline) -> dict[str, Any]:
+    """Timeline page context, rebuilt only when the data file is reloaded."""
+    return {
+        **TIMELINE_PAGE,
+        "work_experience": timeline.work_experience,
+        "education": timeline.education,
+        "volunteer": timeline.volunteer,
+        "structured_data": json_ld.render("timeline", timeline),
+    }
 
 
 @home.get("/timeline")
+@sitemap_entry(0.8, "monthly")
 @limiter.limit("30/minute")
+@cached_page("timeline.html", sources=[timeline_data])
 async def timeline_page(request: Request):
     """Timeline page with work experience and education."""
-    # Work experience data from CV
-    work_experience = [
-        {
-            "title": "Chief Technology Officer",
-            "company": "Proffyhub OÜ",
-            "period": "Jul. 2024 – Present",
-            "location": "Tallinn, Estonia",
-            "company_url": "https://proffy.ee",
-            "logo": "/static/img/logos/proffyhub.png",
-            "description": (
-                "Leading technical strategy and product development for Proffy.ee, "
-                "Estonia's flexible work platform. Building scalable job marketplace "
-                "connecting employers with workers seeking part-time and gig "
-                "opportunities, while developing features for schedule flexibility "
-                "and skill development."
-            ),
-            "technologies": [
-                "TypeScript",
-                "NestJS",
-                "PostgreSQL",
-                "Next.js",
-                "React",
-                "Technical Leadership",
-                "Marketplace Platforms",
-                "Product Strategy",
-                "AWS Cloud",
-            ],
-            "type": "leadership",
-            "icon": "fas fa-crown",
-        },
-        {
-            "title": "Founder",
-            "company": "Sunyata OÜ",
-            "period": "Nov. 2022 – Present",
-            "location": "Tallinn, Estonia",
-            "company_url": "https://github.com/Sunyata-OU",
-            "logo": "/static/img/logos/sunyata.png",
-            "description": (
-                "Founded and operating an independent software development company "
-                "in Estonia. Focusing on cutting-edge technology solutions and "
-                "open-source contributions while building sustainable business "
-                "practices."
-            ),
-            "technologies": [
-                "Full-Stack Engineering",
-                "Cloud Architecture",
-                "DevOps & CI/CD",
-                "Open Source Contributions",
-                "Team Leadership",
-                "Business Strategy",
-            ],
-            "type": "entrepreneurship",
-            "icon": "fas fa-rocket",
-        },
-        {
-            "title": "Senior Software Engineer",
-            "company": "Merkle Science",
-            "period": "Aug. 2021 – Apr. 2022",
-            "location": "Bengaluru, India",
-            "company_url": "https://merklescience.com",
-            "logo": "/static/img/logos/merkle-science.png",
-            "description": (
-                "Developed blockchain analytics and cryptocurrency compliance "
-                "solutions for financial institutions and government agencies. "
-                "Built predictive risk monitoring systems and transaction analysis "
-                "tools for crypto crime detection."
-            ),
-            "technologies": [
-                "Python",
-                "Blockchain Analytics",
-                "Data Engineering",
-                "Kubernetes",
-                "Google Cloud Platform",
-                "Regulatory Compliance",
-                "Risk Management",
-                "Cryptocurrency Security",
-            ],
-            "type": "engineering",
-            "icon": "fas fa-shield-alt",
-        },
-        {
-            "title": "Member Technical Staff",
-            "company": "Redcarpetup",
-            "period": "May. 2019 – Apr. 2021",
-            "location": "Delhi, India",
-            "company_url": "https://www.ycombinator.com/companies/redcarpetup",
-            "logo": "/static/img/logos/redcarpetup.png",
-            "description": (
-                "Core engineering team member at Y Combinator-backed fintech "
-                "startup. Built scalable lending platform infrastructure, "
-                "implemented risk assessment algorithms, and developed "
-                "customer-facing financial products."
-            ),
-            "technologies": [
-                "Python",
-                "Django Framework",
-                "PostgreSQL",
-                "Redis",
-                "AWS Cloud",
-                "Machine Learning",
-                "Financial Technology",
-                "REST APIs",
-                "Microservices Architecture",
-            ],
-            "type": "engineering",
-            "icon": "fas fa-chart-line",
-        },
-        {
-            "title": "Co-Founder & Chief Technology Officer",
-            "company": "Techneith",
-            "period": "Oct. 2017 – Apr. 2019",
-            "location": "Delhi, India",
-            "company_url": "https://techneith.com/",
-            "logo": "/static/img/logos/techneith.png",
-            "description": (
-                "Co-founded technology consulting company, leading technical vision "
-                "and team building. Delivered end-to-end software solutions for "
-                "startups and enterprises while establishing engineering best "
-                "practices and company culture."
-            ),
-            "technologies": [
-                "Full-Stack Engineering",
-                "Team Leadership",
-                "Strategic Planning",
-                "Client Relations",
-                "System Architecture",
-                "Startup Operations",
-            ],
-            "type": "leadership",
-            "icon": "fas fa-users",
-        },
-    ]
-
-    # Education data from CV
-    education = [
-        {
-            "degree": "Master of Business Administration (Management)",
-            "institution": "Estonian Business School",
-            "period": "June 2024",
-            "location": "Tallinn, Estonia",
-            "gpa": "GPA 4.44/5",
-            "institution_url": "https://ebs.ee",
-            "logo": "/static/img/logos/ebs.png",
-            "description": (
-                "Completed comprehensive MBA program focusing on strategic "
-                "management, digital transformation, and entrepreneurship. "
-                "Achieved distinction with 4.44/5 GPA while building "
-                "international business network."
-            ),
-            "focus": [
-                "Strategic Management",
-                "Digital Transformation",
-                "Entrepreneurship",
-                "International Business",
-            ],
-            "type": "masters",
-            "icon": "fas fa-graduation-cap",
-        },
-        {
-            "degree": "Erasmus Exchange (Business Analytics and Financial Modeling)",
-            "institution": "Norwegian School of Economics",
-            "period": "December 2023",
-            "location": "Bergen, Norway",
-            "gpa": None,
-            "institution_url": "https://nhh.no",
-            "logo": "/static/img/logos/nhh.png",
-            "description": (
-                "Intensive exchange program at Norway's leading business school, "
-                "specializing in advanced business analytics and quantitative "
-                "financial modeling techniques for strategic decision making."
-            ),
-            "focus": [
-                "Business Analytics",
-                "Financial Modeling",
-                "Data Science",
-                "Quantitative Analysis",
-            ],
-            "type": "exchange",
-            "icon": "fas fa-chart-bar",
-        },
-        {
-            "degree": "Bachelor of Technology (Computer Science and Engineering)",
-            "institution": "Deenbandhu Chottu Ram University of Science and Technology",
-            "period": "September 2017",
-            "location": "Haryana, India",
-            "gpa": None,
-            "institution_url": "https://dcrustm.ac.in",
-            "logo": "/static/img/logos/dcrust.png",
-            "description": (
-                "Comprehensive engineering program covering software development, "
-                "algorithms, data structures, and system design. Built strong "
-                "foundation in computer science principles and practical "
-                "programming skills."
-            ),
-            "focus": [
-                "Software Engineering",
-                "Data Structures",
-                "Algorithms",
-                "System Design",
-                "Programming",
-            ],
-            "type": "bachelors",
-            "icon": "fas fa-code",
-        },
-    ]
-
-    volunteer = [
-        {
-            "role": "AUR Package Maintainer",
-            "org": "Arch Linux",
-            "period": "2017 – 2024 (7 years)",
-            "icon": "fab fa-linux",
-            "color": "vol-blue",
-        },
-    ]
-
-    return templates.TemplateResponse(
-        request,
-        "timeline.html",
-        {
-            "title": "Tony Benoy Timeline - CTO Career & Education Journey",
-            "description": (
-                "Explore Tony Benoy's professional timeline: from Computer "
-                "Science graduate to CTO at Proffyhub. Experience at Merkle "
-                "Science, Redcarpetup, and MBA from Estonian Business School."
-            ),
-            "active_page": "timeline",
-            "work_experience": work_experience,
-            "education": education,
-            "volunteer": volunteer,
-        },
+    return timeline_context(timeline_data.get())
+
+
+@home.get("/timeline.json")
+@limiter.limit("30/minute")
+async def timeline_json(request: Request):
+    """Timeline data for the terminal and other clients."""
+    timeline = timeline_data.get()
+    if is_not_modified(request, timeline.json_etag, timeline_data.mtime):
+        return not_modified_response(timeline.json_etag, timeline_data.mtime)
+    return Response(
+        content=timeline.json_body,
+        media_type="application/json",
+        headers=validator_headers(timeline.json_etag, timeline_data.mtime),
     )
 
 
+TERMINAL_CONTEXT = {
+    "title": "Interactive Terminal - Tony Benoy",
+    "description": (
+        "Explore Tony Benoy's interactive web terminal. Execute commands, "
+        "learn about his experience, and discover hidden easter eggs in "
+        "this unique developer interface."
+    ),
+    "active_page": "terminal",
+}
+
+
 @home.get("/terminal")
+@sitemap_entry(0.5, "yearly")
 @limiter.limit("30/minute")
+@cached_page("terminal.html")
 async def terminal_page(request: Request):
     """Full-page terminal interface."""
-    return templates.TemplateResponse(
-        request,
-        "terminal.html",
-        {
-            "title": "Interactive Terminal - Tony Benoy",
-            "description": (
-                "Explore Tony Benoy's interactive web terminal. Execute commands, "
-                "learn about his experience, and discover hidden easter eggs in "
-                "this unique developer interface."
-            ),
-            "active_page": "terminal",
-        },
-    )
+    return TERMINAL_CONTEXT
 
 
 @home.post("/contact")
@@ -399,24 +212,14 @@ async def contact_submit(
     subject: str = Form(..., min_length=5, max_length=200),
     message: str = Form(..., min_length=10, max_length=2000),
 ):
-    """Handle contact form submission."""
+    """Handle contact form submission.
+
+    The message is queued in the outbox and delivered by the background
+    mail sender, so the response never waits on the SMTP server.
+    """
     settings = get_settings()
 
     try:
-        # Create email message
-        msg = MIMEMultipart()
-        msg["From"] = (
-            settings.smtp_username
-            if hasattr(settings, "smtp_username") and settings.smtp_username
-            else "noreply@tonybenoy.com"
-        )
-        msg["To"] = (
-            settings.contact_email
-            if hasattr(settings, "contact_email")
-            else "me@tonybenoy.com"
-        )
-        msg["Subject"] = f"Contact Form: {subject}"
-
         # Email body
         body = f"""
 New contact form submission:
@@ -433,41 +236,26 @@ Client IP: {request.client.host if request.client else "unknown"}
 User Agent: {request.headers.get("User-Agent", "unknown")}
         """
 
-        msg.attach(MIMEText(body, "plain"))
-
-        # Send email (only if SMTP is configured)
-        if hasattr(settings, "smtp_server") and settings.smtp_server:
-            try:
-                smtp_port = (
-                    settings.smtp_port if hasattr(settings, "smtp_port") else 587
-                )
-                server = smtplib.SMTP(settings.smtp_server, smtp_port)
-                server.starttls()
-                if (
-                    hasattr(settings, "smtp_username")
-                    and hasattr(settings, "smtp_password")
-                    and settings.smtp_username
-                    and settings.smtp_password
-                ):
-                    server.login(settings.smtp_username, settings.smtp_password)
-
-                server.send_message(msg)
-                server.quit()
-
-                logger.info(f"Contact form email sent from {email}")
-                success_message = "Thank you! Your message has been sent successfully."
-            except Exception as e:
-                logger.error(f"Failed to send email: {e}")
-                success_message = (
-                    "Thank you! Your message has been received "
-                    "(email delivery pending)."
-                )
+        # Queue email (only if SMTP is configured)
+        if settings.smtp_server:
+            message_id = await asyncio.to_thread(
+                get_outbox(settings).add,
+                settings.smtp_username or "noreply@tonybenoy.com",
+                settings.contact_email,
+                f"Contact Form: {subject}",
+                body,
+                email,
+            )
+            if sender := get_mail_sender():
+                sender.wake()
+            logger.info(f"Contact message {message_id} from {email} queued")
+            success_message = "Thank you! Your message has been sent successfully."
         else:
             # Log the message if no SMTP configured
             logger.info(f"Contact form submission: {name} <{email}> - {subject}")
             success_message = "Thank you! Your message has been received."
 
-        return templates.TemplateResponse(
+        return StreamingTemplateResponse(
             request,
             "contact.html",
             {
@@ -479,7 +267,7 @@ User Agent: {request.headers.get("User-Agent", "unknown")}
 
     except Exception as e:
         logger.error(f"Contact form error: {e}")
-        return templates.TemplateResponse(
+        return StreamingTemplateResponse(
             request,
             "contact.html",
             {
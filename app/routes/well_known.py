@@ -0,0 +1,131 @@
+"""Small files crawlers and tools fetch from fixed paths.
+
+``/llms.txt``, ``/robots.txt``, ``/favicon.ico`` and ``/myssh`` are served
+straight from memory at their canonical paths instead of redirecting into
+``/static``. Each file is read once, with its ETag computed, and read again
+only when its modification time changes. ``/sitemap.xml`` is generated from
+the routes by :mod:`app.sitemap`.
+"""
+
+import logging
+import time
+from pathlib import Path
+
+from fastapi import APIRouter, Request, Response
+
+from app.assets import static_dir
+from app.conditional import (
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    validator_headers,
+)
+from app.content import DATA_CHECK_INTERVAL
+from app.rendering import RenderedPage
+from app.sitemap import sitemap
+
+logger = logging.getLogger(__name__)
+well_known = APIRouter()
+
+root_dir = Path(__file__).parent.parent.parent
+
+
+class WellKnownFile:
+    """A file held in memory and reloaded when it changes on disk.
+
+    The file is checked at most once per ``check_interval``. If it is
+    missing, ``fallback`` is served when given; otherwise the request gets
+    a 404.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        media_type: str,
+        cache_control: str = "public, max-age=3600",
+        fallback: bytes | None = None,
+        check_interval: float = DATA_CHECK_INTERVAL,
+    ) -> None:
+        self.path = path
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.fallback = fallback
+        self.check_interval = check_interval
+        self._file: RenderedPage | None = None
+        self._mtime: int | None = None
+        self._checked_at = float("-inf")
+
+    def get(self) -> RenderedPage | None:
+        """Return the file contents and validators, reloading if changed."""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._file
+        self._checked_at = now
+
+        try:
+            mtime = self.path.stat().st_mtime_ns
+            if mtime != self._mtime:
+                body = self.path.read_bytes()
+                self._file = RenderedPage(body, make_etag(body), mtime / 1e9)
+                self._mtime = mtime
+                logger.info(f"Loaded {self.path.name}")
+        except FileNotFoundError:
+            if self.fallback is None:
+                self._file = None
+            elif self._mtime is not None or self._file is None:
+                self._file = RenderedPage(
+                    self.fallback, make_etag(self.fallback), time.time()
+                )
+            self._mtime = None
+        except OSError as e:
+            logger.error(f"Keeping previous {self.path.name}, reload failed: {e}")
+        return self._file
+
+    def response(self, request: Request) -> Response:
+        """Serve the file, or a 304 if the client's copy is current."""
+        file = self.get()
+        if file is None:
+            return Response(status_code=404)
+        headers = {"Cache-Control": self.cache_control}
+        if is_not_modified(request, file.etag, file.last_modified):
+            return not_modified_response(file.etag, file.last_modified, headers)
+        return Response(
+            content=file.body,
+            media_type=self.media_type,
+            headers={**validator_headers(file.etag, file.last_modified), **headers},
+        )
+
+
+well_known_files = {
+    "/llms.txt": WellKnownFile(
+        root_dir / "llms.txt",
+        "text/plain",
+        fallback=b"# Tony Benoy\n\nPersonal website of Tony Benoy, Software Engineer",
+    ),
+    "/robots.txt": WellKnownFile(static_dir / "robots.txt", "text/plain"),
+    "/favicon.ico": WellKnownFile(
+        static_dir / "img" / "favicon.ico",
+        "image/x-icon",
+        cache_control="public, max-age=86400",
+    ),
+    "/myssh": WellKnownFile(static_dir / "files" / "tony.sh", "text/plain"),
+}
+
+
+def _serve(path: str):
+    async def endpoint(request: Request) -> Response:
+        return well_known_files[path].response(request)
+
+    return endpoint
+
+
+for path in well_known_files:
+    well_known.add_api_route(
+        path, _serve(path), methods=["GET"], response_class=Response
+    )
+
+
+@well_known.get("/sitemap.xml", response_class=Response)
+async def sitemap_xml(request: Request):
+    """Sitemap of the pages listed with ``sitemap_entry``."""
+    return sitemap.response(request)
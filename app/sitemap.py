@@ -0,0 +1,181 @@
+"""``sitemap.xml`` generated from the application's routes.
+
+GET routes opt in with the :func:`sitemap_entry` decorator, which records
+their priority, change frequency and the sources their content comes from.
+Each URL's ``lastmod`` is the latest modification time of those sources:
+the page's template (and ``base.html``) for :func:`~app.rendering.cached_page`
+routes, its data files, and anything else passed in ``sources``, such as the
+repository cache. The document is built once, served with an ETag, and
+rebuilt only when a ``lastmod`` date or the set of routes changes.
+"""
+
+import html
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any, Literal
+
+from fastapi import Request, Response
+
+from app.conditional import (
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    validator_headers,
+)
+from app.content import DATA_CHECK_INTERVAL
+from app.rendering import RenderedPage, api_routes
+from app.structured_data import SITE_URL
+from app.utils import templates_dir
+
+ChangeFreq = Literal[
+    "always", "hourly", "daily", "weekly", "monthly", "yearly", "never"
+]
+
+
+@dataclass(frozen=True, slots=True)
+class SitemapEntry:
+    """Sitemap metadata of a route."""
+
+    priority: float
+    changefreq: ChangeFreq
+    sources: tuple[Any, ...] = ()
+    path: str | None = None  # canonical path when a route has several
+
+
+class TemplateFile:
+    """A template as a sitemap source, modified when its file is."""
+
+    def __init__(self, name: str) -> None:
+        self.path = templates_dir / name
+
+    @property
+    def mtime(self) -> float | None:
+        try:
+            return self.path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+
+BASE_TEMPLATE = TemplateFile("base.html")
+
+
+def sitemap_entry(
+    priority: float,
+    changefreq: ChangeFreq,
+    sources: Iterable[Any] = (),
+    path: str | None = None,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """List a route in the sitemap.
+
+    ``sources`` are objects with an ``mtime`` (seconds, or None if unknown)
+    that the page is built from, beyond its template and page sources.
+    Apply it directly below the router decorator.
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        func.sitemap = SitemapEntry(  # type: ignore[attr-defined]
+            priority, changefreq, tuple(sources), path
+        )
+        return func
+
+    return decorator
+
+
+def _sources(endpoint: Callable[..., Any], entry: SitemapEntry) -> list[Any]:
+    sources = [*entry.sources, *getattr(endpoint, "page_sources", ())]
+    template_name = getattr(endpoint, "cached_template", None)
+    if template_name is not None:
+        sources += [TemplateFile(template_name), BASE_TEMPLATE]
+    return sources
+
+
+def _lastmod(sources: Iterable[Any]) -> str | None:
+    mtimes = [mtime for source in sources if (mtime := source.mtime) is not None]
+    if not mtimes:
+        return None
+    return datetime.fromtimestamp(max(mtimes), UTC).strftime("%Y-%m-%d")
+
+
+def sitemap_urls(routes: Iterable[Any]) -> list[tuple[str, SitemapEntry, str | None]]:
+    """Path, metadata and lastmod date of every route listed in the sitemap."""
+    urls = []
+    seen = set()
+    for route in api_routes(routes):
+        if not route.methods or "GET" not in route.methods:
+            continue
+        entry = getattr(route.endpoint, "sitemap", None)
+        if entry is None or (entry.path or route.path) != route.path:
+            continue
+        if route.path in seen:
+            continue
+        seen.add(route.path)
+        urls.append((route.path, entry, _lastmod(_sources(route.endpoint, entry))))
+    return urls
+
+
+def render_sitemap(urls: Iterable[tuple[str, SitemapEntry, str | None]]) -> bytes:
+    """Serialize sitemap URLs as a sitemaps.org XML document."""
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+    ]
+    for path, entry, lastmod in urls:
+        lines.append("  <url>")
+        lines.append(f"    <loc>{html.escape(SITE_URL + path)}</loc>")
+        if lastmod is not None:
+            lines.append(f"    <lastmod>{lastmod}</lastmod>")
+        lines.append(f"    <changefreq>{entry.changefreq}</changefreq>")
+        lines.append(f"    <priority>{entry.priority:.1f}</priority>")
+        lines.append("  </url>")
+    lines.append("</urlset>")
+    return ("\n".join(lines) + "\n").encode()
+
+
+class Sitemap:
+    """The rendered sitemap, rebuilt when any URL's metadata changes.
+
+    Source modification times are checked at most once per
+    ``check_interval``.
+    """
+
+    def __init__(self, check_interval: float = DATA_CHECK_INTERVAL) -> None:
+        self.check_interval = check_interval
+        self._urls: list[tuple[str, SitemapEntry, str | None]] | None = None
+        self._document: RenderedPage | None = None
+        self._checked_at = float("-inf")
+        self.builds = 0
+
+    def get(self, routes: Iterable[Any]) -> RenderedPage:
+        """Return the sitemap document for ``routes``, rebuilding if needed."""
+        now = time.monotonic()
+        if self._document is not None and now - self._checked_at < self.check_interval:
+            return self._document
+        self._checked_at = now
+
+        urls = sitemap_urls(routes)
+        if self._document is None or urls != self._urls:
+            body = render_sitemap(urls)
+            self._document = RenderedPage(body, make_etag(body), time.time())
+            self._urls = urls
+            self.builds += 1
+        return self._document
+
+    def response(self, request: Request) -> Response:
+        """Serve the sitemap of the request's app, or a 304 if unchanged."""
+        document = self.get(request.app.routes)
+        headers = {"Cache-Control": "public, max-age=3600"}
+        if is_not_modified(request, document.etag, document.last_modified):
+            return not_modified_response(document.etag, document.last_modified, headers)
+        return Response(
+            content=document.body,
+            media_type="application/xml",
+            headers={
+                **validator_headers(document.etag, document.last_modified),
+                **headers,
+            },
+        )
+
+
+sitemap = Sitemap()
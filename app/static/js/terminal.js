@@ -8,6 +8,7 @@ class WebTerminal {
         this.isHidden = true; // Terminal starts completely hidden
         this.autoHidden = false;
         this.hideTimeout = null;
+        this.timeline = null;
         this.commands = {
             help: () => this.showHelp(),
             ls: () => this.listPages(),
@@ -443,18 +444,49 @@ Current focus: Web development, DevOps, and system architecture.`;
         this.addOutput(skills, 'info');
     }
 
+    loadTimeline() {
+        if (!this.timeline) {
+            this.timeline = fetch('/timeline.json')
+                .then(response => {
+                    if (!response.ok) throw new Error(response.statusText);
+                    return response.json();
+                })
+                .catch(error => {
+                    this.timeline = null;
+                    throw error;
+                });
+        }
+        return this.timeline;
+    }
+
     showExperience() {
-        const experience = `Professional Experience:
+        this.loadTimeline()
+            .then(timeline => {
+                const jobs = timeline.work_experience
+                    .map(job => `• ${job.title} @ ${job.company} (${job.period})`)
+                    .join('\n');
+                this.addOutput(`Professional Experience:\n${jobs}\n\nUse 'cd timeline' for details.`, 'info');
+            })
+            .catch(() => {
+                this.addOutput(`Professional Experience:
 Check out the /timeline page for detailed work history and achievements.
-Use 'cd timeline' to navigate there.`;
-        this.addOutput(experience, 'info');
+Use 'cd timeline' to navigate there.`, 'info');
+            });
     }
 
     showEducation() {
-        const education = `Education:
+        this.loadTimeline()
+            .then(timeline => {
+                const degrees = timeline.education
+                    .map(edu => `• ${edu.degree}\n  ${edu.institution} (${edu.period})`)
+                    .join('\n');
+                this.addOutput(`Education:\n${degrees}\n\nUse 'cd timeline' for details.`, 'info');
+            })
+            .catch(() => {
+                this.addOutput(`Education:
 Visit the /timeline page for educational background and certifications.
-Use 'cd timeline' to see more details.`;
-        this.addOutput(education, 'info');
+Use 'cd timeline' to see more details.`, 'info');
+            });
     }
 
     showProjects() {
@@ -0,0 +1,159 @@
+"""JSON-LD structured data for search engines, one document per page.
+
+Each document is built from its source data (loaded content or the cached
+repository list) and serialized once; it is rebuilt only when a different
+source object is passed, so pages embed an already serialized string.
+"""
+
+import json
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from app.cache import memoize_latest
+from app.content import Timeline
+from app.utils import Repo
+
+SITE_URL = "https://tonybenoy.com"
+
+PERSON = {
+    "@type": "Person",
+    "name": "Tony Benoy",
+    "jobTitle": "Chief Technology Officer",
+    "description": (
+        "CTO at Proffyhub, Full-Stack Engineer, and Entrepreneur "
+        "based in Tallinn, Estonia"
+    ),
+    "url": SITE_URL,
+    "image": f"{SITE_URL}/static/img/me.jpg",
+    "email": "me@tonybenoy.com",
+    "address": {
+        "@type": "PostalAddress",
+        "addressLocality": "Tallinn",
+        "addressCountry": "Estonia",
+    },
+    "sameAs": [
+        "https://www.linkedin.com/in/tonybenoy/",
+        "https://twitter.com/TonyBenoy",
+        "https://github.com/tonybenoy",
+        "https://instagram.com/tonybenoy",
+    ],
+    "knowsAbout": [
+        "Software Engineering",
+        "Python",
+        "JavaScript",
+        "TypeScript",
+        "Cloud Architecture",
+        "Team Leadership",
+        "Full-Stack Development",
+        "Entrepreneurship",
+        "Business Strategy",
+    ],
+}
+
+
+def serialize(document: dict[str, Any]) -> str:
+    """Serialize a document for embedding in a ``<script>`` element.
+
+    ``<`` is escaped so that text from GitHub or data files can never close
+    the script element early.
+    """
+    encoded = json.dumps(document, separators=(",", ":"))
+    return encoded.replace("<", "\\u003c")
+
+
+class JsonLdRegistry:
+    """Named JSON-LD documents, each cached for its latest source object."""
+
+    def __init__(self) -> None:
+        self._documents: dict[str, Callable[[Any], str]] = {}
+
+    def document(
+        self, name: str
+    ) -> Callable[[Callable[[Any], dict[str, Any]]], Callable[[Any], dict[str, Any]]]:
+        """Register a builder that turns source data into a document."""
+
+        def decorator(
+            build: Callable[[Any], dict[str, Any]],
+        ) -> Callable[[Any], dict[str, Any]]:
+            self._documents[name] = memoize_latest(
+                lambda source: serialize(
+                    {"@context": "https://schema.org", **build(source)}
+                )
+            )
+            return build
+
+        return decorator
+
+    def render(self, name: str, source: Any) -> str:
+        """Return the serialized document for ``source``."""
+        return self._documents[name](source)
+
+
+json_ld = JsonLdRegistry()
+
+
+@json_ld.document("person")
+def person(timeline: Timeline) -> dict[str, Any]:
+    """Person for the home page, with schools and employer from the timeline."""
+    document: dict[str, Any] = {
+        **PERSON,
+        "alumniOf": [
+            {
+                "@type": "EducationalOrganization",
+                "name": edu.institution,
+                "description": edu.degree,
+            }
+            for edu in timeline.education
+        ],
+    }
+    if timeline.work_experience:
+        job = timeline.work_experience[0]
+        document["worksFor"] = {
+            "@type": "Organization",
+            "name": job.company,
+            "url": job.company_url,
+        }
+    return document
+
+
+@json_ld.document("timeline")
+def profile_page(timeline: Timeline) -> dict[str, Any]:
+    """ProfilePage for the timeline, listing the positions held."""
+    return {
+        "@type": "ProfilePage",
+        "url": f"{SITE_URL}/timeline",
+        "mainEntity": {
+            **person(timeline),
+            "hasOccupation": [
+                {
+                    "@type": "Occupation",
+                    "name": job.title,
+                    "occupationLocation": {"@type": "City", "name": job.location},
+                }
+                for job in timeline.work_experience
+            ],
+        },
+    }
+
+
+@json_ld.document("repos")
+def repo_list(repos: Sequence[Repo]) -> dict[str, Any]:
+    """ItemList of the repositories shown on the projects page."""
+    return {
+        "@type": "ItemList",
+        "url": f"{SITE_URL}/app",
+        "itemListElement": [
+            {
+                "@type": "ListItem",
+                "position": position,
+                "item": {
+                    "@type": "SoftwareSourceCode",
+                    "name": repo.name,
+                    "url": repo.html_url,
+                    "description": repo.description,
+                    "programmingLanguage": repo.language,
+                },
+            }
+            for position, repo in enumerate(repos, start=1)
+        ],
+    }
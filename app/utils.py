@@ -1,16 +1,36 @@
+import asyncio
+import heapq
 import logging
 import pathlib
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
 from datetime import datetime
+from operator import attrgetter
 from re import compile
-from urllib.parse import parse_qsl, urlsplit
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import httpx
 from fastapi.templating import Jinja2Templates
 
+from app.assets import asset_manifest
+from app.cache import TemplateBytecodeCache
+from app.config import get_settings
+from app.github import (
+    ValidatorStore,
+    create_github_client,
+    get_github_client,
+    get_validator_store,
+)
+from app.metrics import GITHUB_REQUEST_DURATION
+
 # Use consistent path relative to this module
 templates_dir = pathlib.Path(__file__).parent / "templates"
 templates = Jinja2Templates(directory=str(templates_dir))
+templates.env.bytecode_cache = TemplateBytecodeCache()
 templates.env.globals["current_year"] = datetime.now().year
+templates.env.globals["static_url"] = asset_manifest.url
 
 
 # Configure logging
@@ -18,7 +38,6 @@ logger = logging.getLogger(__name__)
 
 # Configuration
 GITHUB_API_BASE = "https://api.github.com"
-DEFAULT_TIMEOUT = 30.0
 
 
 rlink = compile(r'<(.*?)>(.*?)rel="([A-z\s]*)"(.*?)(?:$|(?:,))')
@@ -45,75 +64,162 @@ def parse(link_header: str) -> dict[str, dict[str, str]]:
     return links
 
 
+def _page_url(url: str, page: int) -> str:
+    """Return ``url`` with its ``page`` query parameter set to ``page``."""
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query["page"] = str(page)
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+@dataclass(slots=True, frozen=True)
+class Repo:
+    """A repository with only the fields shown on the projects page."""
+
+    name: str
+    html_url: str
+    description: str
+    language: str
+    stargazers_count: int
+    forks: int
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Repo":
+        """Build a record from GitHub API JSON or a stored snapshot."""
+        return cls(
+            name=data.get("name") or "Unknown",
+            html_url=data.get("html_url") or "",
+            description=data.get("description") or "",
+            language=data.get("language") or "Not specified",
+            stargazers_count=data.get("stargazers_count") or 0,
+            forks=data.get("forks") or 0,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable copy of the record."""
+        return asdict(self)
+
+
+def _parse_repos(repos: list) -> list[Repo]:
+    """Build records for the non-fork repositories in a page."""
+    return [Repo.from_dict(repo) for repo in repos if not repo.get("fork", True)]
+
+
+async def _fetch_repo_page(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: dict[str, str],
+    validators: ValidatorStore | None = None,
+) -> tuple[list[Repo], dict[str, dict[str, str]]]:
+    """Fetch one page of repositories and its parsed ``Link`` header.
+
+    With a validator store, the request is conditional and a ``304 Not
+    Modified`` answer reuses the page parsed on a previous fetch.
+    """
+    cached = None
+    if validators is not None:
+        cached = validators.get(url)
+        headers = {**headers, **validators.request_headers(url)}
+
+    start = time.perf_counter()
+    resp = await client.get(url, headers=headers)
+    GITHUB_REQUEST_DURATION.labels(str(resp.status_code)).observe(
+        time.perf_counter() - start
+    )
+    not_modified = resp.status_code == httpx.codes.NOT_MODIFIED
+    if not_modified and validators is not None and cached is not None:
+        validators.not_modified += 1
+        link = cached["link"]
+        repos = [Repo.from_dict(repo) for repo in cached["data"]]
+        return repos, parse(link) if link else {}
+    resp.raise_for_status()
+
+    repos = resp.json()
+    if not isinstance(repos, list):
+        logger.error(f"Unexpected response format from GitHub API: {type(repos)}")
+        return [], {}
+
+    link = resp.headers.get("link", "")
+    links = parse(link) if link else {}
+    parsed = _parse_repos(repos)
+    if validators is not None:
+        validators.put(url, resp, [repo.to_dict() for repo in parsed])
+    return parsed, links
+
+
 async def get_repo_data_for_user(
     url: str = "https://api.github.com/users/tonybenoy/repos",
-    response: list | None = None,
     github_token: str | None = None,
-) -> list[dict[str, str]]:
+    client: httpx.AsyncClient | None = None,
+    concurrency: int | None = None,
+    validators: ValidatorStore | None = None,
+) -> list[Repo]:
     """
     Fetch GitHub repository data for a user with proper error handling.
 
+    The first page is fetched on its own. If its ``Link`` header names the
+    ``last`` page, the remaining pages are fetched concurrently; otherwise
+    ``next`` links are followed one at a time. Pages are requested
+    conditionally, so unchanged pages are served from the validator store.
+
     Args:
         url: GitHub API URL to fetch repos from
-        response: Existing response list (for pagination)
         github_token: Optional GitHub token for higher rate limits
+        client: HTTP client to use, defaults to the shared GitHub client
+        concurrency: Maximum pages in flight, defaults to the settings value
+        validators: Validator store, defaults to the shared on-disk store
 
     Returns:
-        List of repository data dictionaries
+        List of non-fork repository records, in page order
 
     Raises:
         httpx.HTTPError: For HTTP-related errors
         ValueError: For invalid response data
     """
-    if response is None:
-        response = []
+    settings = get_settings()
+    if client is None:
+        client = get_github_client()
+    if client is None:
+        # Outside the application lifespan, e.g. in scripts
+        async with create_github_client(settings) as own_client:
+            return await get_repo_data_for_user(
+                url=url,
+                github_token=github_token,
+                client=own_client,
+                concurrency=concurrency,
+                validators=validators,
+            )
+    if validators is None:
+        validators = get_validator_store(settings)
 
     headers = {}
     if github_token:
         headers["Authorization"] = f"token {github_token}"
 
-    timeout = httpx.Timeout(DEFAULT_TIMEOUT)
+    semaphore = asyncio.Semaphore(concurrency or settings.github_fetch_concurrency)
+
+    async def fetch_page(page_url: str) -> list[Repo]:
+        async with semaphore:
+            repos, _ = await _fetch_repo_page(client, page_url, headers, validators)
+        return repos
 
     try:
-        async with httpx.AsyncClient(timeout=timeout, headers=headers) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-
-            repos = resp.json()
-            if not isinstance(repos, list):
-                logger.error(
-                    f"Unexpected response format from GitHub API: {type(repos)}"
-                )
-                return response
-
-            link = resp.headers.get("link", "")
-            links = parse(link) if link else {}
-
-            for repo in repos:
-                if not repo.get("fork", True):  # Skip forks
-                    try:
-                        response.append(
-                            {
-                                "clone_url": repo.get("clone_url", ""),
-                                "forks": repo.get("forks", 0),
-                                "name": repo.get("name", "Unknown"),
-                                "language": repo.get("language") or "Not specified",
-                                "stargazers_count": repo.get("stargazers_count", 0),
-                                "html_url": repo.get("html_url", ""),
-                                "description": repo.get("description", ""),
-                                "updated_at": repo.get("updated_at", ""),
-                            }
-                        )
-                    except KeyError as e:
-                        logger.warning(f"Missing expected field in repo data: {e}")
-                        continue
-
-            if "next" in links:
-                response = await get_repo_data_for_user(
-                    url=links["next"]["url"],
-                    response=response,
-                    github_token=github_token,
+        repos, links = await _fetch_repo_page(client, url, headers, validators)
+        pages = [repos]
+
+        last_page = links.get("last", {}).get("page", "")
+        if "next" in links and last_page.isdigit():
+            page_urls = [
+                _page_url(links["last"]["url"], page)
+                for page in range(2, int(last_page) + 1)
+            ]
+            pages.extend(await asyncio.gather(*map(fetch_page, page_urls)))
+        else:
+            while "next" in links:
+                repos, links = await _fetch_repo_page(
+                    client, links["next"]["url"], headers, validators
                 )
+                pages.append(repos)
 
     except httpx.TimeoutException:
         logger.error(f"Timeout while fetching data from {url}")
@@ -124,78 +230,16 @@ async def get_repo_data_for_user(
     except Exception as e:
         logger.error(f"Unexpected error while fetching repo data: {e}")
         raise
+    finally:
+        if validators is not None:
+            await asyncio.to_thread(validators.save)
+
+    return [repo for page in pages for repo in page]
+
 
-    return response
-
-
-def sort_repos(repos: list[dict[str, str]], count: int = 6) -> list[dict[str, str]]:
-    return sorted(repos, key=lambda x: x["stargazers_count"], reverse=True)[:count]
-
-
-def get_structured_data() -> str:
-    """Generate JSON-LD structured data for the website."""
-    import json
-
-    person_data = {
-        "@context": "https://schema.org",
-        "@type": "Person",
-        "name": "Tony Benoy",
-        "jobTitle": "Chief Technology Officer",
-        "description": (
-            "CTO at Proffyhub, Full-Stack Engineer, and Entrepreneur "
-            "based in Tallinn, Estonia"
-        ),
-        "url": "https://tonybenoy.com",
-        "image": "https://tonybenoy.com/static/img/me.jpg",
-        "email": "me@tonybenoy.com",
-        "address": {
-            "@type": "PostalAddress",
-            "addressLocality": "Tallinn",
-            "addressCountry": "Estonia",
-        },
-        "alumniOf": [
-            {
-                "@type": "EducationalOrganization",
-                "name": "Estonian Business School",
-                "description": "Master of Business Administration (Management)",
-            },
-            {
-                "@type": "EducationalOrganization",
-                "name": "Norwegian School of Economics",
-                "description": (
-                    "Erasmus Exchange (Business Analytics and Financial Modeling)"
-                ),
-            },
-            {
-                "@type": "EducationalOrganization",
-                "name": "Deenbandhu Chottu Ram University of Science and Technology",
-                "description": (
-                    "Bachelor of Technology (Computer Science and Engineering)"
-                ),
-            },
-        ],
-        "worksFor": {
-            "@type": "Organization",
-            "name": "Proffyhub OÜ",
-            "url": "https://proffy.ee",
-        },
-        "sameAs": [
-            "https://www.linkedin.com/in/tonybenoy/",
-            "https://twitter.com/TonyBenoy",
-            "https://github.com/tonybenoy",
-            "https://instagram.com/tonybenoy",
-        ],
-        "knowsAbout": [
-            "Software Engineering",
-            "Python",
-            "JavaScript",
-            "TypeScript",
-            "Cloud Architecture",
-            "Team Leadership",
-            "Full-Stack Development",
-            "Entrepreneurship",
-            "Business Strategy",
-        ],
-    }
-
-    return json.dumps(person_data, separators=(",", ":"))
+def sort_repos(repos: Iterable[Repo], count: int = 6) -> list[Repo]:
+    """Return the ``count`` most starred repositories, most starred first.
+
+    Uses a bounded heap, so only ``count`` records are kept while scanning.
+    """
+    return heapq.nlargest(count, repos, key=attrgetter("stargazers_count"))
@@ -0,0 +1,108 @@
+"""Startup warm-up and the readiness it gates.
+
+The lifespan compiles every template and renders the cached pages before
+the worker accepts requests, then prefetches the repository list in the
+background so that a slow GitHub does not hold up startup. ``/readyz``
+reports ready once that prefetch has finished, whether or not it succeeded:
+a failed prefetch only leaves ``/app`` to fetch on its first request, as it
+would without warm-up.
+
+Compiled templates are also kept in a bytecode cache on disk;
+``python -m app.warmup`` fills it ahead of time, for use in image builds.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from jinja2 import Environment
+
+from app.config import Settings
+from app.routes.apps import warm_repo_cache
+from app.utils import templates
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Readiness:
+    """Whether this worker has finished warming up."""
+
+    ready: bool = False
+    started_at: float = 0.0
+    ready_at: float | None = None
+
+    def start(self) -> None:
+        self.ready = False
+        self.started_at = time.monotonic()
+        self.ready_at = None
+
+    def mark_ready(self) -> None:
+        self.ready = True
+        self.ready_at = time.monotonic()
+        logger.info(f"Ready after {self.ready_at - self.started_at:.2f}s")
+
+    @property
+    def warmup_seconds(self) -> float | None:
+        if self.ready_at is None:
+            return None
+        return self.ready_at - self.started_at
+
+
+readiness = Readiness()
+
+_warmup_task: asyncio.Task | None = None
+
+
+def compile_templates(env: Environment) -> int:
+    """Load every HTML template so its compiled form is cached."""
+    names = env.list_templates(extensions=["html"])
+    for name in names:
+        env.get_template(name)
+    return len(names)
+
+
+async def warm_up(settings: Settings) -> None:
+    """Prefetch the repository cache, then mark the worker ready."""
+    try:
+        repos = await asyncio.wait_for(
+            warm_repo_cache(settings), timeout=settings.warmup_timeout
+        )
+        logger.info(f"Warmed repository cache with {len(repos)} repositories")
+    except Exception as e:
+        logger.warning(f"Repository warm-up failed: {e!r}")
+    # Not in a finally: a warm-up cancelled at shutdown never reports ready
+    readiness.mark_ready()
+
+
+def start_warmup(settings: Settings) -> asyncio.Task | None:
+    """Start the background warm-up, or mark ready if there is nothing to do."""
+    global _warmup_task
+    if not settings.warmup_github:
+        readiness.mark_ready()
+        return None
+    _warmup_task = asyncio.create_task(warm_up(settings))
+    return _warmup_task
+
+
+async def stop_warmup() -> None:
+    """Cancel a warm-up that is still running and report not ready."""
+    global _warmup_task
+    if _warmup_task is not None:
+        _warmup_task.cancel()
+        await asyncio.gather(_warmup_task, return_exceptions=True)
+        _warmup_task = None
+    readiness.ready = False
+
+
+def main() -> None:
+    """Fill the template bytecode cache, for use in image builds."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    compiled = compile_templates(templates.env)
+    directory = templates.env.bytecode_cache.directory  # type: ignore[union-attr]
+    logger.info(f"Compiled {compiled} templates into {directory}")
+
+
+if __name__ == "__main__":
+    main()
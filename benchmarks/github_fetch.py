@@ -0,0 +1,93 @@
+"""Cold-fetch latency of the GitHub repo fetcher against a local stub.
+
+Compares a connection per page (the old behaviour of opening a new
+``httpx.AsyncClient`` for every page) with the shared, pooled client that the
+application creates in its lifespan, walking pages one at a time and fetching
+them concurrently once the ``last`` page is known, and finally with stored
+ETags so that steady-state refreshes are answered with 304s.
+
+Usage:
+    python -m benchmarks.github_fetch [--pages 5] [--rounds 20]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from app.config import Settings, get_settings
+from app.github import ValidatorStore, create_github_client
+from app.utils import get_repo_data_for_user
+from benchmarks.github_stub import GitHubStub
+
+
+async def time_fetches(
+    client: httpx.AsyncClient,
+    url: str,
+    rounds: int,
+    concurrency: int | None = None,
+    validators: ValidatorStore | None = None,
+) -> list[float]:
+    """Fetch every page ``rounds`` times and return each duration in ms."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await get_repo_data_for_user(
+            url=url, client=client, concurrency=concurrency, validators=validators
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label: str, timings: list[float], connections: int) -> None:
+    print(
+        f"{label:<22} first={timings[0]:7.2f}ms "
+        f"median={statistics.median(timings):7.2f}ms "
+        f"max={max(timings):7.2f}ms connections={connections}"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    settings = Settings()
+    # Conditional requests are measured separately with an in-memory store
+    get_settings().github_conditional_requests = False
+    with GitHubStub(
+        pages=args.pages, latency_ms=args.latency, handshake_ms=args.handshake
+    ) as stub:
+        url = stub.repos_url()
+
+        per_page = httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=0))
+        async with per_page:
+            timings = await time_fetches(per_page, url, args.rounds, concurrency=1)
+        report("connection per page", timings, stub.connections)
+
+        stub.connections = 0
+        async with create_github_client(settings) as shared:
+            timings = await time_fetches(shared, url, args.rounds, concurrency=1)
+        report("shared, sequential", timings, stub.connections)
+
+        stub.connections = 0
+        async with create_github_client(settings) as shared:
+            timings = await time_fetches(shared, url, args.rounds)
+        report("shared, parallel pages", timings, stub.connections)
+
+        stub.connections = 0
+        async with create_github_client(settings) as shared:
+            timings = await time_fetches(
+                shared, url, args.rounds, validators=ValidatorStore()
+            )
+        report("parallel + ETags", timings, stub.connections)
+        print(f"304 responses: {stub.not_modified}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=2.0, help="ms per request")
+    parser.add_argument(
+        "--handshake", type=float, default=20.0, help="ms per new connection"
+    )
+    asyncio.run(main(parser.parse_args()))
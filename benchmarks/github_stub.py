@@ -0,0 +1,141 @@
+"""Local stand-in for the GitHub repository listing API.
+
+Serves paginated ``/users/<name>/repos`` responses with ``Link`` and ``ETag``
+headers (answering ``If-None-Match`` with 304) from
+a background thread, with optional per-connection and per-request delays to
+model the TCP/TLS handshake and network round trip to api.github.com.
+:func:`mock_transport` answers the same requests in-process, for benchmarks
+that should not measure the network at all.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import httpx
+
+
+def make_repos(page: int, per_page: int) -> list[dict]:
+    """Build a page of synthetic repository objects."""
+    start = (page - 1) * per_page
+    return [
+        {
+            "name": f"repo{i}",
+            "fork": i % 5 == 0,
+            "clone_url": f"https://github.com/stub/repo{i}.git",
+            "html_url": f"https://github.com/stub/repo{i}",
+            "description": f"Synthetic repository {i}",
+            "language": "Python",
+            "forks": i % 7,
+            "stargazers_count": (i * 7919) % 1000,
+            "updated_at": "2024-01-01T00:00:00Z",
+        }
+        for i in range(start, start + per_page)
+    ]
+
+
+def mock_transport(pages: int = 5, per_page: int = 30) -> httpx.MockTransport:
+    """An httpx transport answering repo listing requests without a server."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params.get("page", "1"))
+        headers = {}
+        if page < pages:
+            base = request.url.copy_remove_param("page")
+            headers["Link"] = (
+                f'<{base.copy_set_param("page", page + 1)}>; rel="next", '
+                f'<{base.copy_set_param("page", pages)}>; rel="last"'
+            )
+        return httpx.Response(200, json=make_repos(page, per_page), headers=headers)
+
+    return httpx.MockTransport(handler)
+
+
+class GitHubStub:
+    """Threaded HTTP server that mimics GitHub's paginated repo listing."""
+
+    def __init__(
+        self,
+        pages: int = 5,
+        per_page: int = 30,
+        latency_ms: float = 0.0,
+        handshake_ms: float = 0.0,
+    ) -> None:
+        self.pages = pages
+        self.per_page = per_page
+        self.latency = latency_ms / 1000
+        self.handshake = handshake_ms / 1000
+        self.requests = 0
+        self.connections = 0
+        self.not_modified = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def repos_url(self, username: str = "stub") -> str:
+        return f"{self.base_url}/users/{username}/repos"
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without this, Nagle
+            # and delayed ACKs stall every keep-alive response by ~40ms.
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                stub.connections += 1
+                time.sleep(stub.handshake)
+
+            def do_GET(self) -> None:  # noqa: N802
+                stub.requests += 1
+                time.sleep(stub.latency)
+                parts = urlsplit(self.path)
+                query = dict(parse_qsl(parts.query))
+                page = int(query.get("page", "1"))
+                body = json.dumps(make_repos(page, stub.per_page)).encode()
+                etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+                if self.headers.get("If-None-Match") == etag:
+                    stub.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                base = f"{stub.base_url}{parts.path}"
+                links = []
+                if page < stub.pages:
+                    links.append(f'<{base}?page={page + 1}>; rel="next"')
+                    links.append(f'<{base}?page={stub.pages}>; rel="last"')
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                if links:
+                    self.send_header("Link", ", ".join(links))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "GitHubStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,168 @@
+"""Latency and throughput of the whole application under concurrent load.
+
+Drives ``app.main:app`` in-process over ASGI, through every middleware and
+the lifespan, with GitHub replaced by an in-memory stub and rate limiting
+switched off. Each route is requested by a fixed number of concurrent
+clients and reported as p50/p95/p99 latency and requests per second.
+
+Results can be saved as a JSON baseline and later compared against it; the
+comparison exits non-zero when a route's latency grows past the threshold.
+Baselines are specific to the machine they were recorded on.
+
+Usage:
+    python -m benchmarks.load [--concurrency 1 10 50] [--requests 500]
+    python -m benchmarks.load --save benchmarks/baselines/load.json
+    python -m benchmarks.load --compare benchmarks/baselines/load.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+
+from benchmarks.github_stub import mock_transport
+
+ROUTES = ["/", "/timeline", "/contact", "/app", "/timeline.json", "/sitemap.xml"]
+
+
+async def measure(
+    client: httpx.AsyncClient, path: str, concurrency: int, requests: int
+) -> dict[str, float]:
+    """Request ``path`` ``requests`` times from ``concurrency`` clients."""
+    latencies: list[float] = []
+    errors = 0
+    pending = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in pending:
+            start = time.perf_counter()
+            response = await client.get(path)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "p50_ms": round(cuts[49], 3),
+        "p95_ms": round(cuts[94], 3),
+        "p99_ms": round(cuts[98], 3),
+        "rps": round(requests / elapsed, 1),
+        "errors": errors,
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, dict[str, float]]:
+    # Imported here so the environment set in main() is used by the settings
+    from app.limiter import limiter
+    from app.main import app
+
+    limiter.enabled = False
+    results = {}
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://testserver"
+    )
+    with patch(
+        "app.github.create_github_client",
+        lambda settings: httpx.AsyncClient(transport=mock_transport()),
+    ):
+        async with app.router.lifespan_context(app), client:
+            for path in args.routes:
+                # Warm caches, such as the first GitHub fetch behind /app
+                await measure(client, path, 1, args.warmup)
+                for concurrency in args.concurrency:
+                    name = f"GET {path} c={concurrency}"
+                    results[name] = await measure(
+                        client, path, concurrency, args.requests
+                    )
+                    stats = results[name]
+                    print(
+                        f"{name:<28} p50={stats['p50_ms']:7.2f}ms "
+                        f"p95={stats['p95_ms']:7.2f}ms p99={stats['p99_ms']:7.2f}ms "
+                        f"{stats['rps']:8.1f} req/s errors={stats['errors']}"
+                    )
+    return results
+
+
+def compare(
+    baseline: dict[str, dict[str, float]],
+    results: dict[str, dict[str, float]],
+    metric: str,
+    threshold: float,
+) -> list[str]:
+    """Describe every result whose ``metric`` grew past ``threshold``."""
+    regressions = []
+    for name, stats in results.items():
+        before = baseline.get(name, {}).get(metric)
+        if not before:
+            continue
+        change = stats[metric] / before - 1
+        if change > threshold:
+            regressions.append(
+                f"{name}: {metric} {before:.2f} -> {stats[metric]:.2f} ({change:+.0%})"
+            )
+    return regressions
+
+
+def main(args: argparse.Namespace) -> int:
+    if args.compare and not args.compare.exists():
+        sys.exit(f"No baseline at {args.compare}; record one with --save")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ.update(
+            CACHE_DIR=cache_dir,
+            LOG_LEVEL="WARNING",
+            RATE_LIMIT_STORAGE="memory://",
+            SHARED_CACHE="false",
+        )
+        results = asyncio.run(run(args))
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        document = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "requests": args.requests,
+            "results": results,
+        }
+        args.save.write_text(json.dumps(document, indent=2) + "\n")
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["results"]
+        regressions = compare(baseline, results, args.metric, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No {args.metric} regressions over {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes", nargs="+", default=ROUTES)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--save", type=Path, help="write results as a baseline")
+    parser.add_argument("--compare", type=Path, help="baseline to compare against")
+    parser.add_argument(
+        "--metric", choices=["p50_ms", "p95_ms", "p99_ms"], default="p95_ms"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="allowed slowdown, 0.2 = 20%%"
+    )
+    sys.exit(main(parser.parse_args()))
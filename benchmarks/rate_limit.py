@@ -0,0 +1,74 @@
+"""Per-request overhead of the rate limiter.
+
+Times one limit check, as made by slowapi for every limited request, with the
+previous per-process in-memory fixed window and with the shared SQLite
+sliding window counter, plus the proxy-aware client key function. Checks are
+spread over many client keys, like real traffic.
+
+Usage:
+    python -m benchmarks.rate_limit [--clients 1000] [--number 20000]
+"""
+
+import argparse
+import itertools
+import tempfile
+import timeit
+from pathlib import Path
+
+from limits import parse
+from limits.storage import MemoryStorage
+from limits.strategies import FixedWindowRateLimiter, SlidingWindowCounterRateLimiter
+from starlette.requests import Request
+
+from app.limiter import SQLiteStorage, client_ip
+
+
+def best_us(func, number: int) -> float:
+    """Return the best per-call time of ``func`` in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1_000_000
+
+
+def hitter(strategy, clients: int):
+    """A function checking a generous limit for the next of ``clients`` keys."""
+    limit = parse("1000000/minute")
+    keys = itertools.cycle([f"client-{i}" for i in range(clients)])
+    return lambda: strategy.hit(limit, "contact_submit", next(keys))
+
+
+def proxied_request() -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [
+                (b"x-forwarded-for", b"203.0.113.7, 10.0.0.2"),
+                (b"x-real-ip", b"10.0.0.2"),
+            ],
+            "client": ("172.18.0.3", 40000),
+        }
+    )
+
+
+def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite = SQLiteStorage(f"sqlite:///{Path(tmp) / 'ratelimit.sqlite3'}")
+        cases = {
+            "memory fixed window": FixedWindowRateLimiter(MemoryStorage()),
+            "memory sliding window": SlidingWindowCounterRateLimiter(MemoryStorage()),
+            "sqlite sliding window": SlidingWindowCounterRateLimiter(sqlite),
+        }
+        for label, strategy in cases.items():
+            per_check = best_us(hitter(strategy, args.clients), args.number)
+            print(f"{label:<24} {per_check:8.2f} us/check")
+
+    request = proxied_request()
+    per_key = best_us(lambda: client_ip(request), args.number)
+    print(f"{'client key (proxied)':<24} {per_key:8.2f} us/request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=20_000)
+    main(parser.parse_args())
@@ -0,0 +1,86 @@
+"""Memory and CPU cost of repository records and top-k selection.
+
+Compares the previous eight-field dictionaries against ``Repo`` records, and a
+full ``sorted()`` against the heap-based ``sort_repos`` for picking the most
+starred repositories, over synthetic repository lists.
+
+Usage:
+    python -m benchmarks.repo_records [--sizes 10000 50000] [--count 6]
+"""
+
+import argparse
+import timeit
+import tracemalloc
+from functools import partial
+
+from app.utils import _parse_repos, sort_repos
+from benchmarks.github_stub import make_repos
+
+
+def parse_as_dicts(repos: list[dict]) -> list[dict]:
+    """The previous representation: one dict of eight fields per repository."""
+    return [
+        {
+            "clone_url": repo.get("clone_url", ""),
+            "forks": repo.get("forks", 0),
+            "name": repo.get("name", "Unknown"),
+            "language": repo.get("language") or "Not specified",
+            "stargazers_count": repo.get("stargazers_count", 0),
+            "html_url": repo.get("html_url", ""),
+            "description": repo.get("description", ""),
+            "updated_at": repo.get("updated_at", ""),
+        }
+        for repo in repos
+        if not repo.get("fork", True)
+    ]
+
+
+def sort_dicts(repos: list[dict], count: int) -> list[dict]:
+    """The previous selection: sort everything, then slice."""
+    return sorted(repos, key=lambda x: x["stargazers_count"], reverse=True)[:count]
+
+
+def retained_bytes(build, raw: list[dict]) -> int:
+    """Return the memory still held by the result of ``build(raw)``."""
+    tracemalloc.start()
+    result = build(raw)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def best_ms(func, number: int) -> float:
+    """Return the best per-call time of ``func`` in milliseconds."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1000
+
+
+def main(args: argparse.Namespace) -> None:
+    for size in args.sizes:
+        raw = make_repos(1, size)
+        dicts = parse_as_dicts(raw)
+        records = _parse_repos(raw)
+
+        dict_bytes = retained_bytes(parse_as_dicts, raw)
+        record_bytes = retained_bytes(_parse_repos, raw)
+
+        full_sort = best_ms(partial(sort_dicts, dicts, args.count), number=20)
+        top_k = best_ms(partial(sort_repos, records, count=args.count), number=20)
+
+        print(f"{size} repos ({len(records)} non-fork)")
+        print(
+            f"  memory   dicts={dict_bytes / 1024:9.1f} KiB  "
+            f"records={record_bytes / 1024:9.1f} KiB  "
+            f"({record_bytes / dict_bytes:.0%})"
+        )
+        print(
+            f"  top-{args.count:<3} sorted()={full_sort:7.3f} ms  "
+            f"heap={top_k:7.3f} ms  ({full_sort / top_k:.1f}x faster)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--count", type=int, default=6)
+    main(parser.parse_args())
@@ -0,0 +1,94 @@
+"""Import-time profile of the application, from ``python -X importtime``.
+
+Imports ``app.main`` in a fresh interpreter and reports the slowest modules
+by their own and cumulative import time, the total, and the number of
+modules loaded. ``tests/test_startup.py`` holds the app to the budgets below,
+so a new heavy top-level import shows up as a failing test rather than as a
+slower worker boot or k3s rollout.
+
+Usage:
+    python -m benchmarks.startup [--module app.main] [--top 15]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+
+# Budgets for importing app.main, with headroom for slower machines
+IMPORT_BUDGET_MS = 2500
+MODULE_BUDGET = 750
+
+# Modules only needed by rarely used features, imported where they are used
+DEFERRED_MODULES = ("smtplib", "email.generator", "xml.sax")
+
+
+@dataclass(frozen=True, slots=True)
+class ImportRecord:
+    """One line of ``-X importtime`` output."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> list[ImportRecord]:
+    """Parse ``-X importtime`` lines, skipping the header and other output."""
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        module = name.lstrip()
+        records.append(
+            ImportRecord(
+                module=module,
+                self_us=int(fields[0]),
+                cumulative_us=int(fields[1]),
+                depth=(len(name) - len(module) - 1) // 2,
+            )
+        )
+    return records
+
+
+def profile_imports(module: str = "app.main") -> list[ImportRecord]:
+    """Import ``module`` in a new interpreter and return its import profile."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env={**os.environ, "LOG_LEVEL": "WARNING"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def total_ms(records: list[ImportRecord], module: str = "app.main") -> float:
+    """Cumulative import time of ``module`` in milliseconds."""
+    return next(r.cumulative_us for r in records if r.module == module) / 1000
+
+
+def main(args: argparse.Namespace) -> None:
+    records = profile_imports(args.module)
+    for label, key in (("self", "self_us"), ("cumulative", "cumulative_us")):
+        print(f"Slowest modules by {label} time:")
+        slowest = sorted(records, key=lambda r: getattr(r, key), reverse=True)
+        for record in slowest[: args.top]:
+            print(f"  {getattr(record, key) / 1000:8.1f} ms  {record.module}")
+    print(
+        f"{args.module}: {total_ms(records, args.module):.0f} ms "
+        f"(budget {IMPORT_BUDGET_MS} ms), {len(records)} modules "
+        f"(budget {MODULE_BUDGET})"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=15)
+    main(parser.parse_args())
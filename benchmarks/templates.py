@@ -0,0 +1,96 @@
+"""First-render latency of the templates with and without the bytecode cache.
+
+Each run starts a fresh interpreter, as a new gunicorn worker or container
+would, then times compiling every template and rendering every cached page
+once. Three setups are compared: no bytecode cache, an empty cache (the
+first worker after a template change, which also writes the cache) and a
+cache filled by ``python -m app.warmup`` (every later worker and restart).
+
+Usage:
+    python -m benchmarks.templates [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+CHILD = """
+import asyncio, json, sys, time
+from app.main import app
+from app.rendering import page_cache
+from app.utils import templates
+from app.warmup import compile_templates
+
+if sys.argv[1] == "off":
+    templates.env.bytecode_cache = None
+start = time.perf_counter()
+compile_templates(templates.env)
+compiled = time.perf_counter()
+asyncio.run(page_cache.prerender(app.routes))
+rendered = time.perf_counter()
+print(json.dumps({
+    "compile_ms": (compiled - start) * 1000,
+    "first_render_ms": (rendered - start) * 1000,
+}))
+"""
+
+
+def run_child(mode: str, cache_dir: str) -> dict[str, float]:
+    """Time compiling and first rendering in a new interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD, mode],
+        env={**os.environ, "CACHE_DIR": cache_dir, "LOG_LEVEL": "WARNING"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def measure(mode: str, runs: int) -> dict[str, float]:
+    """Median timings of ``runs`` fresh interpreters in one setup."""
+    samples = []
+    with tempfile.TemporaryDirectory() as warm_dir:
+        if mode == "warm":
+            subprocess.run(
+                [sys.executable, "-m", "app.warmup"],
+                env={**os.environ, "CACHE_DIR": warm_dir},
+                capture_output=True,
+                check=True,
+            )
+        for _ in range(runs):
+            if mode == "warm":
+                samples.append(run_child(mode, warm_dir))
+                continue
+            with tempfile.TemporaryDirectory() as cold_dir:
+                samples.append(run_child(mode, cold_dir))
+    return {
+        key: statistics.median(sample[key] for sample in samples)
+        for key in ("compile_ms", "first_render_ms")
+    }
+
+
+def main(args: argparse.Namespace) -> None:
+    results = {mode: measure(mode, args.runs) for mode in ("off", "cold", "warm")}
+    labels = {
+        "off": "no bytecode cache",
+        "cold": "empty bytecode cache",
+        "warm": "precompiled cache",
+    }
+    for mode, stats in results.items():
+        print(
+            f"{labels[mode]:<22} compile {stats['compile_ms']:7.2f} ms   "
+            f"compile + first render {stats['first_render_ms']:7.2f} ms"
+        )
+    speedup = results["off"]["first_render_ms"] / results["warm"]["first_render_ms"]
+    print(f"Precompiled cache: {speedup:.1f}x faster first render ({args.runs} runs)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    main(parser.parse_args())
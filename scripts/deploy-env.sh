@@ -34,9 +34,9 @@ configure_environment() {
 # Get health URL for current environment
 get_health_url() {
     if [ "$ENV" = "local" ]; then
-        echo "http://localhost:8000/health"
+        echo "http://localhost:8000/readyz"
     else
-        echo "http://localhost/health"
+        echo "http://localhost/readyz"
     fi
 }
 
@@ -1,9 +1,27 @@
+import os
 from unittest.mock import patch
 
 import pytest
 from fastapi.testclient import TestClient
 
+from app.config import get_settings
 from app.main import app
+from app.utils import Repo
+
+
+@pytest.fixture(autouse=True, scope="session")
+def cache_dir(tmp_path_factory):
+    """Keep on-disk caches out of the shared temp directory during tests."""
+    path = tmp_path_factory.mktemp("cache")
+    os.environ["CACHE_DIR"] = str(path)
+    get_settings().cache_dir = path
+    return path
+
+
+@pytest.fixture(autouse=True, scope="session")
+def no_github_warmup():
+    """Skip the startup repository prefetch, which would call GitHub."""
+    get_settings().warmup_github = False
 
 
 @pytest.fixture
@@ -53,3 +71,9 @@ def mock_github_response():
             "fork": False,
         },
     ]
+
+
+@pytest.fixture
+def mock_repos(mock_github_response):
+    """Repository records built from the mock GitHub response."""
+    return [Repo.from_dict(repo) for repo in mock_github_response]
@@ -0,0 +1,246 @@
+import gzip
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.assets import (
+    IMMUTABLE_CACHE_CONTROL,
+    AssetManifest,
+    HashedStaticFiles,
+    PrecompressedStaticFiles,
+    accepted_encodings,
+    asset_manifest,
+    compress_static,
+)
+
+CSS = b"body { color: black; }\n" * 100
+
+
+@pytest.fixture
+def static_tree(tmp_path):
+    """A static directory with a stylesheet, a tiny file and an image."""
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "style.css").write_bytes(CSS)
+    (tmp_path / "tiny.txt").write_bytes(b"hi")
+    (tmp_path / "photo.png").write_bytes(b"\x89PNG" * 200)
+    return tmp_path
+
+
+@pytest.fixture
+def static_client(static_tree):
+    """A client for an app serving the static tree."""
+    app = FastAPI()
+    app.mount("/static", PrecompressedStaticFiles(directory=static_tree))
+    return TestClient(app)
+
+
+class TestCompressStatic:
+    """Test the precompression build step."""
+
+    def test_writes_siblings_for_compressible_files(self, static_tree):
+        """Test that only compressible, non-tiny files get siblings."""
+        compress_static(static_tree)
+
+        sibling = static_tree / "css" / "style.css.gz"
+        assert gzip.decompress(sibling.read_bytes()) == CSS
+        assert not (static_tree / "tiny.txt.gz").exists()
+        assert not (static_tree / "photo.png.gz").exists()
+
+    def test_up_to_date_siblings_are_kept(self, static_tree):
+        """Test that a second build writes nothing new."""
+        first = compress_static(static_tree)
+
+        assert first > 0
+        assert compress_static(static_tree) == 0
+
+    def test_brotli_sibling(self, static_tree):
+        """Test that a brotli sibling is written when brotli is installed."""
+        brotli = pytest.importorskip("brotli")
+        compress_static(static_tree)
+
+        sibling = static_tree / "css" / "style.css.br"
+        assert brotli.decompress(sibling.read_bytes()) == CSS
+
+
+class TestAcceptEncoding:
+    """Test Accept-Encoding parsing."""
+
+    def test_quality_values(self):
+        """Test that q=0 excludes a coding and * includes the rest."""
+        assert accepted_encodings("gzip, deflate, br") == {"gzip", "deflate", "br"}
+        assert accepted_encodings("br;q=0, gzip;q=0.5") == {"gzip"}
+        assert accepted_encodings("*") >= {"br", "gzip"}
+        assert accepted_encodings("") == set()
+
+
+class TestPrecompressedStaticFiles:
+    """Test content negotiation for static files."""
+
+    def test_serves_gzip_sibling(self, static_tree, static_client):
+        """Test that a gzip client gets the precompressed file."""
+        compress_static(static_tree)
+
+        response = static_client.get(
+            "/static/css/style.css", headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["content-type"].startswith("text/css")
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.content == CSS
+
+    def test_prefers_brotli(self, static_tree, static_client):
+        """Test that brotli wins when the client accepts it."""
+        pytest.importorskip("brotli")
+        compress_static(static_tree)
+
+        response = static_client.get(
+            "/static/css/style.css", headers={"Accept-Encoding": "gzip, br"}
+        )
+
+        assert response.headers["content-encoding"] == "br"
+
+    def test_falls_back_to_original(self, static_tree, static_client):
+        """Test identity clients and missing or stale siblings."""
+        compress_static(static_tree)
+        identity = static_client.get(
+            "/static/css/style.css", headers={"Accept-Encoding": "identity"}
+        )
+
+        css = static_tree / "css" / "style.css"
+        later = css.stat().st_mtime_ns + 10**9
+        os.utime(css, ns=(later, later))
+        stale = static_client.get(
+            "/static/css/style.css", headers={"Accept-Encoding": "gzip, br"}
+        )
+
+        for response in (identity, stale):
+            assert "content-encoding" not in response.headers
+            assert response.headers["vary"] == "Accept-Encoding"
+            assert response.content == CSS
+
+    def test_revalidation_of_sibling(self, static_tree, static_client):
+        """Test that the compressed representation answers a 304."""
+        compress_static(static_tree)
+        headers = {"Accept-Encoding": "gzip"}
+        etag = static_client.get("/static/css/style.css", headers=headers).headers[
+            "etag"
+        ]
+
+        response = static_client.get(
+            "/static/css/style.css", headers={**headers, "If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.headers["vary"] == "Accept-Encoding"
+
+    def test_site_mount(self, client):
+        """Test that the site serves static files through the subclass."""
+        response = client.get("/static/css/style.css")
+
+        assert response.status_code == 200
+        assert "Accept-Encoding" in response.headers["vary"]
+
+
+class TestAssetManifest:
+    """Test content-hashed static URLs."""
+
+    def test_url_embeds_content_hash(self, static_tree):
+        """Test that the URL changes only when the content changes."""
+        manifest = AssetManifest(static_tree, check_interval=0)
+        url = manifest.url("css/style.css")
+
+        assert url.startswith("/static/css/style.")
+        assert url.endswith(".css")
+        assert manifest.url("css/style.css") == url
+
+        (static_tree / "css" / "style.css").write_bytes(CSS + b"p {}\n")
+        assert manifest.url("css/style.css") != url
+
+    def test_not_rescanned_by_default(self, static_tree):
+        """Test that without a check interval the directory is scanned once."""
+        manifest = AssetManifest(static_tree)
+        url = manifest.url("css/style.css")
+
+        (static_tree / "css" / "style.css").write_bytes(CSS + b"p {}\n")
+
+        assert manifest.url("css/style.css") == url
+        manifest.build()
+        assert manifest.url("css/style.css") != url
+
+    def test_version_follows_content(self, static_tree):
+        """Test that the manifest version changes when a file's content does."""
+        manifest = AssetManifest(static_tree)
+        version = manifest.version
+
+        (static_tree / "css" / "style.css").write_bytes(CSS + b"p {}\n")
+        manifest.build()
+
+        assert manifest.version != version
+
+    def test_unknown_file_keeps_plain_url(self, static_tree):
+        """Test that a missing file is linked without a hash."""
+        manifest = AssetManifest(static_tree)
+
+        assert manifest.url("js/missing.js") == "/static/js/missing.js"
+
+    def test_precompressed_siblings_are_not_listed(self, static_tree):
+        """Test that build output does not get its own URLs."""
+        compress_static(static_tree)
+        manifest = AssetManifest(static_tree)
+        manifest.build()
+
+        assert manifest.resolve("css/style.css.0123456789ab.gz") is None
+
+
+class TestHashedStaticFiles:
+    """Test serving of content-hashed URLs."""
+
+    @pytest.fixture
+    def hashed_client(self, static_tree):
+        """A client serving the static tree with hashed URLs."""
+        manifest = AssetManifest(static_tree, check_interval=0)
+        app = FastAPI()
+        app.mount(
+            "/static", HashedStaticFiles(directory=static_tree, manifest=manifest)
+        )
+        return TestClient(app), manifest
+
+    def test_current_hash_is_immutable(self, hashed_client):
+        """Test that a current hashed URL is cached for a year."""
+        client, manifest = hashed_client
+
+        response = client.get(manifest.url("css/style.css"))
+
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert response.content == CSS
+
+    def test_old_hash_still_resolves(self, hashed_client):
+        """Test that a URL from a previous release serves the current file."""
+        client, _ = hashed_client
+
+        response = client.get("/static/css/style.0123456789ab.css")
+
+        assert response.status_code == 200
+        assert "cache-control" not in response.headers
+        assert response.content == CSS
+
+    def test_plain_url_is_not_immutable(self, hashed_client):
+        """Test that unhashed URLs keep working without the long cache."""
+        client, _ = hashed_client
+
+        response = client.get("/static/css/style.css")
+
+        assert response.status_code == 200
+        assert "cache-control" not in response.headers
+
+    def test_pages_link_hashed_assets(self, client):
+        """Test that rendered pages use the hashed stylesheet URL."""
+        response = client.get("/terminal")
+
+        assert asset_manifest.url("css/style.css") in response.text
+        assert asset_manifest.url("css/style.css") != "/static/css/style.css"
@@ -0,0 +1,181 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from jinja2 import Environment, FileSystemLoader
+
+from app.cache import SharedCache, SingleFlight, TemplateBytecodeCache
+
+
+class TestSingleFlight:
+    """Test keyed single-flight coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_fetch(self):
+        """Test that concurrent calls for one key run the function once."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return ["repo"]
+
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+
+        assert calls == 1
+        assert results == [["repo"]] * 5
+        assert flight.stats() == {
+            "calls": 1,
+            "coalesced": 4,
+            "errors": 0,
+            "in_flight": 0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_different_keys_do_not_coalesce(self):
+        """Test that each key gets its own call."""
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return 1
+
+        await asyncio.gather(flight.do("a", fetch), flight.do("b", fetch))
+
+        assert flight.calls == 2
+        assert flight.coalesced == 0
+
+    @pytest.mark.asyncio
+    async def test_on_coalesce_callback(self):
+        """Test that each joined call is reported with its key."""
+        joined = []
+        flight = SingleFlight(on_coalesce=joined.append)
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(flight.do("key", fetch) for _ in range(3)))
+
+        assert joined == ["key", "key"]
+
+    @pytest.mark.asyncio
+    async def test_error_is_raised_to_every_waiter(self):
+        """Test that a failure is visible to all coalesced callers."""
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("GitHub is down")
+
+        results = await asyncio.gather(
+            *(flight.do("key", fetch) for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert flight.errors == 1
+        assert flight.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        """Test that cancelling the first caller leaves the shared call running."""
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        release.set()
+
+        assert await second == "done"
+        assert first.cancelled()
+
+
+class TestSharedCache:
+    """Test the SQLite snapshot cache shared between workers."""
+
+    def test_snapshot_visible_to_other_connections(self, tmp_path):
+        """Test that a snapshot written by one worker is read by another."""
+        path = tmp_path / "cache.sqlite3"
+        SharedCache(path, owner="a").set("key", [{"name": "repo"}], timestamp=42.0)
+
+        assert SharedCache(path, owner="b").get("key") == ([{"name": "repo"}], 42.0)
+        assert SharedCache(path, owner="b").get("missing") is None
+
+    def test_lease_is_exclusive(self, tmp_path):
+        """Test that only one owner holds a refresh lease at a time."""
+        path = tmp_path / "cache.sqlite3"
+        first = SharedCache(path, owner="a")
+        second = SharedCache(path, owner="b")
+
+        assert first.acquire("key", ttl=60)
+        assert first.acquire("key", ttl=60)
+        assert not second.acquire("key", ttl=60)
+
+        second.release("key")
+        assert not second.acquire("key", ttl=60)
+
+        first.release("key")
+        assert second.acquire("key", ttl=60)
+
+    def test_expired_lease_can_be_taken_over(self, tmp_path):
+        """Test that a lease left by a dead worker expires."""
+        path = tmp_path / "cache.sqlite3"
+        assert SharedCache(path, owner="a").acquire("key", ttl=-1)
+
+        assert SharedCache(path, owner="b").acquire("key", ttl=60)
+
+
+def make_env(directory, cache_dir):
+    return Environment(
+        loader=FileSystemLoader(directory),
+        bytecode_cache=TemplateBytecodeCache(cache_dir),
+    )
+
+
+class TestTemplateBytecodeCache:
+    """Test the on-disk cache of compiled templates."""
+
+    def test_new_environment_skips_compiling(self, tmp_path):
+        """Test that a second worker loads the bytecode the first one stored."""
+        (tmp_path / "page.html").write_text("Hello {{ name }}")
+        cache_dir = tmp_path / "cache"
+        assert make_env(tmp_path, cache_dir).get_template("page.html")
+
+        env = make_env(tmp_path, cache_dir)
+        with patch.object(env, "compile", side_effect=AssertionError) as compile:
+            template = env.get_template("page.html")
+
+        compile.assert_not_called()
+        assert template.render(name="cache") == "Hello cache"
+
+    def test_keyed_by_source(self, tmp_path):
+        """Test that an edited template gets its own entry."""
+        page = tmp_path / "page.html"
+        cache_dir = tmp_path / "cache"
+        page.write_text("one")
+        make_env(tmp_path, cache_dir).get_template("page.html")
+        page.write_text("two")
+
+        template = make_env(tmp_path, cache_dir).get_template("page.html")
+
+        assert template.render() == "two"
+        assert len(list(cache_dir.iterdir())) == 2
+
+    def test_unwritable_directory(self, tmp_path):
+        """Test that templates still render when the cache cannot be written."""
+        (tmp_path / "page.html").write_text("ok")
+        blocker = tmp_path / "blocker"
+        blocker.write_text("")
+
+        template = make_env(tmp_path, blocker / "cache").get_template("page.html")
+
+        assert template.render() == "ok"
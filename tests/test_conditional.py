@@ -0,0 +1,147 @@
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import Request
+
+from app.assets import asset_manifest
+from app.conditional import http_date, is_not_modified, make_etag
+from app.config import get_settings
+from app.limiter import limiter
+from app.routes.apps import _cache
+
+
+def make_request(headers, method="GET"):
+    """Build a request carrying the given headers."""
+    return Request(
+        {
+            "type": "http",
+            "method": method,
+            "path": "/",
+            "query_string": b"",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        }
+    )
+
+
+class TestValidators:
+    """Test evaluation of conditional request headers."""
+
+    def test_if_none_match(self):
+        """Test strong, weak, listed and wildcard entity tags."""
+        etag = make_etag(b"body")
+
+        assert is_not_modified(make_request({"If-None-Match": etag}), etag)
+        assert is_not_modified(make_request({"If-None-Match": f"W/{etag}"}), etag)
+        assert is_not_modified(make_request({"If-None-Match": f'"x", {etag}'}), etag)
+        assert is_not_modified(make_request({"If-None-Match": "*"}), etag)
+        assert not is_not_modified(make_request({"If-None-Match": '"x"'}), etag)
+        assert not is_not_modified(make_request({}), etag)
+
+    def test_if_modified_since(self):
+        """Test date comparison with one-second resolution."""
+        modified = 1_700_000_000.5
+
+        assert is_not_modified(
+            make_request({"If-Modified-Since": http_date(modified)}), None, modified
+        )
+        assert not is_not_modified(
+            make_request({"If-Modified-Since": http_date(modified - 60)}),
+            None,
+            modified,
+        )
+        assert not is_not_modified(
+            make_request({"If-Modified-Since": "yesterday"}), None, modified
+        )
+
+    def test_if_none_match_takes_precedence(self):
+        """Test that a stale ETag wins over a current date."""
+        modified = 1_700_000_000.0
+        request = make_request(
+            {"If-None-Match": '"old"', "If-Modified-Since": http_date(modified)}
+        )
+
+        assert not is_not_modified(request, make_etag(b"new"), modified)
+
+    def test_only_safe_methods(self):
+        """Test that a POST is never answered with a 304."""
+        etag = make_etag(b"body")
+
+        assert not is_not_modified(make_request({"If-None-Match": etag}, "POST"), etag)
+
+
+class TestConditionalRoutes:
+    """Test 304 answers from the HTML and text routes."""
+
+    def test_cached_page_revalidation(self, client):
+        """Test that a page answers its own validators with a 304."""
+        first = client.get("/terminal")
+        etag = first.headers["etag"]
+        last_modified = first.headers["last-modified"]
+
+        by_etag = client.get("/terminal", headers={"If-None-Match": etag})
+        by_date = client.get("/terminal", headers={"If-Modified-Since": last_modified})
+        changed = client.get("/terminal", headers={"If-None-Match": '"other"'})
+
+        assert by_etag.status_code == 304
+        assert by_etag.content == b""
+        assert by_etag.headers["etag"] == etag
+        assert by_date.status_code == 304
+        assert changed.status_code == 200
+
+    def test_llms_txt_revalidation(self, client):
+        """Test that llms.txt carries validators and answers a 304."""
+        etag = client.get("/llms.txt").headers["etag"]
+
+        response = client.get("/llms.txt", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+
+    def test_timeline_json_revalidation(self, client):
+        """Test that the timeline data answers a 304."""
+        etag = client.get("/timeline.json").headers["etag"]
+
+        response = client.get("/timeline.json", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+
+    def test_apps_version_follows_snapshot(self, client, mock_repos):
+        """Test that the projects page ETag changes with the repo snapshot."""
+        settings = get_settings()
+        cache_key = f"github_repos_{settings.github_username}"
+        _cache[cache_key] = {"data": mock_repos, "timestamp": time.time()}
+
+        with patch("app.routes.apps.get_shared_cache", return_value=None):
+            etag = client.get("/app").headers["etag"]
+            cached = client.get("/app", headers={"If-None-Match": etag})
+
+            _cache[cache_key] = {"data": mock_repos, "timestamp": time.time() + 1}
+            refreshed = client.get("/app", headers={"If-None-Match": etag})
+
+        assert cached.status_code == 304
+        assert "x-cache-age" in cached.headers
+        assert refreshed.status_code == 200
+        assert refreshed.headers["etag"] != etag
+        _cache.pop(cache_key, None)
+
+    @pytest.mark.parametrize(
+        ("target", "name", "value"),
+        [(asset_manifest, "_version", "newassets"), (None, "minify_html", False)],
+    )
+    def test_apps_version_follows_deploy(
+        self, client, mock_repos, monkeypatch, target, name, value
+    ):
+        """Test that new asset hashes or minification change the ETag."""
+        settings = get_settings()
+        cache_key = f"github_repos_{settings.github_username}"
+        _cache[cache_key] = {"data": mock_repos, "timestamp": time.time()}
+
+        with patch("app.routes.apps.get_shared_cache", return_value=None):
+            etag = client.get("/app").headers["etag"]
+            monkeypatch.setattr(target or settings, name, value)
+            response = client.get("/app", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        _cache.pop(cache_key, None)
+        limiter.reset()  # /app allows only 10 requests a minute
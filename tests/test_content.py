@@ -0,0 +1,105 @@
+import json
+import os
+
+import pytest
+from pydantic import ValidationError
+
+from app.content import DataFile, Timeline, data_dir, timeline_data
+from app.routes.home import timeline_context
+
+
+def write_timeline(path, title, mtime_ns):
+    """Write a one-job timeline file with a fixed modification time."""
+    job = {
+        "title": title,
+        "company": "Example",
+        "period": "2024",
+        "location": "Tallinn",
+        "description": "Work",
+        "technologies": ["Python"],
+        "type": "engineering",
+        "icon": "fas fa-code",
+    }
+    path.write_text(
+        json.dumps({"version": 1, "work_experience": [job], "education": []})
+    )
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestDataFile:
+    """Test loading and reloading of content data files."""
+
+    def test_shipped_timeline_is_valid(self):
+        """Test that the bundled timeline file validates."""
+        timeline = DataFile(data_dir / "timeline.json", Timeline).get()
+
+        assert timeline.work_experience[0].company == "Proffyhub OÜ"
+        assert isinstance(timeline.education[0].focus, tuple)
+
+    def test_unchanged_file_returns_same_object(self, tmp_path):
+        """Test that the file is parsed once while it is unchanged."""
+        path = tmp_path / "timeline.json"
+        write_timeline(path, "Engineer", 1_000_000_000)
+        data = DataFile(path, Timeline, check_interval=0)
+
+        assert data.get() is data.get()
+        assert data.loads == 1
+
+    def test_reloads_when_mtime_changes(self, tmp_path):
+        """Test that an edited file is picked up."""
+        path = tmp_path / "timeline.json"
+        write_timeline(path, "Engineer", 1_000_000_000)
+        data = DataFile(path, Timeline, check_interval=0)
+        first = data.get()
+
+        write_timeline(path, "CTO", 2_000_000_000)
+
+        assert data.get() is not first
+        assert data.get().work_experience[0].title == "CTO"
+        assert data.loads == 2
+
+    def test_invalid_edit_keeps_previous_data(self, tmp_path):
+        """Test that a broken edit does not take the page down."""
+        path = tmp_path / "timeline.json"
+        write_timeline(path, "Engineer", 1_000_000_000)
+        data = DataFile(path, Timeline, check_interval=0)
+        first = data.get()
+
+        path.write_text(json.dumps({"version": 2}))
+
+        assert data.get() is first
+
+    def test_invalid_first_load_raises(self, tmp_path):
+        """Test that a broken file is reported when nothing was loaded yet."""
+        path = tmp_path / "timeline.json"
+        path.write_text(json.dumps({"version": 1, "work_experience": "nope"}))
+
+        with pytest.raises(ValidationError):
+            DataFile(path, Timeline).get()
+
+    def test_records_are_immutable(self):
+        """Test that loaded content cannot be modified by a request."""
+        job = timeline_data.get().work_experience[0]
+
+        with pytest.raises(ValidationError):
+            job.title = "Changed"
+
+
+class TestTimelineRoutes:
+    """Test the routes serving timeline data."""
+
+    def test_context_is_reused_between_requests(self):
+        """Test that the timeline context is built once per load."""
+        timeline = timeline_data.get()
+
+        assert timeline_context(timeline) is timeline_context(timeline)
+
+    def test_timeline_json(self, client):
+        """Test that the timeline data is served as JSON."""
+        response = client.get("/timeline.json")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json()["work_experience"][0]["title"] == (
+            timeline_data.get().work_experience[0].title
+        )
@@ -0,0 +1,134 @@
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app import github
+from app.config import Settings
+from app.main import app
+from app.utils import get_repo_data_for_user
+
+
+class TestGithubClient:
+    """Test the shared GitHub API client."""
+
+    def test_create_client_uses_settings(self):
+        """Test that the client carries auth, timeout and pool settings."""
+        settings = Settings(github_token="secret", github_api_timeout=5.0)
+        client = github.create_github_client(settings)
+
+        assert client.headers["Authorization"] == "token secret"
+        assert client.timeout.read == 5.0
+
+    def test_client_lifecycle_follows_lifespan(self):
+        """Test that the lifespan handler opens and closes the shared client."""
+        assert github.get_github_client() is None
+
+        with TestClient(app):
+            client = github.get_github_client()
+            assert client is not None
+            assert app.state.github_client is client
+
+        assert github.get_github_client() is None
+        assert client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_fetcher_reuses_client_across_pages(self):
+        """Test that every page is fetched through the given client."""
+        requested = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(str(request.url))
+            page = request.url.params.get("page", "1")
+            headers = {}
+            if page == "1":
+                headers["link"] = (
+                    '<https://api.github.com/users/test/repos?page=2>; rel="next"'
+                )
+            repo = {"name": f"repo{page}", "fork": False, "stargazers_count": 1}
+            return httpx.Response(200, json=[repo], headers=headers)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            repos = await get_repo_data_for_user(
+                url="https://api.github.com/users/test/repos", client=client
+            )
+
+        assert [r.name for r in repos] == ["repo1", "repo2"]
+        assert len(requested) == 2
+
+
+class TestConditionalRequests:
+    """Test ETag validators and 304 handling."""
+
+    def test_store_survives_restart(self, tmp_path):
+        """Test that validators and page data are reloaded from disk."""
+        path = tmp_path / "validators.json"
+        response = httpx.Response(
+            200, headers={"etag": '"abc"', "last-modified": "Mon, 01 Jan 2024"}
+        )
+        store = github.ValidatorStore(path)
+        store.put("https://api.github.com/x", response, [{"name": "repo"}])
+        store.save()
+
+        reloaded = github.ValidatorStore(path)
+        assert reloaded.request_headers("https://api.github.com/x") == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Mon, 01 Jan 2024",
+        }
+        assert reloaded.get("https://api.github.com/x")["data"] == [{"name": "repo"}]
+
+    def test_corrupt_store_is_ignored(self, tmp_path):
+        """Test that an unreadable store starts empty."""
+        path = tmp_path / "validators.json"
+        path.write_text("{not json")
+
+        assert github.ValidatorStore(path).get("anything") is None
+
+    @pytest.mark.asyncio
+    async def test_unwritable_store_does_not_fail_fetch(self, tmp_path):
+        """Test that a store that cannot be saved still returns the data."""
+        blocker = tmp_path / "blocker"
+        blocker.write_text("")
+        store = github.ValidatorStore(blocker / "validators.json")
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            repo = {"name": "repo1", "fork": False, "stargazers_count": 3}
+            return httpx.Response(200, json=[repo], headers={"etag": '"v1"'})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            repos = await get_repo_data_for_user(
+                url="https://api.github.com/users/test/repos",
+                client=client,
+                validators=store,
+            )
+
+        assert [repo.name for repo in repos] == ["repo1"]
+
+    @pytest.mark.asyncio
+    async def test_not_modified_reuses_stored_page(self, tmp_path):
+        """Test that a 304 answer returns the previously parsed page."""
+        seen_etags = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_etags.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            repo = {"name": "repo1", "fork": False, "stargazers_count": 3}
+            return httpx.Response(200, json=[repo], headers={"etag": '"v1"'})
+
+        store = github.ValidatorStore(tmp_path / "validators.json")
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            first = await get_repo_data_for_user(
+                url="https://api.github.com/users/test/repos",
+                client=client,
+                validators=store,
+            )
+            second = await get_repo_data_for_user(
+                url="https://api.github.com/users/test/repos",
+                client=client,
+                validators=store,
+            )
+
+        assert seen_etags == [None, '"v1"']
+        assert first == second
+        assert store.not_modified == 1
+        assert (tmp_path / "validators.json").exists()
@@ -0,0 +1,92 @@
+import sqlite3
+import time
+
+import pytest
+from limits import parse
+from limits.strategies import SlidingWindowCounterRateLimiter
+from starlette.requests import Request
+
+from app.limiter import BUSY_TIMEOUT, SQLiteStorage, client_ip
+
+
+def make_request(peer, **headers):
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [
+                (name.replace("_", "-").lower().encode(), value.encode())
+                for name, value in headers.items()
+            ],
+            "client": (peer, 40000),
+        }
+    )
+
+
+class TestClientIp:
+    """Test the proxy-aware client key."""
+
+    def test_direct_client_cannot_spoof_headers(self):
+        """Test that forwarding headers from an untrusted peer are ignored."""
+        request = make_request(
+            "203.0.113.7", X_Forwarded_For="198.51.100.1", X_Real_IP="198.51.100.1"
+        )
+
+        assert client_ip(request) == "203.0.113.7"
+
+    def test_forwarded_for_is_read_from_the_right(self):
+        """Test that the first untrusted hop is the client."""
+        request = make_request(
+            "172.18.0.3", X_Forwarded_For="198.51.100.1, 203.0.113.7, 10.0.0.2"
+        )
+
+        assert client_ip(request) == "203.0.113.7"
+
+    def test_real_ip_without_forwarded_for(self):
+        """Test that X-Real-IP from a trusted proxy is used."""
+        request = make_request("127.0.0.1", X_Real_IP="203.0.113.7")
+
+        assert client_ip(request) == "203.0.113.7"
+
+
+class TestSQLiteStorage:
+    """Test the rate limit storage shared between workers."""
+
+    def test_workers_share_one_budget(self, tmp_path):
+        """Test that two workers together get the limit, not twice it."""
+        uri = f"sqlite:///{tmp_path / 'ratelimit.sqlite3'}"
+        workers = [
+            SlidingWindowCounterRateLimiter(SQLiteStorage(uri)) for _ in range(2)
+        ]
+        limit = parse("3/minute")
+
+        hits = [workers[i % 2].hit(limit, "contact", "203.0.113.7") for i in range(4)]
+
+        assert hits == [True, True, True, False]
+        assert workers[0].hit(limit, "contact", "198.51.100.1")
+
+    def test_fixed_window_counters(self, tmp_path):
+        """Test plain counters used by the fixed window strategy."""
+        storage = SQLiteStorage(f"sqlite:///{tmp_path / 'ratelimit.sqlite3'}")
+
+        assert storage.incr("key", expiry=60) == 1
+        assert storage.incr("key", expiry=60, amount=2) == 3
+        assert storage.get("key") == 3
+        storage.clear("key")
+        assert storage.get("key") == 0
+
+    def test_locked_database_fails_fast(self, tmp_path):
+        """Test that a held write lock raises quickly instead of stalling."""
+        storage = SQLiteStorage(f"sqlite:///{tmp_path / 'ratelimit.sqlite3'}")
+        storage.incr("key", expiry=60)
+        other = sqlite3.connect(tmp_path / "ratelimit.sqlite3", isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+        try:
+            start = time.monotonic()
+            with pytest.raises(sqlite3.OperationalError):
+                storage.acquire_sliding_window_entry("key", 10, 60)
+            assert time.monotonic() - start < BUSY_TIMEOUT + 0.5
+        finally:
+            other.execute("ROLLBACK")
+            other.close()
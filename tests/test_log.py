@@ -0,0 +1,132 @@
+import io
+import json
+import logging
+import sys
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app import log
+from app.config import Settings, get_settings
+from app.log import JsonFormatter, RequestLogMiddleware, setup_logging
+
+
+def make_client(**options):
+    """A client for a small app wrapped in the request logger."""
+    app = FastAPI()
+
+    @app.get("/page")
+    async def page():
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.get("/broken")
+    async def broken():
+        raise HTTPException(status_code=503)
+
+    app.add_middleware(RequestLogMiddleware, **options)
+    return TestClient(app)
+
+
+def request_records(caplog):
+    """Records emitted by the request logger."""
+    return [r for r in caplog.records if r.name == "app.requests"]
+
+
+class TestRequestLogMiddleware:
+    """Test the ASGI request logger."""
+
+    def test_logs_status_and_duration(self, caplog):
+        """Test that a request is logged with structured fields."""
+        caplog.set_level(logging.INFO, logger="app.requests")
+
+        make_client().get("/page")
+
+        (record,) = request_records(caplog)
+        assert (record.method, record.path, record.status) == ("GET", "/page", 200)
+        assert record.duration_ms >= 0
+
+    def test_excluded_paths_are_not_logged(self, caplog):
+        """Test that probes do not flood the logs."""
+        caplog.set_level(logging.INFO, logger="app.requests")
+        client = make_client(exclude_paths=["/health"])
+
+        client.get("/health")
+
+        assert request_records(caplog) == []
+
+    def test_include_paths(self, caplog):
+        """Test that only included prefixes are logged."""
+        caplog.set_level(logging.INFO, logger="app.requests")
+        client = make_client(include_paths=["/broken"])
+
+        client.get("/page")
+        client.get("/broken")
+
+        assert [r.path for r in request_records(caplog)] == ["/broken"]
+
+    def test_sampling_keeps_errors(self, caplog):
+        """Test that sampled-out requests are skipped but errors are not."""
+        caplog.set_level(logging.INFO, logger="app.requests")
+        client = make_client(sample_rate=0.0)
+
+        client.get("/page")
+        client.get("/broken")
+
+        (record,) = request_records(caplog)
+        assert record.status == 503
+        assert record.levelno == logging.ERROR
+
+
+class TestLoggingPipeline:
+    """Test the queued JSON logging pipeline."""
+
+    def test_json_formatter_includes_extra(self):
+        """Test that extra fields become JSON keys."""
+        record = logging.LogRecord(
+            "app.test", logging.INFO, __file__, 1, "hello %s", ("world",), None
+        )
+        record.status = 200
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert entry["message"] == "hello world"
+        assert entry["level"] == "INFO"
+        assert entry["status"] == 200
+
+    def test_records_are_written_by_listener(self, capsys):
+        """Test that records reach stderr through the queue listener."""
+        try:
+            setup_logging(Settings(log_format="json"))
+            logging.getLogger("app.test").warning("queued", extra={"answer": 42})
+            log._stop_listener()
+
+            lines = capsys.readouterr().err.strip().splitlines()
+            entry = json.loads(lines[-1])
+            assert entry["message"] == "queued"
+            assert entry["answer"] == 42
+        finally:
+            setup_logging(get_settings())
+
+    def test_handler_follows_replaced_stderr(self, monkeypatch):
+        """Test that the handler writes to the current stderr, not the original."""
+        original = io.StringIO()
+        monkeypatch.setattr(sys, "stderr", original)
+        handler = log.StderrHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        current = io.StringIO()
+        monkeypatch.setattr(sys, "stderr", current)
+        original.close()
+
+        handler.emit(logging.makeLogRecord({"msg": "late"}))
+
+        assert current.getvalue() == "late\n"
+
+    def test_path_lists_from_environment(self, monkeypatch):
+        """Test that path lists are read from the environment as JSON."""
+        monkeypatch.setenv("LOG_EXCLUDE_PATHS", '["/a", "/b"]')
+
+        assert Settings().log_exclude_paths == ["/a", "/b"]
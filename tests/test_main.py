@@ -1,5 +1,7 @@
 from unittest.mock import patch
 
+from app.routes.well_known import WellKnownFile, well_known_files
+
 
 def test_read_main(client):
     """Test home page endpoint."""
@@ -25,16 +27,18 @@ def test_health_check_endpoint(client):
     assert "timestamp" in data
 
 
-def test_favicon_redirect(client):
-    """Test favicon redirect."""
-    response = client.get("/favicon.ico", follow_redirects=True)
+def test_favicon(client):
+    """Test that the favicon is served without a redirect."""
+    response = client.get("/favicon.ico", follow_redirects=False)
     assert response.status_code == 200
+    assert response.headers["content-type"] == "image/x-icon"
 
 
-def test_myssh_redirect(client):
-    """Test myssh script redirect."""
-    response = client.get("/myssh", follow_redirects=True)
+def test_myssh(client):
+    """Test that the ssh setup script is served without a redirect."""
+    response = client.get("/myssh", follow_redirects=False)
     assert response.status_code == 200
+    assert "ssh" in response.text
 
 
 def test_client_ip_endpoint(client):
@@ -54,9 +58,14 @@ def test_llms_txt_endpoint(client):
     assert "Tony Benoy" in response.text
 
 
-def test_llms_txt_fallback(client):
+def test_llms_txt_fallback(client, tmp_path):
     """Test llms.txt endpoint when file doesn't exist."""
-    with patch("builtins.open", side_effect=FileNotFoundError):
+    llms_txt = WellKnownFile(
+        tmp_path / "llms.txt",
+        "text/plain",
+        fallback=well_known_files["/llms.txt"].fallback,
+    )
+    with patch.dict(well_known_files, {"/llms.txt": llms_txt}):
         response = client.get("/llms.txt")
         assert response.status_code == 200
         assert "Personal website of Tony Benoy" in response.text
@@ -83,14 +92,18 @@ def test_terminal_page(client):
     assert "text/html" in response.headers.get("content-type", "")
 
 
-def test_metrics_endpoint_without_psutil(client):
-    """Test metrics endpoint when psutil is not available."""
-    with patch.dict("sys.modules", {"psutil": None}):
-        response = client.get("/metrics")
-        assert response.status_code == 200
-        data = response.json()
-        assert data["status"] == "ok"
-        assert "message" in data
+def test_metrics_endpoint(client):
+    """Test that metrics are exposed in the Prometheus text format."""
+    client.get("/terminal")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_requests_total{method="GET",route="/terminal",status="200"}' in (
+        response.text
+    )
+    assert "http_request_duration_seconds_bucket" in response.text
+    assert "http_requests_in_flight" in response.text
 
 
 def test_contact_form_submission_no_smtp(client, mock_settings):
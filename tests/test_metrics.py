@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+from prometheus_client import REGISTRY
+
+from app.config import get_settings
+from app.routes.apps import _cache
+
+
+def sample(name, **labels):
+    """Current value of a metric sample in the in-process registry."""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestRequestMetrics:
+    """Test per-route request instrumentation."""
+
+    def test_routes_are_labelled_by_template(self, client):
+        """Test that mounts and unknown paths do not create new labels."""
+        labels = {"method": "GET", "status": "404"}
+        before = sample("http_requests_total", route="unmatched", **labels)
+
+        client.get("/no-such-page")
+        client.get("/static/css/style.css")
+
+        assert sample("http_requests_total", route="unmatched", **labels) == (
+            before + 1
+        )
+        assert sample(
+            "http_requests_total", method="GET", route="/static", status="200"
+        )
+
+    def test_cache_events(self, client, mock_repos):
+        """Test that a cached /app view counts as a cache hit."""
+        cache_key = f"github_repos_{get_settings().github_username}"
+        _cache[cache_key] = {"data": mock_repos, "timestamp": time.time()}
+        before = sample("github_cache_events_total", event="hit")
+        renders = sample("template_render_seconds_count", template="apps.html")
+
+        with patch("app.routes.apps.get_shared_cache", return_value=None):
+            client.get("/app")
+
+        assert sample("github_cache_events_total", event="hit") == before + 1
+        assert sample("template_render_seconds_count", template="apps.html") == (
+            renders + 1
+        )
+        _cache.pop(cache_key, None)
+
+
+WORKER = """
+from app.metrics import REQUESTS
+REQUESTS.labels("GET", "/", "200").inc({count})
+"""
+
+SCRAPE = """
+from app.metrics import render_metrics
+print(render_metrics().decode())
+"""
+
+
+class TestMultiprocess:
+    """Test aggregation of metrics written by several worker processes."""
+
+    def test_scrape_sums_all_workers(self, tmp_path):
+        """Test that one scrape reports the total of every process."""
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+
+        def run(code):
+            return subprocess.run(
+                [sys.executable, "-c", code],
+                env=env,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+
+        run(WORKER.format(count=2))
+        run(WORKER.format(count=3))
+        output = run(SCRAPE)
+
+        assert 'http_requests_total{method="GET",route="/",status="200"} 5.0' in (
+            output
+        )
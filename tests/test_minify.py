@@ -0,0 +1,110 @@
+import re
+
+import pytest
+
+from app.config import get_settings
+from app.minify import minify_html
+from app.rendering import page_cache
+
+ROUTES = ["/", "/timeline", "/contact", "/terminal", "/photography"]
+
+
+def visible(html):
+    """Markup with comments dropped and whitespace normalized, for comparison."""
+    html = re.sub(r"<!--(?!\[if).*?-->", "", html, flags=re.DOTALL)
+    html = re.sub(r"\s+>", ">", html)
+    return " ".join(html.split())
+
+
+class TestMinifyHtml:
+    """Test the HTML minifier."""
+
+    def test_collapses_whitespace_and_comments(self):
+        """Test that indentation and comments go but word breaks stay."""
+        html = (
+            "<div>\n\t\t<!-- note -->\n\t\t<a  href='/'\n   class=\"x\" >Home</a>"
+            "  <b>bold</b>\n</div>"
+        )
+
+        assert (
+            minify_html(html)
+            == "<div>\n<a href='/' class=\"x\">Home</a> <b>bold</b>\n</div>"
+        )
+
+    def test_keeps_conditional_comments(self):
+        """Test that conditional comments are not treated as plain comments."""
+        html = "<!--[if IE]><p>old</p><![endif]-->"
+
+        assert minify_html(html) == html
+
+    @pytest.mark.parametrize(
+        "element",
+        [
+            "<pre>\n  line one\n\n    line two\n</pre>",
+            '<textarea name="m">\n  keep   this\n</textarea>',
+            "<script>\n  const t = `a\n    b`;\n</script>",
+        ],
+    )
+    def test_preformatted_content_verbatim(self, element):
+        """Test that pre, textarea and template literals are left alone."""
+        html = f"<div>\n  {element}\n</div>"
+
+        assert element in minify_html(html)
+
+    def test_script_loses_indentation_only(self):
+        """Test that scripts keep their line breaks, as ASI depends on them."""
+        html = "<script>\n\t\tconst a = 1\n\n\t\tconst b = '  x  '\n\t</script>"
+
+        assert (
+            minify_html(html) == "<script>\nconst a = 1\nconst b = '  x  '\n</script>"
+        )
+
+    def test_attribute_values_untouched(self):
+        """Test that whitespace and brackets inside quoted values survive."""
+        html = "<input  value=\"a  >  b\"   title='c\n d' >"
+
+        assert minify_html(html) == "<input value=\"a  >  b\" title='c\n d'>"
+
+
+class TestMinifiedPages:
+    """Test minification in the rendering pipeline."""
+
+    @pytest.mark.parametrize("path", ROUTES)
+    def test_bytes_saved(self, client, path, record_property):
+        """Report the bytes minification saves per route, without changing it."""
+        settings = get_settings()
+        minified = client.get(path).text
+        page_cache.clear()
+        try:
+            settings.minify_html = False
+            original = client.get(path).text
+        finally:
+            settings.minify_html = True
+            page_cache.clear()
+
+        saved = len(original.encode()) - len(minified.encode())
+        record_property("bytes_saved", saved)
+        print(f"{path}: {len(original.encode())} -> {len(minified.encode())} bytes")
+        assert saved > 0
+        assert visible(minified) == visible(original)
+
+    def test_rendered_once(self, client):
+        """Test that cached pages are minified on render, not per request."""
+        client.get("/timeline")
+        misses = page_cache.misses
+
+        for _ in range(3):
+            client.get("/timeline")
+
+        assert page_cache.misses == misses
+
+    def test_off_in_debug(self, client, monkeypatch):
+        """Test that debug mode serves templates as written."""
+        monkeypatch.setattr(get_settings(), "debug", True)
+        page_cache.clear()
+
+        body = client.get("/contact").text
+        page_cache.clear()
+
+        assert "<!-- " in body
+        assert "\n\t" in body
@@ -0,0 +1,234 @@
+import asyncio
+import socket
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.config import Settings
+from app.outbox import MailSender, Outbox, get_outbox
+
+aiosmtpd = pytest.importorskip("aiosmtpd.controller")
+
+
+class Recorder:
+    """aiosmtpd handler keeping every received message and its client port."""
+
+    def __init__(self):
+        self.messages = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("nobody@"):
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((session.peer[1], envelope.content.decode()))
+        return "250 OK"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    """A local SMTP server standing in for the real relay."""
+    recorder = Recorder()
+    controller = aiosmtpd.Controller(recorder, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller, recorder
+    controller.stop()
+
+
+def make_settings(tmp_path, port, **overrides):
+    return Settings(
+        smtp_server="127.0.0.1",
+        smtp_port=port,
+        smtp_starttls=False,
+        contact_outbox=tmp_path / "outbox.sqlite3",
+        contact_retry_base=60.0,
+        **overrides,
+    )
+
+
+def queue(outbox, subject="Hello"):
+    return outbox.add(
+        "noreply@example.com", "me@example.com", subject, "Body", "you@example.com"
+    )
+
+
+class TestOutbox:
+    """Test the SQLite message queue."""
+
+    def test_claimed_messages_are_hidden(self, tmp_path):
+        """Test that a message is handed to only one sender at a time."""
+        outbox = Outbox(tmp_path / "outbox.sqlite3")
+        queue(outbox)
+
+        (message,) = outbox.claim(max_attempts=3, timeout=60)
+
+        assert message.subject == "Hello"
+        assert outbox.claim(max_attempts=3, timeout=60) == []
+        assert outbox.pending() == 1
+
+    def test_exhausted_messages_are_not_claimed(self, tmp_path):
+        """Test that a message is kept but no longer retried after max attempts."""
+        outbox = Outbox(tmp_path / "outbox.sqlite3")
+        message_id = queue(outbox)
+        outbox.failed(message_id, "refused", retry_at=0)
+
+        assert outbox.claim(max_attempts=1, timeout=60) == []
+        assert outbox.pending() == 1
+
+
+class TestMailSender:
+    """Test background delivery against a local SMTP server."""
+
+    @pytest.mark.asyncio
+    async def test_delivers_over_one_connection(self, tmp_path, smtp_server):
+        """Test that queued messages are sent and the connection is reused."""
+        controller, recorder = smtp_server
+        settings = make_settings(tmp_path, controller.port)
+        outbox = Outbox(settings.contact_outbox)
+        queue(outbox, "First")
+        queue(outbox, "Second")
+        sender = MailSender(outbox, settings)
+
+        assert await sender.deliver_due() == 2
+        await sender.stop()
+
+        assert outbox.pending() == 0
+        (port_a, first), (port_b, second) = recorder.messages
+        assert port_a == port_b
+        assert "Subject: First" in first
+        assert "Reply-To: you@example.com" in first
+        assert "Subject: Second" in second
+
+    @pytest.mark.asyncio
+    async def test_failed_delivery_is_retried_later(self, tmp_path):
+        """Test that a failure is recorded with a backoff delay."""
+        settings = make_settings(tmp_path, free_port(), smtp_timeout=2.0)
+        outbox = Outbox(settings.contact_outbox)
+        message_id = queue(outbox)
+        sender = MailSender(outbox, settings)
+
+        await sender.deliver_due()
+
+        attempts, next_attempt, error = (
+            outbox._connect()
+            .execute(
+                "SELECT attempts, next_attempt, last_error FROM messages WHERE id = ?",
+                (message_id,),
+            )
+            .fetchone()
+        )
+        assert attempts == 1
+        assert next_attempt >= time.time() + 50
+        assert error
+        assert sender.failures == 1
+        assert await sender.deliver_due() == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("recipient", "subject"),
+        [
+            ("nobody@example.com", "Hello"),
+            ("me@example.com", "Hello\r\nBcc: victim@example.com"),
+        ],
+    )
+    async def test_rejected_message_is_not_retried(
+        self, tmp_path, smtp_server, recipient, subject
+    ):
+        """Test that a refused or invalid message gives up at once."""
+        controller, recorder = smtp_server
+        settings = make_settings(tmp_path, controller.port)
+        outbox = Outbox(settings.contact_outbox)
+        queue(outbox, "First")
+        message_id = outbox.add(
+            "noreply@example.com", recipient, subject, "Body", "you@example.com"
+        )
+        queue(outbox, "Last")
+        sender = MailSender(outbox, settings)
+
+        assert await sender.deliver_due() == 3
+        await sender.stop()
+
+        attempts, error = (
+            outbox._connect()
+            .execute(
+                "SELECT attempts, last_error FROM messages WHERE id = ?",
+                (message_id,),
+            )
+            .fetchone()
+        )
+        assert attempts == settings.contact_max_attempts
+        assert error
+        assert sender.failures == 1
+        assert outbox.pending() == 1
+        (port_a, _), (port_b, _) = recorder.messages
+        assert port_a == port_b
+
+    @pytest.mark.asyncio
+    async def test_stop_drains_outbox(self, tmp_path, smtp_server):
+        """Test that messages queued before shutdown are still delivered."""
+        controller, recorder = smtp_server
+        settings = make_settings(tmp_path, controller.port)
+        outbox = Outbox(settings.contact_outbox)
+        sender = MailSender(outbox, settings, poll_interval=3600)
+        sender.start()
+        queue(outbox)
+
+        await sender.stop()
+
+        assert outbox.pending() == 0
+        assert len(recorder.messages) == 1
+
+    @pytest.mark.asyncio
+    async def test_stop_during_send(self, tmp_path, smtp_server):
+        """Test that a send in progress at shutdown is recorded and not repeated."""
+        controller, recorder = smtp_server
+        settings = make_settings(tmp_path, controller.port)
+        outbox = Outbox(settings.contact_outbox)
+        sender = MailSender(outbox, settings, poll_interval=3600)
+        sending = threading.Event()
+        send = sender._send
+
+        def slow_send(message):
+            sending.set()
+            time.sleep(0.2)
+            send(message)
+
+        queue(outbox)
+        with patch.object(sender, "_send", slow_send):
+            sender.start()
+            await asyncio.to_thread(sending.wait, 5)
+            await sender.stop()
+
+        assert sender.sent == 1
+        assert outbox.pending() == 0
+        assert len(recorder.messages) == 1
+
+
+def test_contact_form_is_queued(client, tmp_path):
+    """Test that a submission is stored in the outbox instead of sent inline."""
+    settings = make_settings(tmp_path, free_port())
+    form_data = {
+        "name": "Test User",
+        "email": "test@example.com",
+        "subject": "Test Subject",
+        "message": "This is a test message with enough content to pass validation.",
+    }
+
+    with patch("app.routes.home.get_settings", return_value=settings):
+        response = client.post("/contact", data=form_data)
+
+    assert response.status_code == 200
+    assert "sent successfully" in response.text
+    (message,) = get_outbox(settings).claim(max_attempts=1, timeout=60)
+    assert message.subject == "Contact Form: Test Subject"
+    assert message.reply_to == "test@example.com"
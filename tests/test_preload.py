@@ -0,0 +1,81 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse
+from fastapi.testclient import TestClient
+
+from app.preload import EARLY_HINT, PreloadMiddleware, critical_links
+
+
+def make_app(early_hints=False):
+    app = FastAPI()
+
+    @app.get("/page", response_class=HTMLResponse)
+    async def page():
+        return "<html></html>"
+
+    @app.get("/data")
+    async def data():
+        return {}
+
+    app.add_middleware(PreloadMiddleware, early_hints=early_hints)
+    return app
+
+
+def urls(link_header):
+    return [link.split(">")[0].lstrip("<") for link in link_header.split(", ")]
+
+
+class TestPreload:
+    """Test preload hints for the critical stylesheets."""
+
+    def test_link_header_on_html_only(self):
+        """Test that HTML responses carry the hints and other responses do not."""
+        client = TestClient(make_app())
+
+        page = client.get("/page")
+        data = client.get("/data")
+
+        assert "rel=preload; as=style" in page.headers["link"]
+        assert "link" not in data.headers
+
+    def test_hints_match_base_template(self, client):
+        """Test that every hinted URL is one the pages actually load."""
+        response = client.get("/")
+        links = response.headers["link"]
+
+        for url in urls(links):
+            assert url in response.text
+        assert any("/static/css/style" in url for url in urls(links))
+
+    @pytest.mark.asyncio
+    async def test_early_hints_when_supported(self):
+        """Test that a 103 is sent first when the server offers the extension."""
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "2",
+            "method": "GET",
+            "scheme": "https",
+            "path": "/page",
+            "raw_path": b"/page",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"host", b"testserver"), (b"accept", b"text/html")],
+            "server": ("testserver", 443),
+            "extensions": {EARLY_HINT: {}},
+        }
+        await make_app(early_hints=True)(scope, receive, send)
+
+        assert sent[0] == {
+            "type": EARLY_HINT,
+            "links": [link.encode() for link in critical_links()],
+        }
+        assert sent[1]["type"] == "http.response.start"
@@ -0,0 +1,172 @@
+import os
+
+import pytest
+from fastapi.templating import Jinja2Templates
+
+from app.main import app
+from app.minify import minify_html
+from app.rendering import (
+    PageCache,
+    StreamingTemplateResponse,
+    page_cache,
+    request_for_path,
+)
+from app.routes.home import CONTACT_CONTEXT
+from app.utils import templates
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    """A throwaway template directory with one page."""
+    (tmp_path / "page.html").write_text("<p>{{ greeting }} {{ request.url.path }}</p>")
+    return tmp_path
+
+
+@pytest.fixture
+def cache(template_dir):
+    """A page cache over the throwaway templates that checks on every call."""
+    return PageCache(
+        Jinja2Templates(directory=str(template_dir)), template_dir, check_interval=0
+    )
+
+
+class TestPageCache:
+    """Test the rendered page cache."""
+
+    def test_render_once_per_key(self, cache):
+        """Test that a page is rendered once and then served from memory."""
+        context = {"greeting": "hello"}
+        request = request_for_path("/a")
+
+        first = cache.get("page.html", context, request)
+        second = cache.get("page.html", context, request)
+
+        assert first is second
+        assert first.body == b"<p>hello /a</p>"
+        assert first.etag.startswith('"') and first.etag.endswith('"')
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_key_includes_path_and_context(self, cache):
+        """Test that path and context changes render separate pages."""
+        context = {"greeting": "hello"}
+
+        a = cache.get("page.html", context, request_for_path("/a"))
+        b = cache.get("page.html", context, request_for_path("/b"))
+        c = cache.get("page.html", {"greeting": "hi"}, request_for_path("/a"))
+
+        assert len({a.body, b.body, c.body}) == 3
+        assert len({a.etag, b.etag, c.etag}) == 3
+
+    def test_new_context_replaces_page(self, cache):
+        """Test that reloaded data does not leave old renders behind."""
+        request = request_for_path("/a")
+
+        for greeting in ("hello", "hi", "hey"):
+            page = cache.get("page.html", {"greeting": greeting}, request)
+
+        assert page.body == b"<p>hey /a</p>"
+        assert len(cache._pages) == 1
+
+    def test_template_change_invalidates(self, cache, template_dir):
+        """Test that editing a template drops its rendered pages."""
+        context = {"greeting": "hello"}
+        cache.get("page.html", context, request_for_path("/a"))
+
+        page = template_dir / "page.html"
+        page.write_text("<div>{{ greeting }}</div>")
+        stat = page.stat()
+        os.utime(page, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert cache.get("page.html", context, request_for_path("/a")).body == (
+            b"<div>hello</div>"
+        )
+
+    def test_templates_not_rescanned_by_default(self, template_dir):
+        """Test that without a check interval templates are scanned once."""
+        cache = PageCache(Jinja2Templates(directory=str(template_dir)), template_dir)
+        version = cache.version
+
+        page = template_dir / "page.html"
+        page.write_text("<div>{{ greeting }}</div>")
+        stat = page.stat()
+        os.utime(page, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert cache.version == version
+
+    def test_matches_template_response(self):
+        """Test that cached output is a normal template render, minified."""
+        request = request_for_path("/contact")
+        expected = templates.TemplateResponse(request, "contact.html", CONTACT_CONTEXT)
+
+        page = page_cache.get("contact.html", CONTACT_CONTEXT, request)
+
+        assert page.body.decode() == minify_html(expected.body.decode())
+
+
+class TestStreamingTemplateResponse:
+    """Test templates streamed with the document head first."""
+
+    @pytest.mark.asyncio
+    async def test_head_sent_first(self):
+        """Test that the head is its own chunk and the page is unchanged."""
+        request = request_for_path("/contact")
+        expected = templates.TemplateResponse(request, "contact.html", CONTACT_CONTEXT)
+
+        response = StreamingTemplateResponse(request, "contact.html", CONTACT_CONTEXT)
+        chunks = [chunk async for chunk in response.body_iterator]
+
+        assert len(chunks) == 2
+        assert chunks[0].endswith(b"</head>")
+        assert b"".join(chunks).decode() == minify_html(expected.body.decode())
+        assert response.headers["x-accel-buffering"] == "no"
+
+    def test_contact_submission_streamed(self, client):
+        """Test that a rendered-per-request page arrives complete."""
+        response = client.post(
+            "/contact",
+            data={
+                "name": "Test",
+                "email": "test@example.com",
+                "subject": "Hello",
+                "message": "A message long enough to be accepted.",
+            },
+        )
+
+        assert response.status_code == 200
+        assert "content-length" not in response.headers
+        assert response.text.rstrip().endswith("</html>")
+
+
+class TestCachedRoutes:
+    """Test routes served from the page cache."""
+
+    @pytest.mark.parametrize(
+        "path", ["/", "/contact", "/timeline", "/terminal", "/photography"]
+    )
+    def test_cached_route_sends_etag(self, client, path):
+        """Test that content-static routes are served with a strong ETag."""
+        first = client.get(path)
+        second = client.get(path)
+
+        assert first.status_code == 200
+        assert "text/html" in first.headers["content-type"]
+        assert first.headers["etag"] == second.headers["etag"]
+        assert first.content == second.content
+
+    def test_pages_prerendered_at_startup(self, client):
+        """Test that the lifespan handler fills the cache."""
+        misses = page_cache.misses
+        client.get("/timeline")
+        assert page_cache.misses == misses
+
+    @pytest.mark.asyncio
+    async def test_prerender_finds_included_routes(self, client):
+        """Test that routes of included routers are prerendered."""
+        page_cache.clear()
+
+        rendered = await page_cache.prerender(app.routes)
+
+        assert rendered == 6  # five pages, the home page at two paths
+        misses = page_cache.misses
+        client.get("/contact")
+        assert page_cache.misses == misses
@@ -1,4 +1,18 @@
-from unittest.mock import patch
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.cache import SharedCache
+from app.config import get_settings
+from app.routes.apps import (
+    _cache,
+    _load_repos,
+    _refresh_retry_at,
+    _schedule_refresh,
+    warm_repo_cache,
+)
 
 
 class TestAppsRoute:
@@ -14,18 +28,182 @@ class TestAppsRoute:
             assert response.status_code == 200
             assert "text/html" in response.headers.get("content-type", "")
 
-    def test_apps_view_with_mock_data(self, client, mock_github_response):
+    def test_apps_view_with_mock_data(self, client, mock_repos):
         """Test apps view with mocked data."""
         with (
             patch("app.routes.apps.get_repo_data_for_user") as mock_fetch,
             patch("app.routes.apps.sort_repos") as mock_sort,
         ):
-            mock_fetch.return_value = mock_github_response
-            mock_sort.return_value = mock_github_response
+            mock_fetch.return_value = mock_repos
+            mock_sort.return_value = mock_repos
 
             response = client.get("/app")
             assert response.status_code == 200
 
+    def test_apps_view_serves_stale_while_refreshing(self, client, mock_repos):
+        """Test that an expired entry is served while a refresh is scheduled."""
+        settings = get_settings()
+        cache_key = f"github_repos_{settings.github_username}"
+        _cache[cache_key] = {
+            "data": mock_repos,
+            "timestamp": time.time() - settings.cache_ttl - 10,
+        }
+
+        with (
+            patch("app.routes.apps.get_repo_data_for_user") as mock_fetch,
+            patch("app.routes.apps._schedule_refresh") as mock_schedule,
+            patch("app.routes.apps.get_shared_cache", return_value=None),
+        ):
+            response = client.get("/app")
+
+        assert response.status_code == 200
+        assert "repo1" in response.text
+        assert int(response.headers["x-cache-age"]) >= settings.cache_ttl
+        assert "age" not in response.headers
+        mock_fetch.assert_not_called()
+        mock_schedule.assert_called_once()
+        _cache.pop(cache_key, None)
+
+
+class TestBackgroundRefresh:
+    """Test the stale-while-revalidate refresh task."""
+
+    @pytest.mark.asyncio
+    async def test_schedule_refresh_runs_once(self, mock_repos):
+        """Test that concurrent schedules share a single refresh task."""
+        settings = get_settings()
+        cache_key = "github_repos_refresh_test"
+
+        with patch(
+            "app.routes.apps._fetch_repos",
+            new=AsyncMock(return_value=mock_repos),
+        ) as mock_fetch:
+            first = _schedule_refresh(cache_key, settings)
+            second = _schedule_refresh(cache_key, settings)
+            assert first is second
+            await first
+
+        mock_fetch.assert_awaited_once()
+        assert _cache.pop(cache_key)["data"] == mock_repos
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_backs_off(self):
+        """Test that a failed refresh is not retried immediately."""
+        settings = get_settings()
+        cache_key = "github_repos_backoff_test"
+
+        with patch(
+            "app.routes.apps._fetch_repos",
+            new=AsyncMock(side_effect=RuntimeError("boom")),
+        ):
+            task = _schedule_refresh(cache_key, settings)
+            await task
+            assert _schedule_refresh(cache_key, settings) is None
+
+        assert cache_key not in _cache
+        _refresh_retry_at.pop(cache_key, None)
+
+
+class TestSharedCache:
+    """Test the cross-worker shared cache behind the in-process cache."""
+
+    @pytest.mark.asyncio
+    async def test_load_publishes_snapshot(self, tmp_path, mock_repos):
+        """Test that the worker that fetches publishes to the shared cache."""
+        settings = get_settings()
+        cache_key = "github_repos_publish_test"
+        shared = SharedCache(tmp_path / "cache.sqlite3")
+
+        with (
+            patch("app.routes.apps.get_shared_cache", return_value=shared),
+            patch(
+                "app.routes.apps._fetch_repos",
+                new=AsyncMock(return_value=mock_repos),
+            ),
+        ):
+            await _load_repos(cache_key, settings)
+
+        data, timestamp = shared.get(cache_key)
+        assert data == [repo.to_dict() for repo in mock_repos]
+        assert timestamp == _cache.pop(cache_key)["timestamp"]
+        assert shared.acquire(cache_key, 10)
+
+    @pytest.mark.asyncio
+    async def test_waits_for_worker_holding_lease(self, tmp_path, mock_repos):
+        """Test that a cold worker uses another worker's snapshot, not GitHub."""
+        settings = get_settings()
+        cache_key = "github_repos_lease_test"
+        path = tmp_path / "cache.sqlite3"
+        other_worker = SharedCache(path, owner="other")
+        assert other_worker.acquire(cache_key, 10)
+
+        async def publish_later():
+            await asyncio.sleep(0.05)
+            other_worker.set(cache_key, [repo.to_dict() for repo in mock_repos])
+
+        with (
+            patch(
+                "app.routes.apps.get_shared_cache",
+                return_value=SharedCache(path, owner="this"),
+            ),
+            patch("app.routes.apps._fetch_repos", new=AsyncMock()) as mock_fetch,
+            patch("app.routes.apps.SHARED_POLL_INTERVAL", 0.01),
+        ):
+            repos, _ = await asyncio.gather(
+                _load_repos(cache_key, settings), publish_later()
+            )
+
+        assert repos == mock_repos
+        mock_fetch.assert_not_awaited()
+        _cache.pop(cache_key, None)
+
+    @pytest.mark.asyncio
+    async def test_refresh_backs_off_while_other_worker_holds_lease(
+        self, tmp_path, mock_repos
+    ):
+        """Test that a stale worker does not count another's lease as a refresh."""
+        settings = get_settings()
+        cache_key = "github_repos_lease_backoff_test"
+        path = tmp_path / "cache.sqlite3"
+        assert SharedCache(path, owner="other").acquire(cache_key, 10)
+        stale = time.time() - settings.cache_ttl - 10
+        _cache[cache_key] = {"data": mock_repos, "timestamp": stale}
+
+        with (
+            patch(
+                "app.routes.apps.get_shared_cache",
+                return_value=SharedCache(path, owner="this"),
+            ),
+            patch("app.routes.apps._fetch_repos", new=AsyncMock()) as mock_fetch,
+        ):
+            await _schedule_refresh(cache_key, settings)
+            assert _schedule_refresh(cache_key, settings) is None
+
+        mock_fetch.assert_not_awaited()
+        assert _cache.pop(cache_key)["timestamp"] == stale
+        _refresh_retry_at.pop(cache_key)
+
+    @pytest.mark.asyncio
+    async def test_warmup_keeps_stale_shared_snapshot(self, tmp_path, mock_repos):
+        """Test that warm-up serves a snapshot past the soft TTL, not a fetch."""
+        settings = get_settings().model_copy(update={"github_username": "warmstale"})
+        cache_key = "github_repos_warmstale"
+        shared = SharedCache(tmp_path / "cache.sqlite3")
+        stale = time.time() - settings.cache_ttl - 10
+        shared.set(cache_key, [repo.to_dict() for repo in mock_repos], stale)
+
+        with (
+            patch("app.routes.apps.get_shared_cache", return_value=shared),
+            patch("app.routes.apps._fetch_repos", new=AsyncMock()) as mock_fetch,
+            patch("app.routes.apps._schedule_refresh") as mock_schedule,
+        ):
+            repos = await warm_repo_cache(settings)
+
+        assert repos == mock_repos
+        mock_fetch.assert_not_awaited()
+        mock_schedule.assert_called_once_with(cache_key, settings)
+        _cache.pop(cache_key)
+
 
 class TestHomeRoutes:
     """Test home route functionality."""
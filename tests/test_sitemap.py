@@ -0,0 +1,75 @@
+import xml.etree.ElementTree as ET
+from datetime import UTC, datetime
+
+from fastapi import FastAPI
+
+from app.sitemap import Sitemap, sitemap_entry
+
+NS = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
+
+
+class Source:
+    """A data source with a settable modification time."""
+
+    def __init__(self, mtime):
+        self.mtime = mtime
+
+
+def make_app(source):
+    app = FastAPI()
+
+    @app.get("/")
+    @app.get("/index")
+    @sitemap_entry(1.0, "monthly", sources=[source], path="/")
+    async def index():
+        return {}
+
+    @app.get("/private")
+    async def private():
+        return {}
+
+    return app
+
+
+class TestSitemap:
+    """Test sitemap generation from the route table."""
+
+    def test_site_sitemap(self, client):
+        """Test that listed pages appear once and unlisted routes do not."""
+        response = client.get("/sitemap.xml")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/xml"
+        urls = ET.fromstring(response.content).findall("sm:url", NS)
+        locs = [url.findtext("sm:loc", namespaces=NS) for url in urls]
+        assert locs[0] == "https://tonybenoy.com/"
+        assert "https://tonybenoy.com/timeline" in locs
+        assert "https://tonybenoy.com/app" in locs
+        assert not any(loc.endswith(("/index", "/test", "/health")) for loc in locs)
+        assert all(url.findtext("sm:lastmod", namespaces=NS) for url in urls)
+
+    def test_revalidation(self, client):
+        """Test that the sitemap answers a matching ETag with a 304."""
+        etag = client.get("/sitemap.xml").headers["etag"]
+
+        response = client.get("/sitemap.xml", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+
+    def test_rebuilt_only_when_lastmod_changes(self):
+        """Test that the document is reused until a source's date changes."""
+        source = Source(datetime(2025, 8, 8, 9, tzinfo=UTC).timestamp())
+        app = make_app(source)
+        sitemap = Sitemap(check_interval=0)
+
+        first = sitemap.get(app.routes)
+        source.mtime += 60
+        assert sitemap.get(app.routes) is first
+
+        source.mtime += 86400
+        document = sitemap.get(app.routes)
+
+        assert sitemap.builds == 2
+        assert b"<lastmod>2025-08-09</lastmod>" in document.body
+        assert b"/index" not in document.body
+        assert b"/private" not in document.body
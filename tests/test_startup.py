@@ -0,0 +1,37 @@
+from benchmarks.startup import (
+    DEFERRED_MODULES,
+    IMPORT_BUDGET_MS,
+    MODULE_BUDGET,
+    parse_importtime,
+    profile_imports,
+    total_ms,
+)
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        450 |     app.config
+import time:      1000 |       1500 | app.main
+"""
+
+
+class TestStartupProfile:
+    """Test the import-time budget of the application."""
+
+    def test_parse_importtime(self):
+        """Test that -X importtime lines become records."""
+        records = parse_importtime(SAMPLE)
+
+        assert [r.module for r in records] == ["_io", "app.config", "app.main"]
+        assert records[1].self_us == 300
+        assert records[1].depth == 2
+        assert total_ms(records) == 1.5
+
+    def test_app_import_within_budget(self):
+        """Test import time and module count of app.main in a new interpreter."""
+        records = profile_imports("app.main")
+        modules = {r.module for r in records}
+
+        assert total_ms(records) < IMPORT_BUDGET_MS
+        assert len(records) < MODULE_BUDGET
+        assert modules.isdisjoint(DEFERRED_MODULES)
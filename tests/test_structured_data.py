@@ -0,0 +1,55 @@
+import json
+
+from app.content import timeline_data
+from app.structured_data import json_ld, serialize
+from app.utils import Repo
+
+
+class TestStructuredData:
+    """Test the per-page JSON-LD registry."""
+
+    def test_person_comes_from_timeline(self):
+        """Test that the Person document reflects the timeline data."""
+        timeline = timeline_data.get()
+        person = json.loads(json_ld.render("person", timeline))
+
+        assert person["@context"] == "https://schema.org"
+        assert person["@type"] == "Person"
+        assert person["worksFor"]["name"] == timeline.work_experience[0].company
+        assert [school["name"] for school in person["alumniOf"]] == [
+            edu.institution for edu in timeline.education
+        ]
+
+    def test_document_is_serialized_once_per_source(self, mock_repos):
+        """Test that the same source returns the same string."""
+        first = json_ld.render("repos", mock_repos)
+
+        assert json_ld.render("repos", mock_repos) is first
+        assert json_ld.render("repos", list(mock_repos)) is not first
+
+    def test_repo_list(self, mock_repos):
+        """Test that repositories are listed in page order."""
+        document = json.loads(json_ld.render("repos", mock_repos))
+
+        assert document["@type"] == "ItemList"
+        assert [item["position"] for item in document["itemListElement"]] == [1, 2]
+        assert document["itemListElement"][0]["item"]["name"] == "repo1"
+
+    def test_script_cannot_be_closed_by_data(self):
+        """Test that text from GitHub cannot end the script element."""
+        repo = Repo.from_dict({"name": "x", "description": "</script><b>hi</b>"})
+        encoded = json_ld.render("repos", [repo])
+
+        assert "</script>" not in encoded
+        assert json.loads(encoded)["itemListElement"][0]["item"]["description"] == (
+            "</script><b>hi</b>"
+        )
+        assert serialize({"a": "<"}) == '{"a":"\\u003c"}'
+
+    def test_pages_embed_documents(self, client):
+        """Test that the home and timeline pages embed their documents."""
+        home = client.get("/")
+        timeline = client.get("/timeline")
+
+        assert '"@type":"Person"' in home.text
+        assert '"@type":"ProfilePage"' in timeline.text
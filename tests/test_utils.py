@@ -1,4 +1,43 @@
-from app.utils import parse, sort_repos
+import asyncio
+from dataclasses import dataclass, field
+
+import httpx
+import pytest
+
+from app.utils import Repo, _page_url, get_repo_data_for_user, parse, sort_repos
+
+
+@dataclass
+class RequestLog:
+    """Pages requested from the mock GitHub and their concurrency."""
+
+    active: int = 0
+    peak: int = 0
+    requested: list[int] = field(default_factory=list)
+
+
+def paginated_github(pages: int, with_last: bool = True):
+    """Build a mock GitHub handler that records peak request concurrency."""
+    state = RequestLog()
+    base = "https://api.github.com/users/test/repos"
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params.get("page", "1"))
+        state.requested.append(page)
+        state.active += 1
+        state.peak = max(state.peak, state.active)
+        await asyncio.sleep(0.01)
+        state.active -= 1
+
+        links = []
+        if page < pages:
+            links.append(f'<{base}?per_page=1&page={page + 1}>; rel="next"')
+            if with_last:
+                links.append(f'<{base}?per_page=1&page={pages}>; rel="last"')
+        repo = {"name": f"repo{page}", "fork": False, "stargazers_count": page}
+        return httpx.Response(200, json=[repo], headers={"link": ", ".join(links)})
+
+    return handler, state
 
 
 class TestUtilityFunctions:
@@ -7,28 +46,58 @@ class TestUtilityFunctions:
     def test_sort_repos(self):
         """Test repository sorting by star count."""
         repos = [
-            {"name": "repo1", "stargazers_count": 5},
-            {"name": "repo2", "stargazers_count": 50},
-            {"name": "repo3", "stargazers_count": 25},
-            {"name": "repo4", "stargazers_count": 100},
+            Repo.from_dict({"name": "repo1", "stargazers_count": 5}),
+            Repo.from_dict({"name": "repo2", "stargazers_count": 50}),
+            Repo.from_dict({"name": "repo3", "stargazers_count": 25}),
+            Repo.from_dict({"name": "repo4", "stargazers_count": 100}),
         ]
 
         sorted_repos = sort_repos(repos, count=3)
 
         assert len(sorted_repos) == 3
-        assert sorted_repos[0]["stargazers_count"] == 100
-        assert sorted_repos[1]["stargazers_count"] == 50
-        assert sorted_repos[2]["stargazers_count"] == 25
+        assert sorted_repos[0].stargazers_count == 100
+        assert sorted_repos[1].stargazers_count == 50
+        assert sorted_repos[2].stargazers_count == 25
 
     def test_sort_repos_default_count(self):
         """Test repository sorting with default count."""
-        repos = [{"name": f"repo{i}", "stargazers_count": i} for i in range(10)]
+        repos = [
+            Repo.from_dict({"name": f"repo{i}", "stargazers_count": i})
+            for i in range(10)
+        ]
 
         sorted_repos = sort_repos(repos)
 
         assert len(sorted_repos) == 6  # Default count
-        assert sorted_repos[0]["stargazers_count"] == 9
-        assert sorted_repos[-1]["stargazers_count"] == 4
+        assert sorted_repos[0].stargazers_count == 9
+        assert sorted_repos[-1].stargazers_count == 4
+
+    def test_sort_repos_matches_full_sort(self):
+        """Test that top-k selection matches a full sort, ties included."""
+        repos = [
+            Repo.from_dict({"name": f"repo{i}", "stargazers_count": i % 7})
+            for i in range(100)
+        ]
+
+        expected = sorted(repos, key=lambda r: r.stargazers_count, reverse=True)
+        assert sort_repos(repos, count=10) == expected[:10]
+
+    def test_repo_record_from_api_json(self):
+        """Test that API nulls get display defaults and extra fields are dropped."""
+        repo = Repo.from_dict(
+            {
+                "name": "repo",
+                "language": None,
+                "description": None,
+                "clone_url": "https://github.com/x/repo.git",
+                "stargazers_count": 3,
+            }
+        )
+
+        assert repo.language == "Not specified"
+        assert repo.description == ""
+        assert not hasattr(repo, "__dict__")
+        assert Repo.from_dict(repo.to_dict()) == repo
 
     def test_parse_link_header_simple(self):
         """Test parsing simple link header."""
@@ -52,3 +121,42 @@ class TestUtilityFunctions:
         assert hasattr(templates, "env")
         assert "current_year" in templates.env.globals
         assert isinstance(templates.env.globals["current_year"], int)
+
+
+class TestRepoFetching:
+    """Test paginated repository fetching."""
+
+    def test_page_url_replaces_page(self):
+        """Test that the page parameter is set and other params kept."""
+        url = _page_url("https://api.github.com/u/repos?per_page=30&page=9", 3)
+        assert url == "https://api.github.com/u/repos?per_page=30&page=3"
+
+    @pytest.mark.asyncio
+    async def test_pages_fetched_concurrently_in_order(self):
+        """Test that pages after the first are fetched in parallel and merged."""
+        handler, state = paginated_github(pages=6)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            repos = await get_repo_data_for_user(
+                url="https://api.github.com/users/test/repos",
+                client=client,
+                concurrency=3,
+            )
+
+        assert [r.name for r in repos] == [f"repo{i}" for i in range(1, 7)]
+        assert sorted(state.requested) == [1, 2, 3, 4, 5, 6]
+        assert state.peak == 3
+
+    @pytest.mark.asyncio
+    async def test_sequential_fallback_without_last(self):
+        """Test that next links are walked one at a time without a last link."""
+        handler, state = paginated_github(pages=4, with_last=False)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            repos = await get_repo_data_for_user(
+                url="https://api.github.com/users/test/repos", client=client
+            )
+
+        assert [r.name for r in repos] == [f"repo{i}" for i in range(1, 5)]
+        assert state.requested == [1, 2, 3, 4]
+        assert state.peak == 1
@@ -0,0 +1,125 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from jinja2 import DictLoader, Environment
+
+from app.config import get_settings
+from app.routes.apps import _cache
+from app.warmup import (
+    compile_templates,
+    readiness,
+    start_warmup,
+    stop_warmup,
+)
+
+
+@pytest.fixture
+def github_settings():
+    """Settings with the startup repository prefetch switched on."""
+    return get_settings().model_copy(
+        update={"warmup_github": True, "github_username": "warmup"}
+    )
+
+
+class TestWarmup:
+    """Test startup warm-up and the readiness it reports."""
+
+    def test_compile_templates(self):
+        """Test that every HTML template is compiled into the cache."""
+        env = Environment(
+            loader=DictLoader({"a.html": "a", "b.html": "{{ b }}", "c.txt": "c"})
+        )
+
+        assert compile_templates(env) == 2
+        assert env.cache is not None
+        assert len(env.cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_ready_after_repository_prefetch(self, github_settings, mock_repos):
+        """Test that the worker is ready only once the repositories are cached."""
+        fetched = asyncio.Event()
+
+        async def fetch(settings):
+            await fetched.wait()
+            return mock_repos
+
+        readiness.start()
+        with (
+            patch("app.routes.apps.get_shared_cache", return_value=None),
+            patch("app.routes.apps._fetch_repos", new=fetch),
+        ):
+            task = start_warmup(github_settings)
+            await asyncio.sleep(0)
+            assert not readiness.ready
+
+            fetched.set()
+            await task
+
+        assert readiness.ready
+        assert _cache.pop("github_repos_warmup")["data"] == mock_repos
+
+    @pytest.mark.asyncio
+    async def test_ready_when_prefetch_fails(self, github_settings):
+        """Test that a GitHub outage does not keep the worker unready."""
+        readiness.start()
+        with (
+            patch("app.routes.apps.get_shared_cache", return_value=None),
+            patch(
+                "app.routes.apps._fetch_repos",
+                new=AsyncMock(side_effect=RuntimeError("boom")),
+            ),
+        ):
+            await start_warmup(github_settings)
+
+        assert readiness.ready
+        assert "github_repos_warmup" not in _cache
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_warmup(self, github_settings):
+        """Test that shutdown cancels a running prefetch and reports not ready."""
+
+        async def fetch(settings):
+            await asyncio.Event().wait()
+
+        readiness.start()
+        with (
+            patch("app.routes.apps.get_shared_cache", return_value=None),
+            patch("app.routes.apps._fetch_repos", new=fetch),
+        ):
+            task = start_warmup(github_settings)
+            await asyncio.sleep(0)
+            await stop_warmup()
+
+        assert task.cancelled()
+        assert not readiness.ready
+        assert readiness.ready_at is None
+        readiness.mark_ready()
+
+
+class TestProbes:
+    """Test the liveness and readiness endpoints."""
+
+    def test_livez(self, client):
+        """Test that the liveness probe always answers."""
+        response = client.get("/livez")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+        assert response.headers["cache-control"] == "no-store"
+
+    def test_readyz_after_startup(self, client):
+        """Test that the readiness probe passes once the lifespan has run."""
+        response = client.get("/readyz")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+
+    def test_readyz_while_warming_up(self, client):
+        """Test that the readiness probe fails until warm-up finishes."""
+        with patch.object(readiness, "ready", False):
+            response = client.get("/readyz")
+
+        assert response.status_code == 503
+        assert response.json() == {"status": "starting"}
+        assert client.get("/livez").status_code == 200
@@ -0,0 +1,52 @@
+import os
+
+from app.routes.well_known import WellKnownFile
+
+
+class TestWellKnownFiles:
+    """Test files served from memory at their canonical paths."""
+
+    def test_served_without_redirect(self, client):
+        """Test content types and cache headers of the well-known files."""
+        expected = {
+            "/llms.txt": "text/plain; charset=utf-8",
+            "/robots.txt": "text/plain; charset=utf-8",
+            "/sitemap.xml": "application/xml",
+        }
+        for path, content_type in expected.items():
+            response = client.get(path, follow_redirects=False)
+
+            assert response.status_code == 200
+            assert response.headers["content-type"] == content_type
+            assert response.headers["cache-control"] == "public, max-age=3600"
+            assert response.headers["etag"]
+
+    def test_revalidation(self, client):
+        """Test that a matching ETag is answered with a 304."""
+        etag = client.get("/robots.txt").headers["etag"]
+
+        response = client.get("/robots.txt", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.headers["cache-control"] == "public, max-age=3600"
+
+    def test_reloaded_when_changed(self, tmp_path):
+        """Test that the file is read once and again after it changes."""
+        path = tmp_path / "robots.txt"
+        path.write_text("User-agent: *\n")
+        file = WellKnownFile(path, "text/plain", check_interval=0)
+        first = file.get()
+
+        assert file.get() is first
+
+        path.write_text("User-agent: *\nDisallow: /test\n")
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000_000))
+
+        assert file.get().body == b"User-agent: *\nDisallow: /test\n"
+        assert file.get().etag != first.etag
+
+    def test_missing_without_fallback(self, tmp_path):
+        """Test that a missing file without a fallback is not served."""
+        file = WellKnownFile(tmp_path / "missing.txt", "text/plain")
+
+        assert file.get() is None